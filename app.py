@@ -1,10 +1,10 @@
 import base64
 import contextlib
-import copy
 import csv
-import itertools
+import math
 import os
 import queue
+import tempfile
 import threading
 import time
 import traceback
@@ -13,16 +13,13 @@ from datetime import datetime, timezone
 
 import cv2 as cv
 import cv2  # Ensure cv2 is also imported for direct usage
-import numpy as np
 import pygame
 import pyttsx3
 import speech_recognition as sr
-import tensorflow as tf
 from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 from flask_socketio import SocketIO
 from gtts import gTTS
-import serial  # Import the serial module
 
 # Import the mode manager
 from mode_manager import ModeManager
@@ -34,10 +31,6 @@ os.environ['CUDA_VISIBLE_DEVICES'] = '-1'  # Disable GPU
 os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # 2 Suppress TensorFlow info messages
 
-# Now import other dependencies
-
-tf.get_logger().setLevel('ERROR')
-
 app = Flask(__name__)
 CORS(app)
 
@@ -50,7 +43,6 @@ socketio = SocketIO(app,
                     logger=False)
 
 # Global variables for frame sharing
-frame_lock = threading.Lock()
 thread_lock = threading.Lock()
 camera = None
 preview_active = False
@@ -62,27 +54,94 @@ recording_lock = threading.Lock()
 global_vars = {
     'controller': None,
     'processing_active': False,
-    'latest_gesture': "No Gesture Detected",
-    'latest_confidence': 0.0,
-    'current_handedness': "Unknown",
-    'current_landmarks': [],
-    'current_bounding_box': [0, 0, 0, 0],
-    'detected_hands_count': 0,
-    'current_fps': 0,
-    'gesture_history': deque(maxlen=5),
-    'latest_frame_base64': '',
+    'state': None,
     'mode_manager': ModeManager(),
-    'current_mode': 'general_recognition'
+    'current_mode': 'general_recognition',
+    'pipeline': None,
+    'broadcaster': None,
+    'scaled_frames': None,
+    'stream_controller': None,
+    'stream_config': None,
+    'wire_schema': None,
+    'wire_clients': frozenset(),
+    'capture_stats': {},
+    'tracking_stats': {},
+    'memory_stats': {},
+    'broadcast_stats': {},
+    'serial_stats': {},
+    'overlay_stats': {}
 }
 
 with contextlib.redirect_stderr(open(os.devnull, 'w')):
     import mediapipe as mp
 
     from model import KeyPointClassifier, PointHistoryClassifier
-    from utils import CvFpsCalc
+    from utils import (AdaptiveHandTracker, AllocationCounter, ButtonOverlay, ControlLayout,
+                       CvFpsCalc, DeviceCommandLayer, EmitScheduler, FrameBroadcaster,
+                       FrameBufferPool, FrameGrabber, FramePacket, FramePipeline, FrameResult,
+                       InferenceResizer, JpegQualityController, LandmarkPacketEncoder,
+                       NodeMCUSimulator, PhraseCache, PointHistoryBuffer, ScaledFrameCache,
+                       SerialTransport, SerialWorker, SpeechWorker, StateStore, StopPipeline,
+                       WireSchema, bounding_rect, landmark_array, normalize_landmarks,
+                       open_serial_port)
 
 mp_drawing = mp.solutions.drawing_utils
 
+# Synthesized phrases are kept here between runs (see PhraseCache)
+PHRASE_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'gesture-app', 'phrases')
+
+# Devices behind the first three buttons, for voice feedback
+DEVICE_NAMES = {
+    0: "Light",
+    1: "Fan",
+    2: "Pump"
+}
+
+# NodeMCU serial commands per device and state
+DEVICE_COMMANDS = {
+    0: {"ON": b'2', "OFF": b'1'},
+    1: {"ON": b'3', "OFF": b'4'},
+    2: {"ON": b'5', "OFF": b'6'}
+}
+GET_DATA_COMMAND = b'7'  # "Get Data" button
+
+# Keypoint classifier id of the Pointer sign, whose fingertip trajectory
+# feeds the point history classifier
+POINTER_SIGN_ID = 2
+
+# The sketch keeps printing the status of the last command it ran. Its
+# LIGHT labels follow the relay pin level, so they read inverted
+NODEMCU_STATUS_COMMANDS = {
+    "LIGHT ON": b'1',
+    "LIGHT OFF": b'2',
+    "FAN ON": b'3',
+    "FAN OFF": b'4',
+    "PUMP ON": b'5',
+    "PUMP OFF": b'6'
+}
+
+
+def device_feedback_message(button_index, state):
+    """What to say after switching a device, e.g. 'Light is now on'"""
+    device = DEVICE_NAMES[button_index]
+    if state == "OFF":
+        return f"{device} is now off"
+    # Use running instead of on for the fan
+    return f"{device} is now running" if button_index == 1 else f"{device} is now on"
+
+# Latest per-frame results, swapped in whole by the processing thread and
+# read without locks by request handlers
+global_vars['state'] = StateStore(FrameResult(mode=ModeManager.GENERAL_RECOGNITION))
+
+# All Socket.IO emits are queued per client: state-like topics are coalesced
+# to the latest payload and rate limited, everything else (mode_change,
+# button_update, serial_data, ...) is always delivered, in order
+EMIT_STATE_TOPICS = {'gesture_update', 'gesture_frame', 'gesture_keyframe', 'landmark_packet', 'preview_frame',
+                     'gesture', 'system_status', 'camera_error', 'serial_error', 'system_error'}
+EMIT_ERROR_TOPICS = ('camera_error', 'serial_error', 'system_error')
+emit_scheduler = EmitScheduler(socketio.emit, state_topics=EMIT_STATE_TOPICS,
+                               rates={topic: 1.0 for topic in EMIT_ERROR_TOPICS}).start()
+
 
 class VoiceAssistant:
     def __init__(self):
@@ -95,6 +154,16 @@ class VoiceAssistant:
         self.is_listening = False
         pygame.mixer.init()
 
+        # Phrases are rendered offline with pyttsx3 once and then played
+        # from memory; gTTS is only the fallback
+        self.phrases = PhraseCache(PHRASE_CACHE_DIR, self._synthesize, self._load_sound,
+                                   voice=self.engine.getProperty('voice'),
+                                   rate=self.engine.getProperty('rate'))
+
+        # Synthesis and playback take seconds, so utterances are queued and
+        # spoken on a worker thread
+        self.speech = SpeechWorker(self._speak_now).start()
+
         # Calibrate the recognizer for ambient noise
         with self.microphone as source:
             self.recognizer.adjust_for_ambient_noise(source)
@@ -160,35 +229,72 @@ class VoiceAssistant:
                     print(f"Unexpected error in listen loop: {e}")
                 time.sleep(0.1)  # Short sleep to prevent CPU spinning
 
-    def speak(self, text):
-        """Convert text to speech and play it with error handling"""
-        try:
-            tts = gTTS(text=text, lang='en')
-            temp_file = "temp_speech.mp3"
+    def speak(self, text, priority=SpeechWorker.PRIORITY_SYSTEM):
+        """Queue text to be spoken; returns immediately.
 
-            # Cleanup any existing temporary file
-            try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-            except Exception:
-                pass
+        Device feedback (SpeechWorker.PRIORITY_DEVICE) goes before system
+        messages, which go before gesture chatter (PRIORITY_GESTURE).
+        """
+        return self.speech.say(text, priority)
 
-            try:
-                tts.save(temp_file)
-                pygame.mixer.music.load(temp_file)
-                pygame.mixer.music.play()
-                while pygame.mixer.music.get_busy():
-                    pygame.time.Clock().tick(10)
-            finally:
-                # Cleanup in a finally block to ensure it happens
-                try:
-                    if os.path.exists(temp_file):
-                        os.remove(temp_file)
-                except Exception:
-                    pass
+    def stop_speaking(self):
+        """Cut off the current utterance and drop the queued ones"""
+        self.speech.stop_speaking()
+
+    def prewarm(self, phrases):
+        """Synthesize phrases into the cache in the background"""
+        threading.Thread(target=self.phrases.prewarm, args=(list(phrases),), daemon=True).start()
 
+    def _synthesize(self, text, path):
+        self.engine.save_to_file(text, path)
+        self.engine.runAndWait()
+
+    @staticmethod
+    def _load_sound(path):
+        """Decode a phrase into a Sound; returns it with its PCM size in bytes"""
+        sound = pygame.mixer.Sound(path)
+        frequency, sample_format, channels = pygame.mixer.get_init()
+        return sound, int(sound.get_length() * frequency * channels * (abs(sample_format) // 8))
+
+    def _speak_now(self, text, cancel):
+        """Play text from the phrase cache; runs on the speech worker"""
+        try:
+            sound = self.phrases.get(text)
         except Exception as e:
-            print(f"Error in speech synthesis: {e}")
+            print(f"Offline speech synthesis failed, using gTTS: {e}")
+            self._speak_gtts(text, cancel)
+            return
+        if cancel.is_set():
+            return
+
+        channel = sound.play()
+        while channel is not None and channel.get_busy():
+            if cancel.wait(0.05):
+                channel.stop()
+                break
+
+    def _speak_gtts(self, text, cancel):
+        """Convert text to speech online with gTTS and play it"""
+        tts = gTTS(text=text, lang='en')
+        fd, temp_file = tempfile.mkstemp(prefix='speech_', suffix='.mp3')
+        os.close(fd)
+        try:
+            tts.save(temp_file)
+            if cancel.is_set():
+                return
+            pygame.mixer.music.load(temp_file)
+            pygame.mixer.music.play()
+            while pygame.mixer.music.get_busy():
+                if cancel.wait(0.05):
+                    pygame.mixer.music.stop()
+                    break
+            pygame.mixer.music.unload()
+        finally:
+            # Cleanup in a finally block to ensure it happens
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
 
 
 class GestureVoiceController:
@@ -367,6 +473,19 @@ class GestureVoiceController:
             "last_feedback": {}  # Store recent user feedback
         }
 
+        # Render every fixed phrase up front so announcing costs no synthesis
+        self.voice_assistant.prewarm(self._fixed_phrases())
+
+    def _fixed_phrases(self):
+        """All canned responses and device feedback messages"""
+        phrases = [response
+                   for responses in self.gesture_responses.values()
+                   for style in ("casual", "professional", "playful")
+                   for response in responses.get(style, [])]
+        phrases.extend(combo["response"] for combo in self.gesture_combos.values())
+        phrases.extend(device_feedback_message(index, state) for index in DEVICE_NAMES for state in ("ON", "OFF"))
+        return phrases
+
     def handle_button_toggle(self, button_id, state):
         if state == "ON":
             self.button_actions.get(button_id, lambda: None)()
@@ -455,7 +574,7 @@ class GestureVoiceController:
         # Track gesture with confidence for better stability analysis
         self.gesture_history.append((gesture, confidence))
 
-        self.socketio.emit('gesture', {
+        emit_scheduler.emit('gesture', {
             'gesture': gesture,
             'confidence': confidence,
             'timestamp': datetime.now().isoformat(),
@@ -593,7 +712,7 @@ class GestureVoiceController:
                 self._provide_multimodal_feedback(gesture)
 
                 # Speak the selected response
-                self.voice_assistant.speak(response)
+                self.voice_assistant.speak(response, SpeechWorker.PRIORITY_GESTURE)
 
                 # Update state tracking
                 self.last_voiced_gesture = gesture
@@ -1311,13 +1430,78 @@ def get_args():
                         help='min_detection_confidence', type=float, default=0.7)
     parser.add_argument("--min_tracking_confidence",
                         help='min_tracking_confidence', type=int, default=0.5)
+    parser.add_argument("--min_gesture_confidence",
+                        help='classifier probability needed to act on a gesture',
+                        type=float, default=0.5)
+    parser.add_argument("--pipeline_policy",
+                        help='backpressure between pipeline stages',
+                        choices=['drop_oldest', 'block'], default='drop_oldest')
+    parser.add_argument("--pipeline_queue_size",
+                        help='max frames queued between pipeline stages', type=int, default=2)
+    parser.add_argument("--inference_scale",
+                        help='scale of the frame hand detection runs on (0-1]', type=float, default=1.0)
+    parser.add_argument('--adaptive_tracking', action='store_true',
+                        help='run hand detection every Nth frame and predict landmarks in between')
+    parser.add_argument("--target_fps",
+                        help='frame rate the adaptive tracker tunes N for (0 keeps N fixed)',
+                        type=float, default=30.0)
+    parser.add_argument("--max_skip_frames",
+                        help='largest N for the adaptive tracker', type=int, default=4)
+    parser.add_argument("--motion_threshold",
+                        help='frame difference that forces a detection', type=float, default=6.0)
+    parser.add_argument('--debug_allocations', action='store_true',
+                        help='count iterations that allocate a full-size frame array (slow)')
+    parser.add_argument("--transport",
+                        help='how video frames are sent over Socket.IO',
+                        choices=['base64', 'binary'], default='base64')
+    parser.add_argument("--min_jpeg_quality", help='lowest stream JPEG quality', type=int, default=40)
+    parser.add_argument("--max_jpeg_quality", help='highest stream JPEG quality', type=int, default=80)
+    parser.add_argument("--min_stream_scale", help='smallest stream scale (0-1]', type=float, default=0.5)
+    parser.add_argument("--max_stream_kbps",
+                        help='stream bandwidth budget in kbit/s (0 = no limit)', type=float, default=0)
+    parser.add_argument("--max_encode_ms",
+                        help='JPEG encode time budget per frame (0 = no limit)', type=float, default=15.0)
+    parser.add_argument("--max_ack_lag_ms",
+                        help='client frame_ack lag budget (0 = no limit)', type=float, default=300.0)
+    parser.add_argument("--stream_mode",
+                        help='video: rendered JPEG frames; landmarks: binary landmark packets, drawn by the client',
+                        choices=['video', 'landmarks'], default='video')
+    parser.add_argument('--landmark_delta', action='store_true',
+                        help='delta-encode landmark packets against the previous one')
+    parser.add_argument("--keyframe_interval",
+                        help='seconds between background JPEGs in landmarks mode (0 = none)',
+                        type=float, default=1.0)
+    parser.add_argument("--max_emit_rate",
+                        help='max gesture_update/frame emits per second per client (0 = no limit)',
+                        type=float, default=30.0)
+    parser.add_argument("--error_emit_rate",
+                        help='max camera/serial/system error emits per second per client',
+                        type=float, default=1.0)
+    parser.add_argument("--serial_coalesce_ms",
+                        help='window in which button changes of one device are collapsed into one serial command',
+                        type=float, default=250.0)
+    parser.add_argument("--button_dwell_ms",
+                        help='how long a fingertip has to stay on a button to press it',
+                        type=float, default=150.0)
+    parser.add_argument("--button_release_margin",
+                        help='pixels a fingertip has to move off a button before it counts as released',
+                        type=int, default=12)
+    parser.add_argument("--serial_port", help='NodeMCU serial port', default='/dev/ttyUSB0')
+    parser.add_argument('--serial_simulator', action='store_true',
+                        help='talk to an in-process NodeMCU simulator instead of --serial_port')
+    parser.add_argument("--simulator_latency_ms",
+                        help='reply latency of the NodeMCU simulator',
+                        type=float, default=20.0)
+    parser.add_argument("--classifier_backend",
+                        help='inference backend for the gesture classifiers',
+                        choices=['tflite', 'numpy'], default='tflite')
     args = parser.parse_args()
     return args
 
 
-def initialize_system():
+def initialize_system(args=None):
     """Initializes the MediaPipe model, classifiers, and FPS calculator."""
-    socketio.emit('system_status', 'initializing')
+    emit_scheduler.emit('system_status', 'initializing')
 
     try:
         mp_hands = mp.solutions.hands
@@ -1330,8 +1514,9 @@ def initialize_system():
 
 
 
-        keypoint_classifier = KeyPointClassifier()
-        point_history_classifier = PointHistoryClassifier()
+        backend = args.classifier_backend if args is not None else 'tflite'
+        keypoint_classifier = KeyPointClassifier(backend=backend)
+        point_history_classifier = PointHistoryClassifier(backend=backend)
         cvFpsCalc = CvFpsCalc(buffer_len=10)
 
         # ✅ Handle missing file and empty lines gracefully
@@ -1350,18 +1535,28 @@ def initialize_system():
                 print(f"Loaded {len(keypoint_classifier_labels)} gesture labels: {keypoint_classifier_labels}")
         except FileNotFoundError:
             print("Error: Label CSV file missing!")
-            socketio.emit('system_error', {'message': 'Keypoint classifier label file missing'})
+            emit_scheduler.emit('system_error', {'message': 'Keypoint classifier label file missing'})
             raise RuntimeError("Keypoint classifier label file not found")
         except Exception as e:
             print(f"Error loading label file: {e}")
-            socketio.emit('system_error', {'message': f'Error loading label file: {str(e)}'})
+            emit_scheduler.emit('system_error', {'message': f'Error loading label file: {str(e)}'})
             raise RuntimeError(f"Error processing keypoint classifier labels: {str(e)}")
 
-        return hands, keypoint_classifier, keypoint_classifier_labels, point_history_classifier, cvFpsCalc
+        try:
+            with open('model/point_history_classifier/point_history_classifier_label.csv', encoding='utf-8-sig') as f:
+                point_history_classifier_labels = [row[0] for row in csv.reader(f) if row and row[0].strip()]
+            print(f"Loaded {len(point_history_classifier_labels)} finger gesture labels: {point_history_classifier_labels}")
+        except Exception as e:
+            print(f"Error loading finger gesture label file: {e}")
+            emit_scheduler.emit('system_error', {'message': f'Error loading finger gesture label file: {str(e)}'})
+            raise RuntimeError(f"Error processing point history classifier labels: {str(e)}")
+
+        return (hands, keypoint_classifier, keypoint_classifier_labels,
+                point_history_classifier, point_history_classifier_labels, cvFpsCalc)
 
     except Exception as e:
         print(f"System initialization error: {e}")
-        socketio.emit('system_error', {'message': f'Initialization error: {str(e)}'})
+        emit_scheduler.emit('system_error', {'message': f'Initialization error: {str(e)}'})
         raise  # Re-raise error to stop execution
 
 
@@ -1369,7 +1564,7 @@ def initialize_system():
 def setup_camera(args):
     """Camera initialization with error handling"""
     if args is None or not hasattr(args, 'width') or not hasattr(args, 'height'):
-        socketio.emit('camera_error', {'message': 'Invalid camera arguments'})
+        emit_scheduler.emit('camera_error', {'message': 'Invalid camera arguments'})
         raise ValueError("Invalid camera configuration parameters")
 
     for device_index in range(4):  # Try 0 to 3
@@ -1381,7 +1576,7 @@ def setup_camera(args):
             return cap
         cap.release()
 
-    socketio.emit('camera_error', {'message': 'No cameras detected'})
+    emit_scheduler.emit('camera_error', {'message': 'No cameras detected'})
     raise RuntimeError("No available cameras found")
 
 
@@ -1390,23 +1585,42 @@ def process_frames():
     global global_vars
 
     try:
+        args = get_args()
+
         # Make sure initialize_system is actually returning all the expected values
-        initialization_result = initialize_system()
-        if len(initialization_result) != 5:
-            print(f"System initialization error: expected 5 return values, got {len(initialization_result)}")
-            socketio.emit('system_status', 'initialization_error')
+        initialization_result = initialize_system(args)
+        if len(initialization_result) != 6:
+            print(f"System initialization error: expected 6 return values, got {len(initialization_result)}")
+            emit_scheduler.emit('system_status', 'initialization_error')
             return
 
-        hands, keypoint_classifier, keypoint_classifier_labels, point_history_classifier, cvFpsCalc = initialization_result
+        (hands, keypoint_classifier, keypoint_classifier_labels,
+         point_history_classifier, point_history_classifier_labels, cvFpsCalc) = initialization_result
+
+        # Binary gesture_update / gesture-data encoding; its enum tables come
+        # from the labels just loaded
+        global_vars['wire_schema'] = WireSchema(keypoint_classifier_labels, point_history_classifier_labels,
+                                                [ModeManager.GENERAL_RECOGNITION, ModeManager.HOME_AUTOMATION])
+        emit_scheduler.emit('wire_schema', global_vars['wire_schema'].describe(), to=global_vars['wire_clients'])
+
+        emit_scheduler.default_rate = args.max_emit_rate
+        for topic in EMIT_ERROR_TOPICS:
+            emit_scheduler.set_rate(topic, args.error_emit_rate)
+        # A delta packet that is replaced before it goes out breaks the
+        # client's decode chain until the next full packet, so with delta
+        # encoding landmark packets are events: every one is delivered, in order
+        if args.landmark_delta:
+            emit_scheduler.state_topics.discard('landmark_packet')
+        else:
+            emit_scheduler.set_rate('landmark_packet', args.max_emit_rate)
 
         try:
-            args = get_args()
             cap = setup_camera(args)
 
             # Verify camera is properly set up
             if not cap or not cap.isOpened():
                 print("Camera failed to open")
-                socketio.emit('camera_error', {'message': 'Camera failed to open'})
+                emit_scheduler.emit('camera_error', {'message': 'Camera failed to open'})
                 return
 
             # Set camera properties for better performance
@@ -1416,84 +1630,106 @@ def process_frames():
 
         except Exception as e:
             print(f"Camera setup failed: {e}")
-            socketio.emit('camera_error', {'message': f'Camera setup failed: {str(e)}'})
+            emit_scheduler.emit('camera_error', {'message': f'Camera setup failed: {str(e)}'})
             return  # Exit safely if camera setup fails
 
-        # Initialize serial communication
-        try:
-            ser = serial.Serial('/dev/ttyUSB0', 9600, timeout=2)  # Adjust port for your system
-            time.sleep(2)  # Allow time for connection to establish
-            serial_connected = True
+        # States of the buttons
+        button_state = ["OFF", "OFF", "OFF", "GET DATA"]
+        button_toggle = [False, False, False, False]
+
+        # NodeMCU responses arrive on the serial worker's reader thread
+        last_status = [None]
+
+        def on_serial_line(line, request):
+            if line in NODEMCU_STATUS_COMMANDS:
+                device_commands.report_command(NODEMCU_STATUS_COMMANDS[line])
+            # Unsolicited status lines repeat continuously; pass on changes only
+            if request is None:
+                if line == last_status[0]:
+                    return
+                last_status[0] = line
+            print("Received:", line)
+            emit_scheduler.emit('serial_data', {'data': line})
+            if request is not None and request.tag == 3 and button_state[3] == "GETTING...":
+                button_state[3] = "OK"  # Display message temporarily
+
+        def on_serial_error(error, request):
+            print("Serial error:", error)
+            if request is not None and request.tag == 3 and button_state[3] == "GETTING...":
+                button_state[3] = "ERROR"
+            emit_scheduler.emit('serial_error', {'message': f'Serial error: {str(error)}'})
+
+        # Device commands go through the serial worker; speak once one is actually sent
+        def send_device_command(command, device, state):
+            if not serial_worker.send(command, tag=device):
+                return False
+            if device in DEVICE_NAMES and global_vars['mode_manager'].is_home_automation_mode():
+                if global_vars.get('controller'):
+                    global_vars['controller'].voice_assistant.speak(
+                        device_feedback_message(device, state), SpeechWorker.PRIORITY_DEVICE)
+            return True
+
+        # The serial link is opened and reopened in the background; the
+        # worker and the device states outlive each connection
+        def on_serial_connect(port):
+            serial_worker.attach(port)
             print("Serial port connected successfully")
-        except Exception as e:
-            serial_connected = False
-            print(f"Serial connection failed: {e}")
-            socketio.emit('serial_error', {'message': f'Serial connection failed: {str(e)}'})
+            # Restore what was switched while disconnected
+            device_commands.reconcile()
+
+        def on_serial_disconnect(error):
+            serial_worker.detach()
+            device_commands.forget()
+            if error is not None:
+                print(f"Serial connection lost: {error}")
+
+        def open_serial():
+            try:
+                if args.serial_simulator:
+                    return NodeMCUSimulator(latency=args.simulator_latency_ms / 1000.0)
+                return open_serial_port(args.serial_port)  # Adjust port for your system
+            except Exception as e:
+                emit_scheduler.emit('serial_error', {'message': f'Serial connection failed: {str(e)}'})
+                raise
+
+        # Initialize serial communication
+        serial_transport = SerialTransport(open_serial, on_connect=on_serial_connect,
+                                           on_disconnect=on_serial_disconnect)
+        serial_worker = SerialWorker(on_line=on_serial_line, on_error=on_serial_error,
+                                     on_lost=serial_transport.connection_lost).start()
+        device_commands = DeviceCommandLayer(send_device_command, DEVICE_COMMANDS,
+                                             window=args.serial_coalesce_ms / 1000.0).start()
+        serial_transport.start()
 
         # Initialize button configuration
         screen_width, screen_height = 1280, 720  # Match the camera resolution
         button_width, button_height = 200, 50
         button_margin = 20
 
-        # Coordinates for the top row buttons
-        button1_x = (screen_width - 3 * button_width - 2 * button_margin) // 2
-        button2_x = button1_x + button_width + button_margin
-        button3_x = button2_x + button_width + button_margin
-        button_y = 20
-
-        # Position for "Get Data" button (Centered at the bottom)
-        get_data_x = (screen_width - button_width) // 2
-        get_data_y = screen_height - button_height - 30
-
-        # States of the buttons
-        button_state = ["OFF", "OFF", "OFF", "GET DATA"]
-        button_pressed = [False, False, False, False]
-        button_toggle = [False, False, False, False]
+        # Device buttons in a top row, "Get Data" centered at the bottom.
+        # Region i is button i; a press needs the fingertip to dwell on it
+        control_layout = ControlLayout(
+            ControlLayout.row(3, button_width, button_height, 20, screen_width, button_margin)
+            + ControlLayout.row(1, button_width, button_height, screen_height - button_height - 30,
+                                screen_width, button_margin),
+            dwell=args.button_dwell_ms / 1000.0, release_margin=args.button_release_margin)
 
         # Function to control LEDs via serial communication
         def control_led(button_index, state):
-            if not serial_connected:
-                print(f"Serial not connected, can't send command for Button {button_index + 1}")
-                return
-
-            command_map = {
-                0: (b'2', b'1'),
-                1: (b'3', b'4'),
-                2: (b'5', b'6'),
-                3: (b'7', None)  # "Get Data" button sends b'7'
-            }
-
-            # Map button indices to device names for voice feedback
-            device_names = {
-                0: "Light",
-                1: "Fan",
-                2: "Pump"
-            }
+            if not serial_transport.connected:
+                print(f"Serial not connected, Button {button_index + 1} will be applied on reconnect")
 
-            if button_index in command_map:
-                command_on, command_off = command_map[button_index]
-                if state == "ON" and command_on:
-                    ser.write(command_on)
-                    # Provide voice feedback for device turned ON
-                    if button_index in device_names and global_vars['mode_manager'].is_home_automation_mode():
-                        device = device_names[button_index]
-                        feedback_message = f"{device} is now on"
-                        # Use running instead of on for the fan
-                        if button_index == 1:  # Fan
-                            feedback_message = f"{device} is now running"
-                        if global_vars.get('controller'):
-                            global_vars['controller'].voice_assistant.speak(feedback_message)
-                elif state == "OFF" and command_off:
-                    ser.write(command_off)
-                    # Provide voice feedback for device turned OFF
-                    if button_index in device_names and global_vars['mode_manager'].is_home_automation_mode():
-                        device = device_names[button_index]
-                        feedback_message = f"{device} is now off"
-                        if global_vars.get('controller'):
-                            global_vars['controller'].voice_assistant.speak(feedback_message)
+            if button_index == 3:
+                # Queued for the serial worker; the reply is handled by on_serial_line.
+                # Status lines of earlier commands do not answer it
+                serial_worker.send(GET_DATA_COMMAND, tag=3, expect_response=True,
+                                   match=lambda line: line not in NODEMCU_STATUS_COMMANDS)
+            elif button_index in DEVICE_COMMANDS and state in DEVICE_COMMANDS[button_index]:
+                # Only the final state within the coalescing window is sent
+                device_commands.set(button_index, state)
 
-            print(f"Button {button_index + 1} sent: {state}")
-            socketio.emit('button_update', {'button': button_index + 1, 'state': state})
+            print(f"Button {button_index + 1} set: {state}")
+            emit_scheduler.emit('button_update', {'button': button_index + 1, 'state': state})
 
         # Function to draw rounded rectangles for buttons
         def draw_rounded_rectangle(frame, x, y, width, height, color, thickness=2, radius=20):
@@ -1506,192 +1742,182 @@ def process_frames():
             cv.rectangle(frame, (x + radius, y), (x + width - radius, y + height), (0, 0, 0), thickness)
             cv.rectangle(frame, (x, y + radius), (x + width, y + height - radius), (0, 0, 0), thickness)
 
-        # History variables
+        # History variables; fingertip and finger gesture histories are kept
+        # per hand (keyed by AdaptiveHandTracker.hand_keys)
         history_length = 16
-        point_history = deque(maxlen=history_length)
-        finger_gesture_history = deque(maxlen=history_length)
+        point_histories = {}
+        finger_gesture_histories = {}
         gesture_history = deque(maxlen=10)
 
-        socketio.emit('system_status', 'active')
+        emit_scheduler.emit('system_status', 'active')
         print("Camera successfully initialized")
 
         # Warm up the camera by reading a few frames
         for _ in range(5):
             cap.read()
 
-        while global_vars['processing_active']:
-            try:
-                fps = cvFpsCalc.get()
-                key = cv.waitKey(10)
-                if key == 27:  # ESC
-                    break
+        # Capture runs on its own thread so a slow iteration never lets
+        # frames queue up in the driver; we always process the newest one
+        grabber = FrameGrabber(cap).start()
+
+        # Every encoded frame is published once; Socket.IO and /video_feed
+        # viewers each pull from it at their own pace
+        broadcaster = FrameBroadcaster()
+        global_vars['broadcaster'] = broadcaster
+        global_vars['scaled_frames'] = ScaledFrameCache()
+        stream_controller = JpegQualityController(
+            min_quality=args.min_jpeg_quality, max_quality=args.max_jpeg_quality,
+            min_scale=args.min_stream_scale, max_kbps=args.max_stream_kbps,
+            max_encode_ms=args.max_encode_ms, max_ack_lag_ms=args.max_ack_lag_ms)
+        global_vars['stream_controller'] = stream_controller
+
+        # Landmark-only streaming (--stream_mode landmarks)
+        landmark_encoder = LandmarkPacketEncoder(delta=args.landmark_delta)
+        last_keyframe = 0.0
+        global_vars['stream_config'] = {
+            'stream_mode': args.stream_mode,
+            'labels': keypoint_classifier_labels,
+            'buttons': [{'x': x, 'y': y, 'width': width, 'height': height}
+                        for x, y, width, height in control_layout.regions],
+            'keyframe_interval': args.keyframe_interval,
+        }
+        emit_scheduler.emit('stream_config', global_vars['stream_config'])
+
+        # Full-size frames are recycled instead of allocated per iteration
+        frame_pool = FrameBufferPool()
+        allocation_counter = None
+        if args.debug_allocations:
+            # Threshold is set to the frame size once the first frame is in
+            allocation_counter = AllocationCounter().start()
+
+        tracker = None
+        if args.adaptive_tracking:
+            tracker = AdaptiveHandTracker(target_fps=args.target_fps,
+                                          max_interval=args.max_skip_frames,
+                                          motion_threshold=args.motion_threshold)
+
+        font = cv.FONT_HERSHEY_SIMPLEX
+
+        def capture_stage():
+            """Pulls the newest camera frame and mirrors it for selfie view."""
+            nonlocal cap, grabber
+
+            ret, frame = grabber.read()
+            if not ret:
+                if not grabber.failed:
+                    return None  # No new frame yet
+                print("Error reading frame from camera")
+                emit_scheduler.emit('camera_error', {'message': 'Frame read error'})
+                # Try to reinitialize the camera
+                grabber.stop()
+                cap.release()
+                cap = setup_camera(args)
+                if not cap or not cap.isOpened():
+                    raise StopPipeline()
+                grabber = FrameGrabber(cap).start()
+                return None
+
+            # Flipping also copies the frame out of the capture ring, into a
+            # pooled buffer that goes back to the pool once encoded or dropped
+            if allocation_counter is None:
+                mirrored = frame_pool.acquire(frame.shape)
+                cv.flip(frame, 1, dst=mirrored)
+            else:
+                allocation_counter.threshold_bytes = frame.nbytes
+                with allocation_counter.measure('capture'):
+                    mirrored = frame_pool.acquire(frame.shape)
+                    cv.flip(frame, 1, dst=mirrored)
+            return FramePacket(grabber.frame_seq, mirrored, grabber.frame_timestamp)
+
+        # Detection runs on a downscaled copy; landmarks come back normalized,
+        # so drawing and button hit-testing stay at full resolution
+        inference_resizer = InferenceResizer(args.inference_scale)
+
+        def run_hands(frame):
+            return hands.process(inference_resizer(frame))
+
+        def detect_stage(packet):
+            """Runs MediaPipe hand landmark detection."""
+            if tracker is not None:
+                # Detection only every Nth frame, predicted landmarks in between
+                packet.results, packet.measured = tracker.process(packet.frame, packet.timestamp, run_hands)
+            else:
+                packet.results, packet.measured = run_hands(packet.frame), True
+            return packet
+
+        def classify_stage(packet):
+            """Classifies hand signs and drives the mode manager and buttons."""
+            results = packet.results
+
+            # Reset values
+            current_gesture = "No Gesture Detected"
+            finger_gesture = None
+            confidence = 0.0
+            handedness = "Unknown"
+            landmark_list = []
+            brect = [0, 0, 0, 0]
+            hand_count = 0
+
+            # Buttons to highlight this frame and the label to show on them
+            pressed_buttons = {}
+            packet.hands = []
+
+            fingertips = []
+            if results.multi_hand_landmarks:
+                hand_count = len(results.multi_hand_landmarks)
+                # The same keys as the tracker's, unique even when two hands
+                # get the same handedness label
+                hand_keys = AdaptiveHandTracker.hand_keys(results.multi_handedness)
+                for hand_key, hand_landmarks, handedness_info in zip(
+                        hand_keys, results.multi_hand_landmarks, results.multi_handedness):
+                    # Extract handedness (left/right)
+                    handedness = handedness_info.classification[0].label
+
+                    # Process landmarks: one (21, 2) pixel array per hand
+                    points = landmark_array(packet.frame, hand_landmarks)
+                    brect = bounding_rect(points)
+                    landmark_list = points.tolist()
+
+                    # Get the position of the tip of the index finger (landmark 8)
+                    index_finger_tip = hand_landmarks.landmark[mp.solutions.hands.HandLandmark.INDEX_FINGER_TIP]
+
+                    # Get the pixel coordinates of the index finger tip
+                    h, w, _ = packet.frame.shape
+                    finger_x = int(index_finger_tip.x * w)
+                    finger_y = int(index_finger_tip.y * h)
+                    fingertips.append((finger_x, finger_y))
+
+                    packet.hands.append({
+                        'hand_landmarks': hand_landmarks,
+                        'handedness': handedness,
+                        'key': hand_key,
+                        'landmark_list': landmark_list,
+                        'brect': brect,
+                        'finger': (finger_x, finger_y),
+                        'features': normalize_landmarks(points),
+                    })
 
-                # Capture frame
-                ret, frame = cap.read()
-                if not ret:
-                    print("Error reading frame from camera")
-                    socketio.emit('camera_error', {'message': 'Frame read error'})
-                    # Try to reinitialize the camera
-                    cap.release()
-                    cap = setup_camera(args)
-                    if not cap or not cap.isOpened():
-                        break
-                    continue
+                # Gesture classification: every hand in a single invoke
+                hand_sign_ids, hand_sign_scores = keypoint_classifier.classify_batch(
+                    [hand['features'] for hand in packet.hands])
 
-                # Flip frame and process
-                frame = cv.flip(frame, 1)
-                debug_frame = copy.deepcopy(frame)
-                rgb_frame = cv.cvtColor(frame, cv.COLOR_BGR2RGB)
-
-                # Hand detection
-                rgb_frame.flags.writeable = False
-                results = hands.process(rgb_frame)
-                rgb_frame.flags.writeable = True
-
-                # Reset values
-                current_gesture = "No Gesture Detected"
-                confidence = 0.0
-                handedness = "Unknown"
-                landmark_list = []
-                brect = [0, 0, 0, 0]
-                hand_count = 0
-
-                # Always draw all buttons even if no hands are detected
-                # Top row buttons
-                draw_rounded_rectangle(debug_frame, button1_x, button_y, button_width, button_height,
-                                      (0, 0, 255), -1)  # Red button
-                draw_rounded_rectangle(debug_frame, button2_x, button_y, button_width, button_height,
-                                      (0, 0, 255), -1)  # Red button
-                draw_rounded_rectangle(debug_frame, button3_x, button_y, button_width, button_height,
-                                      (0, 0, 255), -1)  # Red button
-                # Get Data button at the bottom
-                draw_rounded_rectangle(debug_frame, get_data_x, get_data_y, button_width, button_height,
-                                      (0, 0, 255), -1)  # Red button
-
-                # Display button labels centered on buttons
-                font = cv.FONT_HERSHEY_SIMPLEX
-                # Get text size to center text for top row buttons
-                for i in range(3):
-                    text_size = cv.getTextSize(button_state[i], font, 0.8, 2)[0]
-                    button_x = button1_x + i * (button_width + button_margin)
-                    text_x = button_x + (button_width - text_size[0]) // 2
-                    text_y = button_y + (button_height + text_size[1]) // 2
-                    cv.putText(debug_frame, button_state[i], (text_x, text_y), font, 0.8, (255, 255, 255), 2, cv.LINE_AA)
-
-                # Get Data button text
-                text_size = cv.getTextSize(button_state[3], font, 0.8, 2)[0]
-                text_x = get_data_x + (button_width - text_size[0]) // 2
-                text_y = get_data_y + (button_height + text_size[1]) // 2
-                cv.putText(debug_frame, button_state[3], (text_x, text_y), font, 0.8, (255, 255, 255), 2, cv.LINE_AA)
-
-                if results.multi_hand_landmarks:
-                    hand_count = len(results.multi_hand_landmarks)
-                    for hand_landmarks, handedness_info in zip(results.multi_hand_landmarks, results.multi_handedness):
-                        # Extract handedness (left/right)
-                        handedness = handedness_info.classification[0].label
-
-                        # Process landmarks
-                        brect = calc_bounding_rect(debug_frame, hand_landmarks)
-                        landmark_list = calc_landmark_list(debug_frame, hand_landmarks)
-
-                        # Draw hand landmarks on the debug frame
-                        mp_drawing = mp.solutions.drawing_utils
-                        mp_drawing.draw_landmarks(debug_frame, hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS)
-
-                        # Get the position of the tip of the index finger (landmark 8)
-                        index_finger_tip = hand_landmarks.landmark[mp.solutions.hands.HandLandmark.INDEX_FINGER_TIP]
-
-                        # Get the pixel coordinates of the index finger tip
-                        h, w, _ = debug_frame.shape
-                        finger_x = int(index_finger_tip.x * w)
-                        finger_y = int(index_finger_tip.y * h)
-
-                        # Draw a circle at the index fingertip location
-                        cv.circle(debug_frame, (finger_x, finger_y), 10, (0, 255, 0), -1)  # Green circle
-
-                        # Only process button interactions in Home Automation mode
-                        if global_vars['mode_manager'].is_home_automation_mode():
-                            # Check if the finger is inside any of the button regions
-                            # Top row buttons
-                            for i in range(3):
-                                button_x = button1_x + i * (button_width + button_margin)
-                                if button_x <= finger_x <= button_x + button_width and button_y <= finger_y <= button_y + button_height:
-                                    if not button_pressed[i]:
-                                        # Toggle the button state (ON or OFF)
-                                        button_toggle[i] = not button_toggle[i]
-                                        button_state[i] = "ON" if button_toggle[i] else "OFF"
-                                        control_led(i, button_state[i])  # Send command to hardware
-                                        button_pressed[i] = True
-                                    draw_rounded_rectangle(debug_frame, button_x, button_y, button_width, button_height, (0, 255, 0), -1)
-                                    # Re-center text on green button
-                                    text_size = cv.getTextSize(button_state[i], font, 0.8, 2)[0]
-                                    text_x = button_x + (button_width - text_size[0]) // 2
-                                    text_y = button_y + (button_height + text_size[1]) // 2
-                                    cv.putText(debug_frame, button_state[i], (text_x, text_y), font, 0.8, (255, 255, 255), 2, cv.LINE_AA)
-                                else:
-                                    button_pressed[i] = False  # Reset button state
-                        else:
-                            # In General Recognition mode, just display the buttons without interaction
-                            for i in range(3):
-                                button_pressed[i] = False
-
-                        # Get Data button - only interactive in Home Automation mode
-                        if global_vars['mode_manager'].is_home_automation_mode():
-                            if get_data_x <= finger_x <= get_data_x + button_width and get_data_y <= finger_y <= get_data_y + button_height:
-                                if not button_pressed[3]:
-                                    button_pressed[3] = True
-                                    # Change button appearance
-                                    draw_rounded_rectangle(debug_frame, get_data_x, get_data_y, button_width, button_height, (0, 255, 0), -1)
-                                    text_size = cv.getTextSize("GETTING...", font, 0.8, 2)[0]
-                                    text_x = get_data_x + (button_width - text_size[0]) // 2
-                                    text_y = get_data_y + (button_height + text_size[1]) // 2
-                                    cv.putText(debug_frame, "GETTING...", (text_x, text_y), font, 0.8, (255, 255, 255), 2, cv.LINE_AA)
-
-                                    # Request data via serial if connected
-                                    if serial_connected:
-                                        try:
-                                            control_led(3, "ON")  # Send command to request data
-                                            time.sleep(0.1)  # Small delay to allow hardware to respond
-                                            received_data = ser.readline().decode('utf-8', errors='ignore').strip()
-                                            print("Received:", received_data)
-                                            socketio.emit('serial_data', {'data': received_data})
-                                            button_state[3] = "OK"  # Display message temporarily
-                                        except Exception as e:
-                                            print("Error reading serial data:", e)
-                                            button_state[3] = "ERROR"
-                                            socketio.emit('serial_error', {'message': f'Read error: {str(e)}'})
-                                    else:
-                                        button_state[3] = "NO SERIAL"
-                                else:
-                                    # Keep button green while pressed
-                                    draw_rounded_rectangle(debug_frame, get_data_x, get_data_y, button_width, button_height, (0, 255, 0), -1)
-                                    text_size = cv.getTextSize(button_state[3], font, 0.8, 2)[0]
-                                    text_x = get_data_x + (button_width - text_size[0]) // 2
-                                    text_y = get_data_y + (button_height + text_size[1]) // 2
-                                    cv.putText(debug_frame, button_state[3], (text_x, text_y), font, 0.8, (255, 255, 255), 2, cv.LINE_AA)
-                            else:
-                                button_pressed[3] = False  # Reset button state
-                                # Reset Get Data button to default after a short time
-                                if button_state[3] != "GET DATA" and button_state[3] != "NO SERIAL":
-                                    button_state[3] = "GET DATA"
-                        else:
-                            # In General Recognition mode, just reset the button state
-                            button_pressed[3] = False
-
-                        # Gesture classification
-                        pre_processed_landmark_list = pre_process_landmark(landmark_list)
-                        hand_sign_id = keypoint_classifier(pre_processed_landmark_list)
-
-                        # Check if the hand_sign_id is valid
-                        if 0 <= hand_sign_id < len(keypoint_classifier_labels):
-                            current_gesture = keypoint_classifier_labels[hand_sign_id]
-                            # Calculate confidence (replace with actual calculation if available)
-                            confidence = max(0.7, min(0.99, 0.85 + (hand_sign_id * 0.01)))
-                        else:
-                            print(f"Invalid hand_sign_id: {hand_sign_id}, max index: {len(keypoint_classifier_labels)-1}")
-                            current_gesture = "Unknown"
-                            confidence = 0.5
+                for hand, hand_sign_id, scores in zip(packet.hands, hand_sign_ids, hand_sign_scores):
+                    handedness = hand['handedness']
+                    landmark_list = hand['landmark_list']
+                    brect = hand['brect']
 
+                    # Check if the hand_sign_id is valid
+                    if 0 <= hand_sign_id < len(keypoint_classifier_labels):
+                        current_gesture = keypoint_classifier_labels[hand_sign_id]
+                    else:
+                        print(f"Invalid hand_sign_id: {hand_sign_id}, max index: {len(keypoint_classifier_labels)-1}")
+                        current_gesture = "Unknown"
+                    # Softmax probability of the winning class
+                    confidence = float(scores[hand_sign_id])
+
+                    # Low-confidence frames are still reported, but they are
+                    # not allowed to switch modes or trigger voice feedback
+                    if confidence >= args.min_gesture_confidence:
                         # Process the gesture with the mode manager
                         mode_changed = global_vars['mode_manager'].process_gesture(current_gesture, confidence)
                         current_mode = global_vars['mode_manager'].get_current_mode()
@@ -1699,103 +1925,359 @@ def process_frames():
 
                         # If mode changed, notify via socketio
                         if mode_changed:
-                            socketio.emit('mode_change', {'mode': current_mode})
+                            emit_scheduler.emit('mode_change', {'mode': current_mode})
                             print(f"Mode changed to: {current_mode}")
 
-                        # Update controller and history
+                        # Update controller
                         if global_vars.get('controller'):
-                            global_vars['controller'].process_gesture(current_gesture)
-                        gesture_history.append(current_gesture)
-
-                        # Point history tracking
-                        if hand_sign_id == 2:  # Point gesture
-                            point_history.append(landmark_list[8] if len(landmark_list) > 8 else [0, 0])
-                        else:
-                            point_history.append([0, 0])
-
-                        # Draw bounding box and landmarks
-                        debug_frame = draw_bounding_rect(True, debug_frame, brect)
-                        debug_frame = draw_landmarks(debug_frame, landmark_list)
-
-                        # Add text with gesture information
-                        cv.putText(debug_frame, f"{current_gesture} ({confidence:.2f})",
-                                  (brect[0], brect[1] - 10), cv.FONT_HERSHEY_SIMPLEX,
-                                  0.6, (0, 255, 0), 2)
-
-                # FPS counter removed from camera frame as it's already in the UI
-
-                # Convert frame to base64 for transmission
-                # Reduce image quality for faster transmission
-                encode_param = [int(cv.IMWRITE_JPEG_QUALITY), 80]
-                _, buffer = cv.imencode('.jpg', debug_frame, encode_param)
-                frame_base64 = base64.b64encode(buffer).decode('utf-8')
-
-                # Update global variables safely
-                with frame_lock:
-                    global_vars.update({
-                        'latest_gesture': current_gesture,
-                        'latest_confidence': confidence,
-                        'current_handedness': handedness,
-                        'current_landmarks': landmark_list,
-                        'current_bounding_box': brect,
-                        'detected_hands_count': hand_count,
-                        'current_fps': fps,
-                        'gesture_history': list(gesture_history),
-                        'latest_frame_base64': frame_base64,
-                        'button_states': button_state,
-                        'serial_connected': serial_connected,
-                        'current_mode': global_vars['mode_manager'].get_current_mode()
-                    })
-
-                # Emit gesture data via WebSocket
-                socketio.emit('gesture_update', {
-                    "frame": frame_base64,
-                    "gesture": current_gesture,
-                    "confidence": confidence,
-                    "handedness": handedness,
-                    "hand_count": hand_count,
-                    "fps": fps,
-                    "timestamp": time.time(),
-                    "initialized": True,
-                    "system_status": "active" if global_vars['processing_active'] else "inactive",
-                    "button_states": button_state,
-                    "serial_connected": serial_connected,
-                    "mode": global_vars['current_mode']
-                })
+                            global_vars['controller'].process_gesture(current_gesture, confidence)
+
+                    gesture_history.append(current_gesture)
+
+                    # Point history tracking
+                    point_history = point_histories.get(hand['key'])
+                    if point_history is None:
+                        point_history = point_histories[hand['key']] = PointHistoryBuffer(history_length)
+                    hand['point_history'] = point_history
+                    hand['pointing'] = hand_sign_id == POINTER_SIGN_ID
+                    point_history.append(landmark_list[8] if hand['pointing'] else (0, 0))
+
+                    hand['sign_id'] = int(hand_sign_id)
+                    hand['confidence'] = confidence
+                    hand['label'] = f"{current_gesture} ({confidence:.2f})"
+
+                # Finger gesture classification, only for hands showing the
+                # Pointer sign with a full history: one invoke for all of them
+                pointing_hands = [hand for hand in packet.hands
+                                  if hand['pointing'] and hand['point_history'].is_full]
+                if pointing_hands:
+                    h, w = packet.frame.shape[:2]
+                    finger_gesture_ids, _ = point_history_classifier.classify_batch(
+                        [hand['point_history'].features(w, h) for hand in pointing_hands])
+                    for hand, finger_gesture_id in zip(pointing_hands, finger_gesture_ids):
+                        history = finger_gesture_histories.setdefault(
+                            hand['key'], deque(maxlen=history_length))
+                        history.append(int(finger_gesture_id))
+
+                for hand in packet.hands:
+                    history = finger_gesture_histories.get(hand['key'])
+                    if hand['pointing'] and history:
+                        # Most common id over the recent frames smooths out flicker
+                        finger_gesture_id = Counter(history).most_common(1)[0][0]
+                        finger_gesture = point_history_classifier_labels[finger_gesture_id]
+                        hand['label'] += f" {finger_gesture}"
+                    else:
+                        finger_gesture = None
+                        if history:
+                            history.clear()
+                    hand['finger_gesture'] = finger_gesture
+                    # Snapshot for rendering on another thread
+                    hand['point_history'] = hand['point_history'].points().tolist() if hand['pointing'] else []
+
+            # Buttons: all fingertips against all regions in one pass, only
+            # interactive in Home Automation mode
+            if global_vars['mode_manager'].is_home_automation_mode():
+                for i in control_layout.update(fingertips):
+                    if i < 3:
+                        # Toggle the button state (ON or OFF)
+                        button_toggle[i] = not button_toggle[i]
+                        button_state[i] = "ON" if button_toggle[i] else "OFF"
+                        control_led(i, button_state[i])  # Send command to hardware
+                    elif serial_transport.connected:
+                        # Request data; the reply is handled by on_serial_line
+                        button_state[3] = "GETTING..."
+                        control_led(3, "ON")
+                    else:
+                        button_state[3] = "NO SERIAL"
+
+                # Keep buttons green while pressed
+                for i in control_layout.pressed:
+                    pressed_buttons[i] = button_state[i]
+
+                # Reset Get Data button to default once the finger leaves it
+                if fingertips and not control_layout.is_pressed(3) and \
+                        button_state[3] != "GET DATA" and button_state[3] != "NO SERIAL":
+                    button_state[3] = "GET DATA"
+            else:
+                # In General Recognition mode, just display the buttons without interaction
+                control_layout.release_all()
+
+            # Hands that left the frame start over when they come back
+            seen = {hand['key'] for hand in packet.hands}
+            for key in list(point_histories):
+                if key not in seen:
+                    point_histories[key].clear()
+                    finger_gesture_histories.pop(key, None)
+
+            packet.gesture = current_gesture
+            packet.finger_gesture = finger_gesture
+            packet.confidence = confidence
+            packet.handedness = handedness
+            packet.landmark_list = landmark_list
+            packet.brect = brect
+            packet.hand_count = hand_count
+            packet.pressed_buttons = pressed_buttons
+            # Snapshot the states; later frames keep mutating button_state
+            packet.button_states = list(button_state)
+            packet.gesture_history = list(gesture_history)
+            packet.mode = global_vars['mode_manager'].get_current_mode()
+            return packet
+
+        def draw_button_label(frame, x, y, label):
+            text_size = cv.getTextSize(label, font, 0.8, 2)[0]
+            text_x = x + (button_width - text_size[0]) // 2
+            text_y = y + (button_height + text_size[1]) // 2
+            cv.putText(frame, label, (text_x, text_y), font, 0.8, (255, 255, 255), 2, cv.LINE_AA)
+
+        # Buttons are drawn once per label and state into sprites, then only
+        # blended onto each frame
+        def render_button(canvas, label, pressed):
+            height, width = canvas.shape[:2]
+            color = (0, 255, 0) if pressed else (0, 0, 255)  # Green under a fingertip, red otherwise
+            draw_rounded_rectangle(canvas, 0, 0, width - 1, height - 1, color, -1)
+            draw_button_label(canvas, 0, 0, label)
+
+        button_overlay = ButtonOverlay(control_layout.regions, render_button)
+
+        def render_stage(packet):
+            """Draws buttons, landmarks and gesture labels onto the frame."""
+            # Earlier stages are done with the frame, so draw on it in place
+            debug_frame = packet.frame
+
+            # Always draw all buttons even if no hands are detected; buttons
+            # under a fingertip turn green
+            button_overlay.draw(debug_frame, packet.button_states, packet.pressed_buttons)
+
+            for hand in packet.hands:
+                # Draw hand landmarks on the debug frame
+                mp_drawing.draw_landmarks(debug_frame, hand['hand_landmarks'], mp.solutions.hands.HAND_CONNECTIONS)
+
+                # Draw a circle at the index fingertip location
+                cv.circle(debug_frame, hand['finger'], 10, (0, 255, 0), -1)  # Green circle
+
+                # Draw bounding box and landmarks
+                debug_frame = draw_bounding_rect(True, debug_frame, hand['brect'])
+                debug_frame = draw_landmarks(debug_frame, hand['landmark_list'])
+                debug_frame = draw_point_history(debug_frame, hand['point_history'])
+
+                # Add text with gesture information
+                cv.putText(debug_frame, hand['label'],
+                           (hand['brect'][0], hand['brect'][1] - 10), cv.FONT_HERSHEY_SIMPLEX,
+                           0.6, (0, 255, 0), 2)
+
+            packet.debug_frame = debug_frame
+            return packet
+
+        def publish_results(packet, fps):
+            """Publishes the frame's results as the latest snapshot and returns its gesture_update metadata."""
+            global_vars['state'].publish(
+                frame_seq=packet.seq,
+                gesture=packet.gesture,
+                finger_gesture=packet.finger_gesture,
+                confidence=packet.confidence,
+                handedness=packet.handedness,
+                landmarks=packet.landmark_list,
+                bounding_box=packet.brect,
+                hand_count=packet.hand_count,
+                fps=fps,
+                gesture_history=packet.gesture_history,
+                button_states=packet.button_states,
+                serial_connected=serial_transport.connected,
+                mode=packet.mode
+            )
+
+            return {
+                "seq": packet.seq,
+                "measured": packet.measured,
+                "gesture": packet.gesture,
+                "finger_gesture": packet.finger_gesture,
+                "confidence": packet.confidence,
+                "handedness": packet.handedness,
+                "hand_count": packet.hand_count,
+                "fps": fps,
+                "dropped_frames": grabber.dropped_count,
+                "timestamp": time.time(),
+                "initialized": True,
+                "system_status": "active" if global_vars['processing_active'] else "inactive",
+                "button_states": packet.button_states,
+                "serial_connected": serial_transport.connected,
+                "mode": packet.mode
+            }
 
-            except Exception as e:
-                print(f"Error in processing loop: {e}")
-                traceback.print_exc()
-                socketio.emit('camera_error', {'message': f'Processing error: {str(e)}'})
-                # Short sleep to prevent error flooding
-                time.sleep(0.5)
+        def encode_stage(packet):
+            """Encodes the rendered frame and publishes the results."""
+            fps = cvFpsCalc.get()
+
+            # Quality and scale follow the stream budget (encode time,
+            # bandwidth, client ack lag)
+            quality, scale = stream_controller.settings()
+            encode_started = time.perf_counter()
+            stream_frame = packet.debug_frame
+            if scale < 1.0:
+                height, width = stream_frame.shape[:2]
+                small = frame_pool.acquire((max(1, round(height * scale)), max(1, round(width * scale)), 3))
+                stream_frame = cv.resize(stream_frame, (small.shape[1], small.shape[0]), dst=small,
+                                         interpolation=cv.INTER_AREA)
+            _, buffer = cv.imencode('.jpg', stream_frame, [int(cv.IMWRITE_JPEG_QUALITY), quality])
+            if stream_frame is not packet.debug_frame:
+                frame_pool.release(stream_frame)
+            stream_controller.record_frame(packet.seq, (time.perf_counter() - encode_started) * 1000.0,
+                                           len(buffer))
+
+            # Encoded once and handed to every viewer by the broadcaster
+            gesture_update = publish_results(packet, fps)
+            gesture_update.update({
+                "jpeg_quality": quality,
+                "stream_scale": scale,
+                "stream_kbps": round(stream_controller.kbps, 1)
+            })
+            broadcaster.publish(buffer.tobytes(), packet.seq, gesture_update)
+
+            frame_pool.release(packet.frame)
+            packet.frame = packet.debug_frame = None
+            return packet
+
+        def landmark_stage(packet):
+            """Emits a compact landmark packet instead of drawing and encoding the frame."""
+            nonlocal last_keyframe
+            fps = cvFpsCalc.get()
+            height, width = packet.frame.shape[:2]
+            landmark_packet = landmark_encoder.encode(packet.seq, width, height, packet.hands)
+
+            # Occasional small, undrawn JPEG for clients to draw over
+            now = time.monotonic()
+            if args.keyframe_interval > 0 and now - last_keyframe >= args.keyframe_interval:
+                last_keyframe = now
+                small = frame_pool.acquire((height // 2, width // 2, 3))
+                cv.resize(packet.frame, (width // 2, height // 2), dst=small, interpolation=cv.INTER_AREA)
+                _, buffer = cv.imencode('.jpg', small, [int(cv.IMWRITE_JPEG_QUALITY), args.min_jpeg_quality])
+                frame_pool.release(small)
+                broadcaster.publish(buffer.tobytes(), packet.seq)
+
+            gesture_update = publish_results(packet, fps)
+            gesture_update["pressed_buttons"] = packet.pressed_buttons
+            emit_scheduler.emit('landmark_packet', landmark_packet)
+            emit_gesture_update(gesture_update)
+
+            frame_pool.release(packet.frame)
+            packet.frame = None
+            return packet
+
+        def send_socketio_frames(subscription):
+            """Socket.IO subscriber: emits each frame it gets to all clients."""
+            while True:
+                frame = subscription.next(timeout=1.0)
+                if frame is None:
+                    if subscription.closed:
+                        break
+                    continue
+                if args.stream_mode == 'landmarks':
+                    # Only keyframes go through here; landmarks and metadata
+                    # are emitted by the landmark stage
+                    emit_scheduler.emit('gesture_keyframe', {"seq": frame.seq, "frame": frame.data})
+                elif args.transport == 'binary':
+                    # JPEG goes out as a Socket.IO binary attachment
+                    emit_scheduler.emit('gesture_frame', {"seq": frame.seq, "frame": frame.data})
+                    emit_gesture_update(frame.metadata)
+                else:
+                    emit_gesture_update(frame.metadata, frame.data)
+
+        def on_stage_error(stage_name, e):
+            print(f"Error in processing stage '{stage_name}': {e}")
+            traceback.print_exc()
+            emit_scheduler.emit('camera_error', {'message': f'Processing error: {str(e)}'})
+            # Short sleep to prevent error flooding
+            time.sleep(0.5)
+
+        # Each stage runs on its own worker so MediaPipe can work on frame
+        # N+1 while frame N is still being drawn and encoded
+        if args.stream_mode == 'landmarks':
+            # No server-side drawing or JPEG per frame: clients render
+            stages = [
+                ('detect', detect_stage),
+                ('classify', classify_stage),
+                ('landmarks', landmark_stage),
+            ]
+        else:
+            stages = [
+                ('detect', detect_stage),
+                ('classify', classify_stage),
+                ('render', render_stage),
+                ('encode', encode_stage),
+            ]
+        if allocation_counter is not None:
+            stages = [(name, allocation_counter.wrap(name, stage)) for name, stage in stages]
+
+        pipeline = FramePipeline(
+            capture_stage,
+            stages,
+            maxsize=args.pipeline_queue_size,
+            policy=args.pipeline_policy,
+            on_error=on_stage_error,
+            on_drop=lambda packet: frame_pool.release(packet.frame),
+        )
+        global_vars['pipeline'] = pipeline
+        pipeline.start()
+        threading.Thread(target=send_socketio_frames, args=(broadcaster.subscribe('socketio'),),
+                         daemon=True).start()
+
+        # Supervise until detection is stopped or a stage shuts the pipeline down
+        while global_vars['processing_active'] and not pipeline.wait(0.1):
+            global_vars['capture_stats'] = grabber.stats()
+            if tracker is not None:
+                global_vars['tracking_stats'] = tracker.stats()
+            global_vars['broadcast_stats'] = dict(broadcaster.stats(),
+                                                  scaled_frames=global_vars['scaled_frames'].stats(),
+                                                  stream=stream_controller.stats(),
+                                                  landmarks=landmark_encoder.stats())
+            global_vars['memory_stats'] = {'frame_pool': frame_pool.stats()}
+            if allocation_counter is not None:
+                global_vars['memory_stats']['allocations'] = allocation_counter.stats()
+            global_vars['overlay_stats'] = button_overlay.stats()
+            global_vars['serial_stats'] = dict(serial_worker.stats(), devices=device_commands.stats(),
+                                               link=serial_transport.health())
 
     except Exception as e:
         print(f"Camera processing error: {str(e)}")
         traceback.print_exc()
-        socketio.emit('camera_error', {'message': f'Processing error: {str(e)}'})
+        emit_scheduler.emit('camera_error', {'message': f'Processing error: {str(e)}'})
 
     finally:
         # Set the processing flag to false to ensure other code knows we've stopped
         global_vars['processing_active'] = False
 
+        # Stop the stage workers before tearing down what they use
+        if 'pipeline' in locals() and pipeline is not None:
+            pipeline.stop()
+
+        if 'broadcaster' in locals():
+            broadcaster.close()
+
         # Release camera resources
+        if 'grabber' in locals() and grabber is not None:
+            grabber.stop()
+
         if 'cap' in locals() and cap is not None:
             if cap.isOpened():
                 cap.release()
                 print("Camera released")
 
         # Close serial connection if open
-        if 'ser' in locals() and serial_connected:
-            ser.close()
+        if 'serial_transport' in locals():
+            device_commands.stop()
+            serial_transport.stop()
+            serial_worker.stop()
             print("Serial connection closed")
 
         if 'hands' in locals() and hands:
             hands.close()
 
+        if 'allocation_counter' in locals() and allocation_counter is not None:
+            allocation_counter.stop()
+
         # Notify clients
-        socketio.emit('system_status', 'inactive')
-        socketio.emit('camera_error', {'message': 'Camera processing stopped'})
+        emit_scheduler.emit('system_status', 'inactive')
+        emit_scheduler.emit('camera_error', {'message': 'Camera processing stopped'})
         print("Processing thread terminated cleanly")
 
 # Function to draw rounded rectangles for buttons (copied from first code sample)
@@ -1824,111 +2306,28 @@ def select_mode(key, mode):
     return number, mode
 
 
-def calc_bounding_rect(image, landmarks):
-    image_width, image_height = image.shape[1], image.shape[0]
-
-    landmark_array = np.empty((0, 2), int)
-
-    for _, landmark in enumerate(landmarks.landmark):
-        landmark_x = min(int(landmark.x * image_width), image_width - 1)
-        landmark_y = min(int(landmark.y * image_height), image_height - 1)
-
-        landmark_point = [np.array((landmark_x, landmark_y))]
-
-        landmark_array = np.append(landmark_array, landmark_point, axis=0)
-
-    x, y, w, h = cv.boundingRect(landmark_array)
-
-    return [x, y, x + w, y + h]
-
-
-def calc_landmark_list(image, landmarks):
-    image_width, image_height = image.shape[1], image.shape[0]
-
-    landmark_point = []
-
-    # Keypoint
-    for _, landmark in enumerate(landmarks.landmark):
-        landmark_x = min(int(landmark.x * image_width), image_width - 1)
-        landmark_y = min(int(landmark.y * image_height), image_height - 1)
-
-        landmark_point.append([landmark_x, landmark_y])
-
-    return landmark_point
-
-
-def pre_process_landmark(landmark_list):
-    temp_landmark_list = copy.deepcopy(landmark_list)
-
-    # Convert to relative coordinates
-    base_x, base_y = 0, 0
-    for index, landmark_point in enumerate(temp_landmark_list):
-        if index == 0:
-            base_x, base_y = landmark_point[0], landmark_point[1]
-
-        temp_landmark_list[index][0] = temp_landmark_list[index][0] - base_x
-        temp_landmark_list[index][1] = temp_landmark_list[index][1] - base_y
-
-    # Convert to a one-dimensional list
-    temp_landmark_list = list(
-        itertools.chain.from_iterable(temp_landmark_list))
-
-    # Normalization
-    max_value = max(list(map(abs, temp_landmark_list)))
-
-    # print("MV", max_value)
-
-    def normalize_(n):
-        return n / max_value
-
-    temp_landmark_list = list(map(normalize_, temp_landmark_list))
-
-    return temp_landmark_list
-
-
-def pre_process_point_history(image, point_history):
-    image_width, image_height = image.shape[1], image.shape[0]
-
-    temp_point_history = copy.deepcopy(point_history)
-
-    # Convert to relative coordinates
-    base_x, base_y = 0, 0
-    for index, point in enumerate(temp_point_history):
-        if index == 0:
-            base_x, base_y = point[0], point[1]
-
-        temp_point_history[index][0] = (temp_point_history[index][0] -
-                                        base_x) / image_width
-        temp_point_history[index][1] = (temp_point_history[index][1] -
-                                        base_y) / image_height
-
-    # Convert to a one-dimensional list
-    temp_point_history = list(
-        itertools.chain.from_iterable(temp_point_history))
-
-    return temp_point_history
-
-
-def send_preview_frames():
+def send_preview_frames(transport='base64'):
     """Thread function to send preview frames via WebSocket"""
     while preview_active:
         ret, frame = camera.read()
         if ret:
-            # Convert frame to base64
             _, buffer = cv2.imencode('.jpg', frame)
-            b64_frame = base64.b64encode(buffer).decode('utf-8')
-
-            # Send frame via WebSocket
-            socketio.emit('preview_frame', {
-                'frame': b64_frame,
+            frame_jpeg = buffer.tobytes()
+
+            # Send frame via WebSocket, as raw bytes (binary attachment) or base64
+            b64_frame = None
+            if transport == 'base64' or recording_active:
+                b64_frame = base64.b64encode(frame_jpeg).decode('utf-8')
+            emit_scheduler.emit('preview_frame', {
+                'frame': frame_jpeg if transport == 'binary' else b64_frame,
                 'timestamp': datetime.now().isoformat()
             })
 
-            # Save frame if recording
+            # Save frame if recording (kept as base64, it is returned as JSON)
             if recording_active:
                 with recording_lock:
                     recording_frames.append(b64_frame)
-                    socketio.emit('frame_captured', {
+                    emit_scheduler.emit('frame_captured', {
                         'count': len(recording_frames),
                         'timestamp': datetime.now().isoformat()
                     })
@@ -2271,7 +2670,7 @@ def start_detection():
             process_thread = threading.Thread(target=process_frames, daemon=True)
             global_vars['process_thread'] = process_thread
             process_thread.start()  # ✅ Use daemon thread (auto-exits)
-            socketio.emit('system_status', 'active')
+            emit_scheduler.emit('system_status', 'active')
             print("Detection process started and system_status emitted")
         else:
             print("Detection already active, not starting new thread")
@@ -2315,7 +2714,7 @@ def stop_detection():
         print("No process_thread in global_vars")
 
     # Explicitly emit a status update to all clients
-    socketio.emit('system_status', 'inactive')
+    emit_scheduler.emit('system_status', 'inactive')
     print("Emitted system_status inactive")
 
     return jsonify({"status": "Detection Stopped"})
@@ -2338,43 +2737,224 @@ def force_cleanup():
                 pass
 
     # Notify all clients
-    socketio.emit('system_status', 'inactive')
+    emit_scheduler.emit('system_status', 'inactive')
 
     return jsonify({"status": "Emergency Cleanup Complete"})
 
 
+def emit_gesture_update(update, frame_data=None):
+    """Sends gesture_update to every client in the format it negotiated.
+
+    JSON clients get the dict (with ``frame_data`` base64-encoded in it),
+    binary clients the WireSchema encoding (with ``frame_data`` as a
+    gesture_frame attachment). Each form is built only while someone wants it.
+    """
+    wire_schema = global_vars.get('wire_schema')
+    binary_clients = global_vars['wire_clients'] if wire_schema is not None else frozenset()
+    if binary_clients:
+        if frame_data is not None:
+            emit_scheduler.emit('gesture_frame', {"seq": update['seq'], "frame": frame_data}, to=binary_clients)
+        emit_scheduler.emit('gesture_update', wire_schema.encode_update(update), to=binary_clients)
+
+    json_clients = emit_scheduler.clients() - binary_clients
+    if json_clients:
+        if frame_data is not None:
+            update = dict(update, frame=base64.b64encode(frame_data).decode('utf-8'))
+        emit_scheduler.emit('gesture_update', update, to=json_clients)
+
+
+@socketio.on('connect')
+def handle_connect():
+    """Tells a new client how frames are streamed (landmark mode needs the layout)"""
+    emit_scheduler.add_client(request.sid)
+    if global_vars.get('stream_config'):
+        emit_scheduler.emit('stream_config', global_vars['stream_config'], to=request.sid)
+
+
+@socketio.on('disconnect')
+def handle_disconnect():
+    emit_scheduler.remove_client(request.sid)
+    global_vars['wire_clients'] = global_vars['wire_clients'] - {request.sid}
+
+
+@socketio.on('set_emit_rate')
+def handle_set_emit_rate(data):
+    """Lets a client lower (or raise) how often it gets a state topic, e.g. {"topic": "gesture_update", "rate": 10}"""
+    if not isinstance(data, dict) or data.get('topic') not in EMIT_STATE_TOPICS:
+        return
+    try:
+        rate = float(data.get('rate'))
+    except (TypeError, ValueError):
+        return
+    if rate >= 0:
+        emit_scheduler.set_rate(data['topic'], rate, client=request.sid)
+
+
+@socketio.on('negotiate_wire')
+def handle_negotiate_wire(data):
+    """Switches a client to the binary gesture_update encoding if it supports our version.
+
+    Clients send ``{"versions": [...]}``; the reply is a ``wire_format``
+    event naming the chosen format, followed by the schema (``wire_schema``,
+    also re-sent whenever processing restarts) for binary clients.
+    """
+    versions = data.get('versions', []) if isinstance(data, dict) else []
+    if WireSchema.version not in versions:
+        emit_scheduler.emit('wire_format', {'format': 'json'}, to=request.sid)
+        return
+
+    # Replaced rather than mutated: emitters iterate it from other threads
+    global_vars['wire_clients'] = global_vars['wire_clients'] | {request.sid}
+    emit_scheduler.emit('wire_format', {'format': 'binary', 'version': WireSchema.version}, to=request.sid)
+    if global_vars.get('wire_schema') is not None:
+        emit_scheduler.emit('wire_schema', global_vars['wire_schema'].describe(), to=request.sid)
+
+
+@socketio.on('frame_ack')
+def handle_frame_ack(data):
+    """Clients acknowledge each frame they display; feeds the stream controller"""
+    stream_controller = global_vars.get('stream_controller')
+    if stream_controller is not None and isinstance(data, dict) and 'seq' in data:
+        stream_controller.ack(data['seq'])
+
+
 @app.route('/gesture-data', methods=['GET'])
 def get_gesture_data():
-    """Retrieves the latest gesture data"""
+    """Retrieves the latest gesture data.
+
+    All fields come from one frame's snapshot; ``seq`` identifies it. With
+    ``?since=<seq>`` the request long-polls: it returns as soon as a newer
+    frame is published, or the current one after ``timeout`` seconds
+    (default 10, at most 30).
+
+    JSON by default; ``?format=binary`` (or an Accept header naming the wire
+    content type) returns the WireSchema encoding, whose enum tables are
+    served by /wire-schema.
+    """
     global global_vars
 
-    return jsonify({
-        "gesture_id": global_vars['controller'].current_gesture_id if global_vars.get('controller') else 0,
-        "gesture_name": global_vars.get('latest_gesture', 'No Gesture Detected'),
-        "confidence": global_vars.get('latest_confidence', 0.0),
-        "handedness": global_vars.get('current_handedness', "Unknown"),
-        "landmarks": global_vars.get('current_landmarks', []),
-        "bounding_box": global_vars.get('current_bounding_box', [0, 0, 0, 0]),
-        "hand_count": global_vars.get('detected_hands_count', 0),
-        "fps": global_vars.get('current_fps', 0),
-        "timestamp": time.time(),
+    state = global_vars['state']
+    since = request.args.get('since')
+    if since is None:
+        result = state.latest
+    else:
+        try:
+            since = int(since)
+            timeout = float(request.args.get('timeout', 10.0))
+        except ValueError:
+            return jsonify({"error": "since must be an integer and timeout a number"}), 400
+        if not math.isfinite(timeout):
+            return jsonify({"error": "timeout must be a finite number"}), 400
+        timeout = min(max(timeout, 0.0), 30.0)
+        result = state.wait_newer(since, timeout)
+
+    gesture_data = {
+        "seq": result.seq,
+        "gesture_id": getattr(global_vars.get('controller'), 'current_gesture_id', 0),
+        "gesture_name": result.gesture,
+        "finger_gesture": result.finger_gesture,
+        "confidence": result.confidence,
+        "handedness": result.handedness,
+        "landmarks": result.landmarks,
+        "bounding_box": result.bounding_box,
+        "hand_count": result.hand_count,
+        "fps": result.fps,
+        "timestamp": result.timestamp,
         "system_status": "active" if global_vars.get('processing_active', False) else "inactive",
-        "gesture_history": list(global_vars.get('gesture_history', [])),
-        "mode": global_vars.get('current_mode', 'general_recognition')
+        "gesture_history": result.gesture_history,
+        "mode": result.mode
+    }
+
+    wire_schema = global_vars.get('wire_schema')
+    wants_binary = (request.args.get('format') == 'binary'
+                    or WireSchema.content_type in request.headers.get('Accept', ''))
+    if wants_binary and wire_schema is not None:
+        return Response(wire_schema.encode_gesture_data(gesture_data), mimetype=WireSchema.content_type,
+                        headers={'X-Wire-Schema-Version': str(WireSchema.version)})
+    # JSON also when no schema exists yet (processing never started)
+    return jsonify(gesture_data)
+
+
+@app.route('/wire-schema', methods=['GET'])
+def get_wire_schema():
+    """Enum tables and epoch needed to decode binary gesture data"""
+    wire_schema = global_vars.get('wire_schema')
+    if wire_schema is None:
+        return jsonify({"error": "Processing has not started yet"}), 503
+    return jsonify(wire_schema.describe())
+
+
+@app.route('/stats', methods=['GET'])
+def get_stats():
+    """Reports per-stage pipeline timings, queue depths and capture drops"""
+    pipeline = global_vars.get('pipeline')
+    controller = global_vars.get('controller')
+
+    return jsonify({
+        "pipeline": pipeline.stats() if pipeline is not None else None,
+        "capture": global_vars.get('capture_stats', {}),
+        "tracking": global_vars.get('tracking_stats', {}),
+        "memory": global_vars.get('memory_stats', {}),
+        "broadcast": global_vars.get('broadcast_stats', {}),
+        "overlay": global_vars.get('overlay_stats', {}),
+        "emits": emit_scheduler.stats(),
+        "serial": global_vars.get('serial_stats', {}),
+        "speech": dict(controller.voice_assistant.speech.stats(),
+                       phrases=controller.voice_assistant.phrases.stats()) if controller is not None else None,
+        "timestamp": time.time()
     })
 
 
 @app.route('/video_feed')
 def video_feed():
+    """MJPEG stream of the processed frames.
+
+    Optional query parameters: ``fps`` caps this client's frame rate and
+    ``scale`` (0.1-1) shrinks the frames; scaled JPEGs are shared between
+    clients asking for the same scale. ``scale`` applies to the broadcast
+    frame, which the stream controller may already have shrunk down to
+    --min_stream_scale, so the result can be smaller than ``scale`` times
+    the camera resolution.
+    """
+    broadcaster = global_vars.get('broadcaster')
+    scaled_frames = global_vars.get('scaled_frames')
+    if broadcaster is None or broadcaster.closed:
+        return jsonify({"error": "Detection is not running"}), 503
+
+    try:
+        max_fps = float(request.args.get('fps', 0))
+        scale = float(request.args.get('scale', 1.0))
+    except ValueError:
+        return jsonify({"error": "fps and scale must be numbers"}), 400
+    if max_fps < 0 or not 0.1 <= scale <= 1.0:
+        return jsonify({"error": "fps must be >= 0 and scale between 0.1 and 1"}), 400
+    # Round so clients share cache entries
+    scale = round(scale, 2)
+    min_interval = 1.0 / max_fps if max_fps else 0.0
+
     def generate():
-        while True:
-            with frame_lock:
-                latest_frame = global_vars.get('latest_frame_base64', None)
-                if latest_frame is None:
+        # Each stream is its own subscriber: a slow viewer only skips frames.
+        # Waiting on the broadcaster keeps an idle stream off the CPU.
+        subscription = broadcaster.subscribe('mjpeg')
+        last_sent = 0.0
+        try:
+            while True:
+                if min_interval:
+                    wait = last_sent + min_interval - time.monotonic()
+                    if wait > 0:
+                        time.sleep(wait)
+                frame = subscription.next(timeout=1.0)
+                if frame is None:
+                    if subscription.closed:
+                        break
                     continue
+                data = scaled_frames.get(frame, scale)
+                last_sent = time.monotonic()
                 yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + latest_frame.encode('utf-8') + b'\r\n')
-            time.sleep(0.033)  # ~30 FPS
+                       b'Content-Type: image/jpeg\r\n'
+                       b'Content-Length: ' + str(len(data)).encode() + b'\r\n\r\n' + data + b'\r\n')
+        finally:
+            subscription.close()
 
     return Response(generate(), mimetype='multipart/x-mixed-replace; boundary=frame')
 
@@ -2389,7 +2969,7 @@ def start_preview():
             try:
                 camera = cv2.VideoCapture(0)
                 preview_active = True
-                threading.Thread(target=send_preview_frames).start()
+                threading.Thread(target=send_preview_frames, args=(get_args().transport,)).start()
                 return jsonify({'message': 'Preview started'}), 200
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
@@ -2460,7 +3040,7 @@ def set_mode():
     global_vars['current_mode'] = current_mode
 
     # Notify all clients about the mode change
-    socketio.emit('mode_change', {'mode': current_mode})
+    emit_scheduler.emit('mode_change', {'mode': current_mode})
 
     return jsonify({
         'success': success,
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Parity and speed check of the NumPy classifier backend.
+
+Two checks, run over every row of the training CSVs; the script exits
+non-zero if either fails:
+
+* loaders: the keypoint model's ``.keras`` weights and its ``.tflite``
+  must describe the same network. Biases, activations and float layers
+  must be identical, the float kernels must round to exactly the stored
+  int8 weights at the ``.tflite`` scales, and the ``.keras`` network
+  quantized that way must give bit-identical outputs. Needs NumPy only.
+  (The point-history ``.hdf5`` is from another training run than its
+  ``.tflite``, so there is nothing to compare it with.)
+* tflite: the NumPy backend against the tflite backend, built exactly as
+  app.py builds it. Predicted classes must be identical and probabilities
+  within --atol. Both classifiers run TFLite with the builtin kernels, which
+  the NumPy backend reproduces; the default XNNPACK delegate would round
+  the int8 keypoint model differently (~0.04 in probability). Skipped when
+  TensorFlow is missing.
+
+Per-call latency for single samples and for one batch is reported too.
+
+    python benchmarks/classifier_backends.py
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from model import KeyPointClassifier, NumpyMLP, PointHistoryClassifier  # noqa: E402
+from model.numpy_mlp import DenseLayer  # noqa: E402
+
+MODELS = [
+    ('keypoint', KeyPointClassifier,
+     'model/keypoint_classifier/keypoint_classifier.tflite',
+     'model/keypoint_classifier/keypoint.csv'),
+    ('point_history', PointHistoryClassifier,
+     'model/point_history_classifier/point_history_classifier.tflite',
+     'model/point_history_classifier/point_history.csv'),
+]
+LOADER_PAIRS = [
+    ('keypoint', 'model/keypoint_classifier/keypoint_classifier.tflite',
+     'model/keypoint_classifier/keypoint_classifier.keras',
+     'model/keypoint_classifier/keypoint.csv'),
+]
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--atol", help='max allowed probability difference against TFLite',
+                        type=float, default=1e-5)
+    parser.add_argument("--repeat", help='timing repetitions', type=int, default=200)
+    return parser.parse_args()
+
+
+def load_samples(csv_path):
+    return np.loadtxt(csv_path, delimiter=',', dtype=np.float32)[:, 1:]
+
+
+def time_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000.0
+
+
+def check_loaders(name, tflite_path, weights_path, samples):
+    tflite = NumpyMLP.load(tflite_path)
+    weights = NumpyMLP.load(weights_path)
+    problems = []
+    if len(tflite.layers) != len(weights.layers):
+        problems.append(f"{len(tflite.layers)} vs {len(weights.layers)} layers")
+
+    quantized = []
+    for i, (reference, layer) in enumerate(zip(tflite.layers, weights.layers)):
+        if reference.kernel.shape != layer.kernel.shape:
+            problems.append(f"layer {i}: kernel {reference.kernel.shape} vs {layer.kernel.shape}")
+            continue
+        if reference.activation != layer.activation:
+            problems.append(f"layer {i}: activation {reference.activation} vs {layer.activation}")
+        if not np.array_equal(reference.bias, layer.bias):
+            problems.append(f"layer {i}: biases differ")
+
+        if reference.kernel_scale is None:
+            if not np.array_equal(reference.kernel, layer.kernel):
+                problems.append(f"layer {i}: float kernels differ")
+            quantized.append(layer)
+            continue
+        kernel = np.round(layer.kernel / reference.kernel_scale)
+        if not np.array_equal(kernel, reference.kernel):
+            problems.append(f"layer {i}: kernel does not quantize to the int8 weights")
+        quantized.append(DenseLayer(kernel, layer.bias, layer.activation,
+                                    kernel_scale=reference.kernel_scale,
+                                    asymmetric_inputs=reference.asymmetric_inputs))
+
+    if not problems:
+        expected = tflite.predict(samples)
+        actual = NumpyMLP(quantized).predict(samples)
+        if not np.array_equal(expected, actual):
+            problems.append(f"outputs differ by up to {np.abs(expected - actual).max():.2e}")
+
+    ok = not problems
+    print(f"{name} loaders: {os.path.basename(weights_path)} vs {os.path.basename(tflite_path)}, "
+          f"{len(samples)} samples -> {'OK' if ok else 'FAIL: ' + '; '.join(problems)}")
+    return ok
+
+
+def check_tflite(name, tflite, numpy_backend, samples, atol):
+    ids, scores = tflite.classify_batch(samples)
+    numpy_ids, numpy_scores = numpy_backend.classify_batch(samples)
+
+    mismatches = int(np.count_nonzero(ids != numpy_ids))
+    max_diff = float(np.abs(scores - numpy_scores).max())
+    ok = mismatches == 0 and max_diff <= atol
+    print(f"{name} tflite: {len(samples)} samples, class mismatches={mismatches}, "
+          f"max |p_tflite - p_numpy|={max_diff:.2e} (atol {atol:.0e}) -> {'OK' if ok else 'FAIL'}")
+    return ok
+
+
+def main():
+    args = get_args()
+    failed = False
+
+    for name, tflite_path, weights_path, csv_path in LOADER_PAIRS:
+        failed |= not check_loaders(name, tflite_path, weights_path, load_samples(csv_path))
+
+    tensorflow_available = importlib.util.find_spec('tensorflow') is not None
+    if not tensorflow_available:
+        print("tflite parity: skipped, TensorFlow is not installed")
+
+    for name, classifier_class, model_path, csv_path in MODELS:
+        samples = load_samples(csv_path)
+        backends = [('numpy', classifier_class(model_path=model_path, backend='numpy'))]
+        if tensorflow_available:
+            backends.append(('tflite', classifier_class(model_path=model_path, backend='tflite')))
+            failed |= not check_tflite(name, backends[1][1], backends[0][1], samples, args.atol)
+
+        single = samples[0]
+        batch = samples[:64]
+        print(f"{name} latency:")
+        for label, classifier in backends:
+            single_ms = time_call(lambda: classifier(single), args.repeat)
+            batch_ms = time_call(lambda: classifier.classify_batch(batch), args.repeat)
+            print(f"  {label:>6}: single {single_ms:.4f} ms, batch of {len(batch)} {batch_ms:.4f} ms")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Bandwidth and CPU cost of the base64 and binary frame transports.
+
+Encodes frames the way the encode stage does (JPEG, quality 80) and builds
+what goes on the wire for one gesture_update in each mode:
+
+* base64: one JSON event with the JPEG base64-encoded in "frame"
+* binary: a gesture_frame event whose JPEG travels as a Socket.IO binary
+  attachment, plus the gesture_update metadata without a frame
+
+Reports bytes per frame, server CPU to build the payload and the client
+work it implies (base64 decode) per frame.
+
+    python benchmarks/frame_transport.py --video hands.mp4
+    python benchmarks/frame_transport.py            # synthetic 1280x720 scene
+"""
+import argparse
+import base64
+import json
+import sys
+import time
+
+import cv2 as cv
+import numpy as np
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--video", help='video file to take frames from', default=None)
+    parser.add_argument("--frames", help='number of frames', type=int, default=100)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--quality", help='JPEG quality', type=int, default=80)
+    return parser.parse_args()
+
+
+def synthetic_frames(args):
+    # A moving gradient with shapes compresses like a real scene, unlike noise
+    ys, xs = np.mgrid[0:args.height, 0:args.width]
+    frames = []
+    for index in range(args.frames):
+        frame = np.empty((args.height, args.width, 3), dtype=np.uint8)
+        frame[..., 0] = (xs + 3 * index) % 256
+        frame[..., 1] = (ys + 2 * index) % 256
+        frame[..., 2] = ((xs + ys) // 4) % 256
+        cv.circle(frame, (200 + 5 * index % 800, 360), 80, (40, 180, 220), -1)
+        cv.putText(frame, f"frame {index}", (40, 80), cv.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
+        frames.append(frame)
+    return frames
+
+
+def video_frames(args):
+    cap = cv.VideoCapture(args.video)
+    frames = []
+    while len(frames) < args.frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def metadata(seq):
+    return {
+        "seq": seq, "measured": True, "gesture": "Pointer", "finger_gesture": "Clockwise",
+        "confidence": 0.97, "handedness": "Right", "hand_count": 1, "fps": 29.8,
+        "dropped_frames": 0, "timestamp": time.time(), "initialized": True,
+        "system_status": "active", "button_states": ["OFF", "ON", "OFF", "GET DATA"],
+        "serial_connected": True, "mode": "home_automation",
+    }
+
+
+def socketio_event(event, data, attachments=0):
+    # Socket.IO v5 text header: 2 = EVENT, 5 = BINARY_EVENT (+ attachment count)
+    header = f"5{attachments}-" if attachments else "2"
+    return header + json.dumps([event, data], separators=(',', ':'))
+
+
+def main():
+    args = get_args()
+    frames = video_frames(args) if args.video else synthetic_frames(args)
+    if not frames:
+        print("No frames could be read")
+        return 1
+
+    encode_param = [int(cv.IMWRITE_JPEG_QUALITY), args.quality]
+    jpegs = [cv.imencode('.jpg', frame, encode_param)[1] for frame in frames]
+
+    totals = {'base64': [0, 0.0, 0.0], 'binary': [0, 0.0, 0.0]}
+    for seq, jpeg in enumerate(jpegs):
+        # base64: encode on the server, decode on every client
+        started = time.perf_counter()
+        data = metadata(seq)
+        data['frame'] = base64.b64encode(jpeg.tobytes()).decode('utf-8')
+        text = socketio_event('gesture_update', data)
+        server = time.perf_counter() - started
+        started = time.perf_counter()
+        base64.b64decode(json.loads(text[1:])[1]['frame'])
+        client = time.perf_counter() - started
+        totals['base64'][0] += len(text)
+        totals['base64'][1] += server
+        totals['base64'][2] += client
+
+        # binary: raw bytes as an attachment, metadata as its own event
+        started = time.perf_counter()
+        frame_bytes = jpeg.tobytes()
+        frame_event = socketio_event('gesture_frame', {"seq": seq, "frame": {"_placeholder": True, "num": 0}}, 1)
+        update_event = socketio_event('gesture_update', metadata(seq))
+        server = time.perf_counter() - started
+        started = time.perf_counter()
+        json.loads(update_event[1:])
+        client = time.perf_counter() - started
+        totals['binary'][0] += len(frame_event) + len(frame_bytes) + len(update_event)
+        totals['binary'][1] += server
+        totals['binary'][2] += client
+
+    count = len(jpegs)
+    jpeg_kb = sum(len(jpeg) for jpeg in jpegs) / count / 1024
+    height, width = frames[0].shape[:2]
+    print(f"{count} frames at {width}x{height}, JPEG quality {args.quality}, avg JPEG {jpeg_kb:.1f} KiB")
+    print(f"{'transport':>10} {'KiB/frame':>10} {'MiB/s@30':>9} {'server ms':>10} {'client ms':>10}")
+    for name, (size, server, client) in totals.items():
+        kib = size / count / 1024
+        print(f"{name:>10} {kib:>10.1f} {kib * 30 / 1024:>9.2f} "
+              f"{server / count * 1000:>10.3f} {client / count * 1000:>10.3f}")
+
+    saved = 1 - totals['binary'][0] / totals['base64'][0]
+    print(f"binary saves {saved:.1%} of the bytes per frame")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Detection speed and landmark accuracy at several inference scales.
+
+Replays the same frames (from a video file or the camera) through MediaPipe
+Hands once per scale and compares every hand against the full-resolution
+run. Errors are in full-resolution pixels, which is what drawing and button
+hit-testing see.
+
+    python benchmarks/inference_scale.py --video hands.mp4
+    python benchmarks/inference_scale.py --device 0 --frames 200 --scales 1,0.5,0.25
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2 as cv
+import mediapipe as mp
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils import InferenceResizer  # noqa: E402
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--video", help='video file to replay (default: camera)', default=None)
+    parser.add_argument("--device", type=int, default=0)
+    parser.add_argument("--width", help='cap width', type=int, default=1280)
+    parser.add_argument("--height", help='cap height', type=int, default=720)
+    parser.add_argument("--frames", help='number of frames to use', type=int, default=300)
+    parser.add_argument("--scales", help='comma separated inference scales',
+                        default='1.0,0.75,0.5,0.35,0.25')
+    parser.add_argument("--min_detection_confidence", type=float, default=0.5)
+    parser.add_argument("--min_tracking_confidence", type=float, default=0.5)
+    return parser.parse_args()
+
+
+def read_frames(args):
+    cap = cv.VideoCapture(args.video if args.video else args.device)
+    if not args.video:
+        cap.set(cv.CAP_PROP_FRAME_WIDTH, args.width)
+        cap.set(cv.CAP_PROP_FRAME_HEIGHT, args.height)
+    frames = []
+    while len(frames) < args.frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv.flip(frame, 1))
+    cap.release()
+    return frames
+
+
+def run_scale(frames, scale, args):
+    """Return (fps, per-frame {handedness: (21, 2) pixel landmarks})."""
+    resizer = InferenceResizer(scale)
+    hands = mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=2,
+        min_detection_confidence=args.min_detection_confidence,
+        min_tracking_confidence=args.min_tracking_confidence,
+    )
+
+    detections = []
+    elapsed = 0.0
+    for frame in frames:
+        height, width = frame.shape[:2]
+        started = time.perf_counter()
+        results = hands.process(resizer(frame))
+        elapsed += time.perf_counter() - started
+
+        found = {}
+        if results.multi_hand_landmarks:
+            for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
+                points = np.array([(landmark.x, landmark.y) for landmark in hand_landmarks.landmark])
+                found[handedness.classification[0].label] = points * (width, height)
+        detections.append(found)
+
+    hands.close()
+    return len(frames) / elapsed if elapsed else 0.0, detections
+
+
+def compare(reference, detections):
+    errors = []
+    missed = 0
+    total = 0
+    for expected, found in zip(reference, detections):
+        for label, points in expected.items():
+            total += 1
+            if label not in found:
+                missed += 1
+                continue
+            errors.append(np.linalg.norm(found[label] - points, axis=1))
+    errors = np.concatenate(errors) if errors else np.zeros(0)
+    return total, missed, errors
+
+
+def main():
+    args = get_args()
+    frames = read_frames(args)
+    if not frames:
+        print("No frames could be read")
+        return 1
+
+    height, width = frames[0].shape[:2]
+    scales = sorted({float(scale) for scale in args.scales.split(',')} | {1.0}, reverse=True)
+    print(f"{len(frames)} frames at {width}x{height}")
+
+    reference = None
+    print(f"{'scale':>6} {'size':>10} {'fps':>7} {'hands':>6} {'missed':>7} "
+          f"{'mean px':>8} {'p95 px':>7} {'max px':>7}")
+    for scale in scales:
+        fps, detections = run_scale(frames, scale, args)
+        if reference is None:
+            reference = detections  # scale 1.0 always runs first
+
+        total, missed, errors = compare(reference, detections)
+        size = 'x'.join(str(v) for v in InferenceResizer(scale).size_for(frames[0]))
+        if len(errors):
+            mean, p95, worst = errors.mean(), np.percentile(errors, 95), errors.max()
+        else:
+            mean = p95 = worst = float('nan')
+        print(f"{scale:>6.2f} {size:>10} {fps:>7.1f} {total:>6} {missed:>7} "
+              f"{mean:>8.2f} {p95:>7.2f} {worst:>7.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Load test of NodeMCU device control through the serial stack.
+
+Drives the same SerialTransport / SerialWorker / DeviceCommandLayer stack
+as process_frames with random button changes at --rate per second and a
+Get Data request every --get_data_every changes, then reports commands
+written, coalesced and dropped, write latency and Get Data round trip
+percentiles. Runs against the in-process NodeMCU simulator unless --port
+is given:
+
+    python benchmarks/serial_link.py --rate 200 --latency_ms 20
+    python benchmarks/serial_link.py --coalesce_ms 0     # every change written
+    python benchmarks/serial_link.py --fail_every 2      # unplug every 2 s
+    python benchmarks/serial_link.py --port /dev/ttyUSB0
+
+With --fail_every the simulated board is unplugged periodically and the
+time until the link is back (exponential backoff from --min_backoff) is
+reported as well.
+
+Before the load test, DeviceCommandLayer is checked to count a change
+reverted within its window as one coalesced command, and to resend after
+a reconnect only the devices whose reported state differs from the
+desired one; the script exits non-zero if it does not.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.device_commands import DeviceCommandLayer  # noqa: E402
+from utils.serial_transport import NodeMCUSimulator, SerialTransport, open_serial_port  # noqa: E402
+from utils.serial_worker import SerialWorker  # noqa: E402
+
+DEVICE_COMMANDS = {
+    0: {"ON": b'2', "OFF": b'1'},
+    1: {"ON": b'3', "OFF": b'4'},
+    2: {"ON": b'5', "OFF": b'6'}
+}
+GET_DATA = 3
+STATUS_LINES = set(NodeMCUSimulator.STATUS_LINES.values())
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", help='real serial port instead of the simulator', default=None)
+    parser.add_argument("--seconds", help='test duration', type=float, default=10.0)
+    parser.add_argument("--rate", help='button changes per second', type=float, default=100.0)
+    parser.add_argument("--get_data_every", help='send Get Data every N changes (0 = never)', type=int, default=10)
+    parser.add_argument("--coalesce_ms", help='DeviceCommandLayer window', type=float, default=250.0)
+    parser.add_argument("--latency_ms", help='simulator reply latency', type=float, default=20.0)
+    parser.add_argument("--baudrate", help='simulated line speed (0 = unlimited)', type=int, default=9600)
+    parser.add_argument("--fail_every", help='unplug the simulator every N seconds (0 = never)',
+                        type=float, default=0.0)
+    parser.add_argument("--min_backoff", help='first reconnect delay in seconds', type=float, default=0.5)
+    return parser.parse_args()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def check_coalescing():
+    layer = DeviceCommandLayer(lambda command, device, state: True, DEVICE_COMMANDS, window=60.0)
+    layer.set(0, "ON")   # Sent at once
+    layer.set(0, "OFF")  # Waits for the window
+    layer.set(0, "ON")   # Reverts it: one user action, one coalesced command
+    stats = layer.stats()
+    ok = (stats['sent'], stats['coalesced'], stats['pending']) == (1, 1, 0)
+    print(f"coalescing: sent {stats['sent']}, coalesced {stats['coalesced']}, pending {stats['pending']} "
+          f"(expected 1, 1, 0) -> {'OK' if ok else 'FAIL'}")
+    return ok
+
+
+def check_reconcile():
+    sent = []
+    layer = DeviceCommandLayer(lambda command, device, state: sent.append(device) or True,
+                               DEVICE_COMMANDS, window=0.0)
+    for device in DEVICE_COMMANDS:
+        layer.set(device, "ON")
+    layer.report(0, "ON")   # Confirmed by a status line
+    layer.report(1, "OFF")  # Switched off while the link was down
+    sent.clear()
+
+    layer.forget()
+    layer.reconcile()
+    ok = sorted(sent) == [1, 2]
+    print(f"reconcile after reconnect: resent devices {sorted(sent)} (expected [1, 2]) "
+          f"-> {'OK' if ok else 'FAIL'}")
+    return ok
+
+
+def main():
+    args = get_args()
+    if not (check_coalescing() and check_reconcile()):
+        return 1
+    round_trips = []
+    failed = []
+    reconnect_times = []
+    failed_at = [None]
+    connected = threading.Event()
+
+    def open_port():
+        if args.port:
+            return open_serial_port(args.port)
+        return NodeMCUSimulator(latency=args.latency_ms / 1000.0, baudrate=args.baudrate)
+
+    def on_line(line, request):
+        if request is not None and request.tag == GET_DATA:
+            round_trips.append((time.monotonic() - request.written_at) * 1000.0)
+
+    def on_connect(port):
+        worker.attach(port)
+        if failed_at[0] is not None:
+            reconnect_times.append((time.monotonic() - failed_at[0]) * 1000.0)
+            failed_at[0] = None
+        layer.reconcile()
+        connected.set()
+
+    def on_disconnect(error):
+        connected.clear()
+        worker.detach()
+        layer.forget()
+
+    transport = SerialTransport(open_port, on_connect=on_connect, on_disconnect=on_disconnect,
+                                min_backoff=args.min_backoff)
+    worker = SerialWorker(on_lost=transport.connection_lost, on_line=on_line,
+                          on_error=lambda error, request: request is not None and failed.append(request)).start()
+    layer = DeviceCommandLayer(lambda command, device, state: worker.send(command, tag=device),
+                               DEVICE_COMMANDS, window=args.coalesce_ms / 1000.0).start()
+    transport.start()
+    if not connected.wait(10.0):
+        print("Could not connect:", transport.health()['last_error'])
+        return 1
+
+    changes = 0
+    get_data_sent = 0
+    started = time.monotonic()
+    next_failure = started + args.fail_every if args.fail_every > 0 and not args.port else None
+    while time.monotonic() - started < args.seconds:
+        now = time.monotonic()
+        if next_failure is not None and now >= next_failure:
+            port = transport.port
+            if port is not None:
+                failed_at[0] = now
+                port.fail()
+            next_failure = now + args.fail_every
+
+        layer.set(random.choice(list(DEVICE_COMMANDS)), random.choice(("ON", "OFF")))
+        changes += 1
+        if args.get_data_every and changes % args.get_data_every == 0:
+            # Status lines of earlier commands may still be on their way
+            get_data_sent += worker.send(b'7', tag=GET_DATA, expect_response=True,
+                                         match=lambda line: line not in STATUS_LINES)
+        time.sleep(max(0.0, started + changes / args.rate - time.monotonic()))
+
+    elapsed = time.monotonic() - started
+    time.sleep(args.coalesce_ms / 1000.0 + 0.5)  # Let pending commands and replies drain
+    layer.stop()
+    transport.stop()
+    worker.stop()
+
+    devices = layer.stats()
+    serial = worker.stats()
+    link = transport.health()
+    print(f"{changes} button changes in {elapsed:.1f}s ({changes / elapsed:.0f}/s), "
+          f"coalescing window {args.coalesce_ms:.0f} ms")
+    print(f"device commands: sent {devices['sent']}, coalesced {devices['coalesced']}, "
+          f"dropped {devices['dropped']}, reconciled {devices['reconciled']}")
+    print(f"serial writes: {serial['write']['count']} ({serial['write']['count'] / elapsed:.1f}/s), "
+          f"write latency avg {serial['write']['avg_ms']} ms max {serial['write']['max_ms']} ms")
+    lost = sum(request.tag == GET_DATA for request in failed) - serial['timeouts']
+    print(f"Get Data: sent {get_data_sent}, answered {len(round_trips)}, timed out {serial['timeouts']}, "
+          f"lost to unplugs {lost}; "
+          f"round trip p50 {percentile(round_trips, 0.5):.1f} ms p95 {percentile(round_trips, 0.95):.1f} ms "
+          f"p99 {percentile(round_trips, 0.99):.1f} ms")
+    print(f"link: {link['connects']} connects, {link['failures']} failed attempts, "
+          f"{link['disconnects']} disconnects")
+    if reconnect_times:
+        print(f"reconnect: avg {sum(reconnect_times) / len(reconnect_times):.0f} ms "
+              f"max {max(reconnect_times):.0f} ms over {len(reconnect_times)} unplugs")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Payload size and encode/decode speed of the binary wire schema vs JSON.
+
+Replays a recorded session, one JSON object per line: gesture_update
+messages and/or /gesture-data responses (they have a "gesture_name").
+Record one from a running server with
+
+    python benchmarks/wire_schema.py --record http://localhost:5001/gesture-data \
+        --seconds 30 --session session.jsonl
+
+and benchmark it (or a synthetic session, without --session) with
+
+    python benchmarks/wire_schema.py --session session.jsonl
+
+JSON is serialized the way Flask-SocketIO and jsonify do (json.dumps).
+Binary messages are decoded and checked against the JSON originals, with
+floats compared at float32 precision.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from mode_manager import ModeManager  # noqa: E402
+from utils.wire_schema import BUTTON_STATES, WireSchema  # noqa: E402
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--session", help='JSON lines file to replay (or to write with --record)', default=None)
+    parser.add_argument("--record", help='/gesture-data URL to poll into --session', default=None)
+    parser.add_argument("--seconds", help='how long to record', type=float, default=30.0)
+    parser.add_argument("--interval", help='min seconds between recorded responses', type=float, default=0.0)
+    parser.add_argument("--messages", help='synthetic session length', type=int, default=3000)
+    parser.add_argument("--repeat", help='timing passes over the session', type=int, default=5)
+    return parser.parse_args()
+
+
+def read_labels(path):
+    with open(path, encoding='utf-8-sig') as f:
+        return [row[0] for row in csv.reader(f) if row and row[0].strip()]
+
+
+def record(args):
+    # Long-polls with ?since= so every response is a new frame
+    deadline = time.time() + args.seconds
+    count = 0
+    seq = 0
+    separator = '&' if '?' in args.record else '?'
+    with open(args.session, 'w') as f:
+        while time.time() < deadline:
+            with urllib.request.urlopen(f"{args.record}{separator}since={seq}&timeout=1") as response:
+                data = json.load(response)
+            if data.get('seq', 0) > seq:
+                seq = data['seq']
+                f.write(json.dumps(data) + '\n')
+                count += 1
+            time.sleep(args.interval)
+    print(f"Recorded {count} responses to {args.session}")
+
+
+def synthetic_session(args, gestures, finger_gestures):
+    # A hand drifting around with occasional gesture changes, alternating
+    # between a gesture_update and a /gesture-data poll
+    messages = []
+    gesture = gestures[0]
+    history = []
+    start = time.time()
+    for seq in range(args.messages):
+        if random.random() < 0.02:
+            gesture = random.choice(gestures)
+            history = (history + [gesture])[-10:]
+        cx = 640 + 300 * math.sin(seq / 50.0)
+        cy = 360 + 200 * math.cos(seq / 70.0)
+        landmarks = [[int(cx + 60 * math.cos(i)), int(cy + 60 * math.sin(i))] for i in range(21)]
+        common = {
+            "finger_gesture": random.choice([None] + finger_gestures),
+            "confidence": random.random(), "handedness": "Right", "hand_count": 1,
+            "fps": 25 + random.random() * 5, "timestamp": start + seq / 30.0, "system_status": "active",
+            "mode": ModeManager.HOME_AUTOMATION,
+        }
+        if seq % 2:
+            messages.append(dict(common, **{
+                "seq": seq, "gesture_id": 0, "gesture_name": gesture, "landmarks": landmarks,
+                "bounding_box": [int(cx) - 80, int(cy) - 80, int(cx) + 80, int(cy) + 80],
+                "gesture_history": history,
+            }))
+        else:
+            messages.append(dict(common, **{
+                "seq": seq, "measured": seq % 3 == 0, "gesture": gesture, "dropped_frames": seq // 100,
+                "initialized": True, "button_states": [random.choice(BUTTON_STATES[:2]) for _ in range(3)]
+                + ["GET DATA"], "serial_connected": True,
+                "jpeg_quality": 80, "stream_scale": 1.0, "stream_kbps": 9000.0,
+            }))
+    return messages
+
+
+def same(original, decoded):
+    if isinstance(original, float):
+        return math.isclose(original, decoded, rel_tol=1e-6, abs_tol=1e-3)
+    if isinstance(original, (list, tuple)):
+        return len(original) == len(decoded) and all(same(a, b) for a, b in zip(original, decoded))
+    if isinstance(original, dict):
+        return all(same(value, decoded.get(key if key in decoded else int(key)))
+                   for key, value in original.items())
+    return original == decoded
+
+
+def main():
+    args = get_args()
+    if args.record:
+        if not args.session:
+            print("--record needs --session")
+            return 1
+        record(args)
+        return 0
+
+    gestures = read_labels('model/keypoint_classifier/keypoint_classifier_label.csv')
+    finger_gestures = read_labels('model/point_history_classifier/point_history_classifier_label.csv')
+    if args.session:
+        with open(args.session) as f:
+            messages = [json.loads(line) for line in f if line.strip()]
+    else:
+        messages = synthetic_session(args, gestures, finger_gestures)
+    schema = WireSchema(gestures, finger_gestures, [ModeManager.GENERAL_RECOGNITION, ModeManager.HOME_AUTOMATION],
+                        epoch=min((m.get('timestamp', time.time()) for m in messages), default=None))
+
+    kinds = {
+        'gesture_update': ([m for m in messages if 'gesture_name' not in m], schema.encode_update,
+                           schema.decode_update),
+        'gesture-data': ([m for m in messages if 'gesture_name' in m], schema.encode_gesture_data,
+                         schema.decode_gesture_data),
+    }
+    print(f"{len(messages)} messages, {args.repeat} passes")
+    print(f"{'message':>15} {'format':>7} {'bytes':>7} {'encode us':>10} {'decode us':>10}")
+    for name, (batch, encode, decode) in kinds.items():
+        if not batch:
+            continue
+        mismatches = sum(not same({k: v for k, v in m.items() if k != 'frame'}, decode(encode(m))) for m in batch)
+
+        for label, dumps, loads in (('json', json.dumps, json.loads), ('binary', encode, decode)):
+            payloads = [dumps(m) for m in batch]
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                payloads = [dumps(m) for m in batch]
+            encode_us = (time.perf_counter() - started) / (args.repeat * len(batch)) * 1e6
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                for payload in payloads:
+                    loads(payload)
+            decode_us = (time.perf_counter() - started) / (args.repeat * len(batch)) * 1e6
+            size = sum(len(payload) for payload in payloads) / len(batch)
+            print(f"{name:>15} {label:>7} {size:>7.1f} {encode_us:>10.2f} {decode_us:>10.2f}")
+        if mismatches:
+            print(f"{name}: {mismatches} of {len(batch)} messages did not round-trip "
+                  f"(values missing from the enum tables decode as None)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
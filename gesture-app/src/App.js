@@ -518,8 +518,178 @@ const SettingsModal = ({ isOpen, onClose, settings, updateSettings }) => {
 
 
 
+// Show a camera frame in an <img>. Frames arrive either as a base64 string
+// (gesture_update.frame) or, with the server's --transport binary, as raw
+// JPEG bytes (gesture_frame.frame) that are shown through a Blob URL.
+const showFrame = (img, frame) => {
+  if (!img || !frame) return
+  if (typeof frame === "string") {
+    img.src = `data:image/jpeg;base64,${frame}`
+    return
+  }
+  const previousUrl = img.dataset.blobUrl
+  const url = URL.createObjectURL(new Blob([frame], { type: "image/jpeg" }))
+  img.dataset.blobUrl = url
+  img.src = url
+  // The previous frame is no longer referenced, let the browser free it
+  if (previousUrl) URL.revokeObjectURL(previousUrl)
+}
+
+// Binary gesture_update (utils/wire_schema.py, version 1). After we send
+// negotiate_wire the server answers with wire_schema (enum tables, epoch) and
+// from then on gesture_update arrives as an ArrayBuffer in this layout.
+const WIRE_SCHEMA_VERSION = 1
+const WIRE_FLAGS = { measured: 0x01, initialized: 0x02, active: 0x04, serial: 0x08, stream: 0x10, pressed: 0x20 }
+
+const decodeGestureUpdate = (buffer, schema) => {
+  const view = new DataView(buffer)
+  if (view.getUint8(0) !== WIRE_SCHEMA_VERSION || view.getUint8(1) !== 1) return null
+  const flags = view.getUint16(2, true)
+  const enums = schema.enums
+  const lookup = (table, id) => (id < enums[table].length ? enums[table][id] : null)
+  const buttonCount = view.getUint8(29)
+  const update = {
+    seq: view.getUint32(4, true),
+    measured: (flags & WIRE_FLAGS.measured) !== 0,
+    timestamp: schema.epoch + view.getFloat32(8, true),
+    confidence: view.getFloat32(12, true),
+    fps: view.getFloat32(16, true),
+    dropped_frames: view.getUint32(20, true),
+    gesture: lookup("gesture", view.getUint8(24)),
+    finger_gesture: lookup("finger_gesture", view.getUint8(25)),
+    handedness: lookup("handedness", view.getUint8(26)),
+    hand_count: view.getUint8(27),
+    mode: lookup("mode", view.getUint8(28)),
+    button_states: Array.from({ length: buttonCount }, (_, i) => lookup("button_state", view.getUint8(30 + i))),
+    initialized: (flags & WIRE_FLAGS.initialized) !== 0,
+    system_status: flags & WIRE_FLAGS.active ? "active" : "inactive",
+    serial_connected: (flags & WIRE_FLAGS.serial) !== 0,
+  }
+  let offset = 30 + buttonCount
+  if (flags & WIRE_FLAGS.stream) {
+    update.jpeg_quality = view.getUint8(offset)
+    update.stream_scale = view.getUint8(offset + 1) / 100
+    update.stream_kbps = view.getFloat32(offset + 2, true)
+    offset += 6
+  }
+  if (flags & WIRE_FLAGS.pressed) {
+    const count = view.getUint8(offset)
+    update.pressed_buttons = {}
+    for (let i = 0; i < count; i++) {
+      update.pressed_buttons[view.getUint8(offset + 1 + 2 * i)] = lookup("button_state", view.getUint8(offset + 2 + 2 * i))
+    }
+  }
+  return update
+}
+
+// Landmark-only streaming (server --stream_mode landmarks). Packets follow the
+// layout documented in utils/landmark_stream.py: a 16 byte header, then per
+// hand 12 bytes of handedness/sign/confidence/bounding box and 21 (x, y)
+// landmark pixels, int16 or int8 deltas against packet base_seq.
+const LANDMARK_FLAG_DELTA = 0x01
+const HAND_CONNECTIONS = [
+  [0, 1], [1, 2], [2, 3], [3, 4], [0, 5], [5, 6], [6, 7], [7, 8],
+  [5, 9], [9, 10], [10, 11], [11, 12], [9, 13], [13, 14], [14, 15], [15, 16],
+  [13, 17], [0, 17], [17, 18], [18, 19], [19, 20],
+]
+
+const decodeLandmarkPacket = (buffer, previous) => {
+  const view = new DataView(buffer)
+  const flags = view.getUint8(1)
+  const handCount = view.getUint8(2)
+  const seq = view.getUint32(4, true)
+  const baseSeq = view.getUint32(8, true)
+  const delta = (flags & LANDMARK_FLAG_DELTA) !== 0
+  // A delta we cannot apply: wait for the next full packet
+  if (delta && (!previous || previous.seq !== baseSeq || previous.hands.length !== handCount)) return null
+
+  const hands = []
+  let offset = 16
+  for (let h = 0; h < handCount; h++) {
+    const hand = {
+      handedness: ["Left", "Right"][view.getUint8(offset)] || "Unknown",
+      signId: view.getInt8(offset + 1),
+      confidence: view.getUint8(offset + 2) / 255,
+      brect: [0, 1, 2, 3].map((i) => view.getInt16(offset + 4 + 2 * i, true)),
+      landmarks: new Int32Array(42),
+    }
+    offset += 12
+    for (let i = 0; i < 42; i++) {
+      if (delta) {
+        hand.landmarks[i] = previous.hands[h].landmarks[i] + view.getInt8(offset + i)
+      } else {
+        hand.landmarks[i] = view.getInt16(offset + 2 * i, true)
+      }
+    }
+    offset += delta ? 42 : 84
+    hands.push(hand)
+  }
+  return { seq, width: view.getUint16(12, true), height: view.getUint16(14, true), hands }
+}
+
+// Draw what the server would have drawn into the frame: buttons, bounding
+// boxes, skeletons and labels
+const drawLandmarkOverlay = (canvas, config, packet, update) => {
+  if (!canvas || !packet) return
+  if (canvas.width !== packet.width || canvas.height !== packet.height) {
+    canvas.width = packet.width
+    canvas.height = packet.height
+  }
+  const ctx = canvas.getContext("2d")
+  ctx.clearRect(0, 0, canvas.width, canvas.height)
+  ctx.textAlign = "center"
+  ctx.textBaseline = "middle"
+
+  const buttonStates = (update && update.button_states) || []
+  const pressed = (update && update.pressed_buttons) || {}
+  ;((config && config.buttons) || []).forEach((button, i) => {
+    const isPressed = pressed[i] !== undefined
+    ctx.fillStyle = isPressed ? "rgb(0, 255, 0)" : "rgb(255, 0, 0)"
+    ctx.fillRect(button.x, button.y, button.width, button.height)
+    ctx.fillStyle = "white"
+    ctx.font = "bold 22px sans-serif"
+    ctx.fillText(isPressed ? pressed[i] : buttonStates[i] || "", button.x + button.width / 2, button.y + button.height / 2)
+  })
+
+  packet.hands.forEach((hand) => {
+    const p = hand.landmarks
+    const [x1, y1, x2, y2] = hand.brect
+    ctx.strokeStyle = "black"
+    ctx.lineWidth = 1
+    ctx.strokeRect(x1, y1, x2 - x1, y2 - y1)
+
+    ctx.strokeStyle = "white"
+    ctx.lineWidth = 3
+    ctx.beginPath()
+    HAND_CONNECTIONS.forEach(([a, b]) => {
+      ctx.moveTo(p[2 * a], p[2 * a + 1])
+      ctx.lineTo(p[2 * b], p[2 * b + 1])
+    })
+    ctx.stroke()
+    ctx.fillStyle = "rgb(0, 255, 0)"
+    for (let i = 0; i < 21; i++) {
+      ctx.beginPath()
+      ctx.arc(p[2 * i], p[2 * i + 1], i === 8 ? 10 : 4, 0, 2 * Math.PI)
+      ctx.fill()
+    }
+
+    const labels = (config && config.labels) || []
+    const label = hand.signId >= 0 && hand.signId < labels.length ? labels[hand.signId] : "Unknown"
+    ctx.textAlign = "left"
+    ctx.font = "16px sans-serif"
+    ctx.fillText(`${label} (${hand.confidence.toFixed(2)})`, x1, y1 - 10)
+    ctx.textAlign = "center"
+  })
+}
+
 const CameraFeed = ({ isStreaming, error, imgRef }) => {
   const socketRef = useRef(socket);
+  // Landmark streaming state lives in refs: it changes every frame and is
+  // only ever drawn to the canvas, never rendered by React
+  const canvasRef = useRef(null);
+  const streamConfigRef = useRef(null);
+  const lastPacketRef = useRef(null);
+  const lastUpdateRef = useRef(null);
   // Local state for button states with memoized setter to prevent unnecessary re-renders
   // We only need the setter function for the socket events
   const [, setButtonStates] = useState({
@@ -544,6 +714,7 @@ const CameraFeed = ({ isStreaming, error, imgRef }) => {
 
     // Handle full gesture updates that include button states
     const handleGestureUpdate = (data) => {
+      lastUpdateRef.current = data;
       if (data.button_states && Array.isArray(data.button_states)) {
         // Convert array ["OFF", "OFF", "OFF"] to object {button1: false, button2: false, button3: false}
         setButtonStates({
@@ -553,19 +724,54 @@ const CameraFeed = ({ isStreaming, error, imgRef }) => {
         });
       }
 
-      // Update the camera feed image
-      if (data.frame && imgRef.current) {
-        imgRef.current.src = `data:image/jpeg;base64,${data.frame}`;
+      // Update the camera feed image and tell the server it arrived (the
+      // server adapts JPEG quality and size to this lag)
+      if (data.frame) {
+        showFrame(imgRef.current, data.frame);
+        currentSocket.emit("frame_ack", { seq: data.seq });
       }
     };
 
+    // Binary transport: JPEG bytes arrive separately from the metadata
+    const handleGestureFrame = (data) => {
+      showFrame(imgRef.current, data.frame);
+      currentSocket.emit("frame_ack", { seq: data.seq });
+    };
+
+    const handleStreamConfig = (config) => {
+      streamConfigRef.current = config;
+      if (config.stream_mode !== "landmarks" && canvasRef.current) {
+        canvasRef.current.getContext("2d").clearRect(0, 0, canvasRef.current.width, canvasRef.current.height);
+      }
+    };
+
+    // Landmark mode: background JPEG every so often, skeleton every frame
+    const handleGestureKeyframe = (data) => {
+      showFrame(imgRef.current, data.frame);
+    };
+
+    const handleLandmarkPacket = (buffer) => {
+      const packet = decodeLandmarkPacket(buffer, lastPacketRef.current);
+      if (!packet) return;
+      lastPacketRef.current = packet;
+      drawLandmarkOverlay(canvasRef.current, streamConfigRef.current, packet, lastUpdateRef.current);
+    };
+
     currentSocket.on("button_update", handleButtonUpdate);
     currentSocket.on("gesture_update", handleGestureUpdate);
+    currentSocket.on("gesture_frame", handleGestureFrame);
+    currentSocket.on("stream_config", handleStreamConfig);
+    currentSocket.on("gesture_keyframe", handleGestureKeyframe);
+    currentSocket.on("landmark_packet", handleLandmarkPacket);
 
     return () => {
       // Use the stored reference in cleanup to avoid the exhaustive-deps warning
       currentSocket.off("button_update", handleButtonUpdate);
       currentSocket.off("gesture_update", handleGestureUpdate);
+      currentSocket.off("gesture_frame", handleGestureFrame);
+      currentSocket.off("stream_config", handleStreamConfig);
+      currentSocket.off("gesture_keyframe", handleGestureKeyframe);
+      currentSocket.off("landmark_packet", handleLandmarkPacket);
     };
   }, [imgRef]); // socketRef is intentionally omitted as we're using a local reference
 
@@ -599,6 +805,20 @@ const CameraFeed = ({ isStreaming, error, imgRef }) => {
         }}
       />
 
+      {/* Client-side rendering of landmark packets (landmarks stream mode) */}
+      <canvas
+        ref={canvasRef}
+        style={{
+          position: "absolute",
+          top: 0,
+          left: 0,
+          width: "100%",
+          height: "100%",
+          pointerEvents: "none",
+          opacity: isStreaming ? 1 : 0,
+        }}
+      />
+
       {/* Overlay when not streaming */}
       <Flex
         position="absolute"
@@ -923,6 +1143,10 @@ const App = () => {
       await axios.post(`${FLASK_SERVER}/stop_detection`)
       if (imgRef.current) {
         imgRef.current.src = ""
+        if (imgRef.current.dataset.blobUrl) {
+          URL.revokeObjectURL(imgRef.current.dataset.blobUrl)
+          delete imgRef.current.dataset.blobUrl
+        }
       }
     } catch (err) {
       // console.error('Error stopping detection:', err);
@@ -936,11 +1160,20 @@ const App = () => {
   useEffect(() => {
     // Initialize socket connection
     socketRef.current = io(FLASK_SERVER)
+    // Enum tables for binary gesture_update, null until the server sends them
+    let wireSchema = null
 
     // Socket event listeners
     socketRef.current.on("connect", () => {
       console.log("Connected to WebSocket server")
       setError(null)
+      // Ask for the compact binary gesture_update; the server keeps sending
+      // JSON if it does not support this version
+      socketRef.current.emit("negotiate_wire", { versions: [WIRE_SCHEMA_VERSION] })
+    })
+
+    socketRef.current.on("wire_schema", (schema) => {
+      wireSchema = schema
     })
 
     socketRef.current.on("connect_error", (err) => {
@@ -949,10 +1182,14 @@ const App = () => {
       setIsStreaming(false)
     })
 
-    socketRef.current.on("gesture_update", (data) => {
-      // Update the image if frame data is available
-      if (data.frame && imgRef.current) {
-        imgRef.current.src = `data:image/jpeg;base64,${data.frame}`
+    socketRef.current.on("gesture_update", (message) => {
+      const data = message instanceof ArrayBuffer ? wireSchema && decodeGestureUpdate(message, wireSchema) : message
+      if (!data) return
+
+      // Update the image if frame data is available (base64 transport)
+      if (data.frame) {
+        showFrame(imgRef.current, data.frame)
+        socketRef.current.emit("frame_ack", { seq: data.seq })
       }
 
       // Update gesture data
@@ -977,6 +1214,12 @@ const App = () => {
       }
     })
 
+    // Binary transport: the JPEG comes as its own event
+    socketRef.current.on("gesture_frame", (data) => {
+      showFrame(imgRef.current, data.frame)
+      socketRef.current.emit("frame_ack", { seq: data.seq })
+    })
+
     // socketRef.current.on('camera_error', (data) => {
     //   console.error('Camera error:', data.message);
     //   setError(data.message);
@@ -1014,6 +1257,8 @@ const App = () => {
         socketRef.current.off("connect_error")
         // socketRef.current.off('camera_error');
         socketRef.current.off("gesture_update")
+        socketRef.current.off("gesture_frame")
+        socketRef.current.off("wire_schema")
         socketRef.current.off("button_update")
         socketRef.current.off("system_status")
         socketRef.current.off("mode_change")
@@ -1,2 +1,3 @@
 from model.keypoint_classifier.keypoint_classifier import KeyPointClassifier
-from model.point_history_classifier.point_history_classifier import PointHistoryClassifier
\ No newline at end of file
+from model.point_history_classifier.point_history_classifier import PointHistoryClassifier
+from model.numpy_mlp import NumpyMLP
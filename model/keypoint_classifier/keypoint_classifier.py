@@ -1,7 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import functools
+
 import numpy as np
-import tensorflow as tf
+
+from model.numpy_mlp import NumpyMLP
 
 
 class KeyPointClassifier(object):
@@ -9,28 +12,119 @@ class KeyPointClassifier(object):
         self,
         model_path='model/keypoint_classifier/keypoint_classifier.tflite',
         num_threads=1,
+        backend='tflite',
     ):
-        self.interpreter = tf.lite.Interpreter(model_path=model_path,
-                                               num_threads=num_threads)
+        """
+        Args:
+            model_path: .tflite model, or .keras/.hdf5 weights for the
+                numpy backend
+            num_threads: TFLite interpreter threads
+            backend: 'tflite' runs tf.lite.Interpreter with the builtin
+                kernels, 'numpy' runs the same network with NumpyMLP and
+                never imports TensorFlow
+        """
+        if backend not in ('tflite', 'numpy'):
+            raise ValueError(f"Unknown classifier backend: {backend}")
+
+        self.model_path = model_path
+        self.num_threads = num_threads
+        self.backend = backend
+
+        if backend == 'numpy':
+            self.mlp = NumpyMLP.load(model_path)
+            return
+
+        import tensorflow as tf
+
+        # Builtin kernels only, which the numpy backend reproduces; the
+        # default XNNPACK delegate rounds int8 hybrid layers differently
+        self._interpreter_class = functools.partial(
+            tf.lite.Interpreter,
+            experimental_op_resolver_type=tf.lite.experimental.OpResolverType.BUILTIN_WITHOUT_DEFAULT_DELEGATES)
+        self.interpreter = self._interpreter_class(model_path=model_path,
+                                                   num_threads=num_threads)
 
         self.interpreter.allocate_tensors()
         self.input_details = self.interpreter.get_input_details()
         self.output_details = self.interpreter.get_output_details()
 
+        # Interpreters with the input tensor resized to a given batch size
+        self._batch_interpreters = {1: self.interpreter}
+
     def __call__(
         self,
         landmark_list,
+        top_k=None,
     ):
-        input_details_tensor_index = self.input_details[0]['index']
-        self.interpreter.set_tensor(
-            input_details_tensor_index,
-            np.array([landmark_list], dtype=np.float32))
-        self.interpreter.invoke()
+        """Classify one pre-processed landmark vector.
 
-        output_details_tensor_index = self.output_details[0]['index']
+        Returns the most likely class id or, when ``top_k`` is given, a tuple
+        of the ``top_k`` most likely class ids and their softmax
+        probabilities, best first. Both come from the same invoke.
+        """
+        result = self._invoke(np.array([landmark_list], dtype=np.float32))
 
-        result = self.interpreter.get_tensor(output_details_tensor_index)
+        if top_k is not None:
+            return self.top_k(np.squeeze(result), top_k)
 
         result_index = np.argmax(np.squeeze(result))
 
         return result_index
+
+    @staticmethod
+    def top_k(scores, k):
+        """Return the ``k`` best class ids of a score vector and their scores."""
+        class_ids = np.argsort(scores)[::-1][:k]
+        return class_ids, scores[class_ids]
+
+    def classify_batch(
+        self,
+        landmark_batch,
+    ):
+        """Classify N pre-processed landmark vectors with a single invoke.
+
+        Args:
+            landmark_batch: array-like of shape (N, 42)
+
+        Returns:
+            tuple: (class ids of shape (N,), scores of shape (N, num_classes))
+        """
+        landmark_batch = np.asarray(landmark_batch, dtype=np.float32)
+        if landmark_batch.ndim == 1:
+            landmark_batch = landmark_batch.reshape(1, -1)
+
+        if landmark_batch.shape[0] == 0:
+            return (np.empty((0,), dtype=np.int64),
+                    np.empty((0, self.num_classes), dtype=np.float32))
+
+        scores = self._invoke(landmark_batch)
+
+        return np.argmax(scores, axis=1), scores
+
+    @property
+    def num_classes(self):
+        if self.backend == 'numpy':
+            return self.mlp.output_size
+        return self.output_details[0]['shape'][-1]
+
+    def _invoke(self, batch):
+        if self.backend == 'numpy':
+            return self.mlp.predict(batch)
+
+        interpreter = self._get_batch_interpreter(batch.shape[0])
+        interpreter.set_tensor(self.input_details[0]['index'], batch)
+        interpreter.invoke()
+
+        return interpreter.get_tensor(self.output_details[0]['index'])
+
+    def _get_batch_interpreter(self, batch_size):
+        interpreter = self._batch_interpreters.get(batch_size)
+        if interpreter is None:
+            interpreter = self._interpreter_class(model_path=self.model_path,
+                                                  num_threads=self.num_threads)
+            interpreter.resize_tensor_input(
+                self.input_details[0]['index'],
+                [batch_size, self.input_details[0]['shape'][1]])
+            interpreter.allocate_tensors()
+            self._batch_interpreters[batch_size] = interpreter
+        return interpreter
@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import io
+import json
+import os
+import struct
+import zipfile
+
+import numpy as np
+
+
+class DenseLayer(object):
+    """One fully connected layer, ``activation(x @ kernel + bias)``.
+
+    ``kernel`` is (in, out). When the layer comes from a dynamic-range
+    quantized TFLite model, ``kernel`` holds the int8 weights (as float64,
+    for exact integer accumulation) and ``kernel_scale`` the per-output
+    channel scales, and the inputs are quantized on the fly exactly like
+    TFLite's hybrid FULLY_CONNECTED kernel does.
+    """
+
+    def __init__(self, kernel, bias, activation='linear', kernel_scale=None,
+                 asymmetric_inputs=False):
+        self.kernel = kernel
+        self.bias = bias.astype(np.float32)
+        self.activation = activation
+        self.kernel_scale = kernel_scale
+        self.asymmetric_inputs = asymmetric_inputs
+
+    def __call__(self, x):
+        if self.kernel_scale is None:
+            z = x @ self.kernel + self.bias
+        else:
+            quantized, scale, zero_point = _quantize_inputs(x, self.asymmetric_inputs)
+            accumulator = (quantized - zero_point) @ self.kernel
+            z = (accumulator * scale * self.kernel_scale).astype(np.float32) + self.bias
+        return _ACTIVATIONS[self.activation](z.astype(np.float32))
+
+
+class NumpyMLP(object):
+    """TensorFlow-free forward pass for the small dense classifiers.
+
+    Weights are read once from a ``.tflite``, ``.keras`` or legacy
+    ``.hdf5`` file into NumPy arrays; ``predict`` runs a whole (N, features)
+    batch as a handful of matmuls.
+    """
+
+    def __init__(self, layers):
+        self.layers = layers
+        self.input_size = layers[0].kernel.shape[0]
+        self.output_size = layers[-1].kernel.shape[1]
+
+    @classmethod
+    def load(cls, model_path):
+        extension = os.path.splitext(model_path)[1].lower()
+        if extension == '.tflite':
+            return cls.from_tflite(model_path)
+        if extension == '.keras':
+            return cls.from_keras(model_path)
+        if extension in ('.hdf5', '.h5'):
+            return cls.from_hdf5(model_path)
+        raise ValueError(f"Unsupported model file: {model_path}")
+
+    @classmethod
+    def from_tflite(cls, model_path):
+        with open(model_path, 'rb') as f:
+            return cls(_read_tflite_layers(f.read()))
+
+    @classmethod
+    def from_keras(cls, model_path):
+        import h5py
+
+        with zipfile.ZipFile(model_path) as archive:
+            config = json.loads(archive.read('config.json'))
+            weights = h5py.File(io.BytesIO(archive.read('model.weights.h5')), 'r')
+
+        dense_configs = [layer['config'] for layer in config['config']['layers']
+                         if layer['class_name'] == 'Dense']
+        # Keras 3 stores weights per layer type in creation order:
+        # dense, dense_1, dense_2, ...
+        groups = sorted((name for name in weights['layers'] if name.startswith('dense')),
+                        key=lambda name: int(name.rpartition('_')[2]) if '_' in name else 0)
+
+        layers = []
+        for layer_config, group in zip(dense_configs, groups):
+            variables = weights['layers'][group]['vars']
+            layers.append(DenseLayer(np.array(variables['0'], dtype=np.float32),
+                                     np.array(variables['1'], dtype=np.float32),
+                                     layer_config.get('activation', 'linear')))
+        weights.close()
+        return cls(layers)
+
+    @classmethod
+    def from_hdf5(cls, model_path):
+        import h5py
+
+        layers = []
+        with h5py.File(model_path, 'r') as f:
+            config = json.loads(f.attrs['model_config'])
+            for layer in config['config']['layers']:
+                if layer['class_name'] != 'Dense':
+                    continue
+                name = layer['config']['name']
+                group = f['model_weights'][name][name]
+                layers.append(DenseLayer(np.array(group['kernel:0'], dtype=np.float32),
+                                         np.array(group['bias:0'], dtype=np.float32),
+                                         layer['config'].get('activation', 'linear')))
+        return cls(layers)
+
+    def predict(self, x):
+        """Return the (N, num_classes) output scores for an (N, features) batch."""
+        x = np.asarray(x, dtype=np.float32)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        for layer in self.layers:
+            x = layer(x)
+        return x
+
+
+def _relu(z):
+    return np.maximum(z, 0, out=z)
+
+
+def _softmax(z):
+    z = z - z.max(axis=-1, keepdims=True)
+    np.exp(z, out=z)
+    z /= z.sum(axis=-1, keepdims=True)
+    return z
+
+
+_ACTIVATIONS = {
+    'linear': lambda z: z,
+    'relu': _relu,
+    'relu6': lambda z: np.clip(z, 0, 6, out=z),
+    'tanh': np.tanh,
+    'sigmoid': lambda z: 1.0 / (1.0 + np.exp(-z)),
+    'softmax': _softmax,
+}
+
+
+def _round_half_away(values):
+    # TfLiteRound rounds halves away from zero; np.round rounds to even
+    return np.sign(values) * np.floor(np.abs(values) + 0.5)
+
+
+def _quantize_inputs(x, asymmetric):
+    """Per-row int8 quantization matching TFLite's hybrid kernels.
+
+    Returns (quantized rows, per-row scale, per-row zero point), each shaped
+    for broadcasting against an (N, out) accumulator.
+    """
+    x = x.astype(np.float64)
+    if asymmetric:
+        rmin = np.minimum(x.min(axis=1), 0.0)
+        rmax = np.maximum(x.max(axis=1), 0.0)
+        flat = rmin == rmax
+        scale = np.where(flat, 1.0, (rmax - rmin) / 255.0)
+        zero_point_from_min = -128.0 - rmin / scale
+        zero_point_from_max = 127.0 - rmax / scale
+        use_min = (128.0 + np.abs(rmin / scale)) < (127.0 + np.abs(rmax / scale))
+        zero_point = np.where(use_min, zero_point_from_min, zero_point_from_max)
+        zero_point = np.clip(_round_half_away(zero_point), -128, 127)
+        zero_point[flat] = 0.0
+    else:
+        rmax = np.abs(x).max(axis=1)
+        flat = rmax == 0
+        scale = np.where(flat, 1.0, rmax / 127.0)
+        zero_point = np.zeros_like(scale)
+
+    # TFLite keeps the scaling factor as a float32
+    scale = scale.astype(np.float32).astype(np.float64)
+    inverse_scale = (1.0 / scale.astype(np.float32)).astype(np.float64)
+    quantized = np.clip(_round_half_away(zero_point[:, None] + x * inverse_scale[:, None]), -128, 127)
+    quantized[flat] = 0.0
+    return quantized, scale[:, None], zero_point[:, None]
+
+
+# --- Minimal TFLite flatbuffer reader --------------------------------------
+#
+# Only what is needed to pull FULLY_CONNECTED weights, biases, quantization
+# scales and fused activations out of the converted models.
+
+_TFLITE_FULLY_CONNECTED = 9
+_TFLITE_SOFTMAX = 25
+_TFLITE_FLOAT32 = 0
+_TFLITE_INT8 = 9
+_TFLITE_FUSED_ACTIVATIONS = {0: 'linear', 1: 'relu', 3: 'relu6', 4: 'tanh'}
+
+
+class _Table(object):
+    def __init__(self, buf, pos):
+        self.buf = buf
+        self.pos = pos
+        self.vtable = pos - struct.unpack_from('<i', buf, pos)[0]
+        self.vtable_size = struct.unpack_from('<H', buf, self.vtable)[0]
+
+    def _field(self, index):
+        offset = 4 + 2 * index
+        if offset >= self.vtable_size:
+            return 0
+        return struct.unpack_from('<H', self.buf, self.vtable + offset)[0]
+
+    def scalar(self, index, fmt, default=0):
+        offset = self._field(index)
+        if not offset:
+            return default
+        return struct.unpack_from('<' + fmt, self.buf, self.pos + offset)[0]
+
+    def _indirect(self, index):
+        offset = self._field(index)
+        if not offset:
+            return None
+        pos = self.pos + offset
+        return pos + struct.unpack_from('<I', self.buf, pos)[0]
+
+    def table(self, index):
+        pos = self._indirect(index)
+        return None if pos is None else _Table(self.buf, pos)
+
+    def vector(self, index, dtype):
+        pos = self._indirect(index)
+        if pos is None:
+            return None
+        length = struct.unpack_from('<I', self.buf, pos)[0]
+        return np.frombuffer(self.buf, dtype, length, pos + 4)
+
+    def tables(self, index):
+        pos = self._indirect(index)
+        if pos is None:
+            return []
+        length = struct.unpack_from('<I', self.buf, pos)[0]
+        items = []
+        for i in range(length):
+            item_pos = pos + 4 + 4 * i
+            items.append(_Table(self.buf, item_pos + struct.unpack_from('<I', self.buf, item_pos)[0]))
+        return items
+
+
+def _read_tflite_layers(buf):
+    model = _Table(buf, struct.unpack_from('<I', buf, 0)[0])
+    # Newer files keep the opcode in builtin_code, older ones in the
+    # deprecated byte field
+    opcodes = [max(code.scalar(0, 'b'), code.scalar(3, 'i')) for code in model.tables(1)]
+    subgraph = model.tables(2)[0]
+    buffers = model.tables(4)
+    tensors = subgraph.tables(0)
+
+    def constant(tensor_index):
+        tensor = tensors[tensor_index]
+        tensor_type = tensor.scalar(1, 'b')
+        dtype = {_TFLITE_FLOAT32: np.float32, _TFLITE_INT8: np.int8}.get(tensor_type)
+        if dtype is None:
+            raise ValueError(f"Unsupported TFLite tensor type: {tensor_type}")
+        data = buffers[tensor.scalar(2, 'I')].vector(0, np.uint8)
+        values = np.frombuffer(data.tobytes(), dtype).reshape(tensor.vector(0, '<i4'))
+        quantization = tensor.table(4)
+        scale = quantization.vector(2, '<f4') if quantization is not None else None
+        return values, scale
+
+    layers = []
+    for operator in subgraph.tables(3):
+        opcode = opcodes[operator.scalar(0, 'I')]
+        if opcode == _TFLITE_SOFTMAX:
+            layers[-1].activation = 'softmax'
+            continue
+        if opcode != _TFLITE_FULLY_CONNECTED:
+            raise ValueError(f"Unsupported TFLite operator: {opcode}")
+
+        inputs = operator.vector(1, '<i4')
+        weights, weight_scale = constant(inputs[1])
+        bias, _ = constant(inputs[2])
+        options = operator.table(4)
+        activation = _TFLITE_FUSED_ACTIVATIONS[options.scalar(0, 'b') if options else 0]
+
+        # TFLite stores FC weights as (out, in)
+        if weights.dtype == np.int8:
+            layers.append(DenseLayer(weights.T.astype(np.float64), bias, activation,
+                                     kernel_scale=weight_scale.astype(np.float64),
+                                     asymmetric_inputs=bool(options.scalar(3, 'b')) if options else False))
+        else:
+            layers.append(DenseLayer(np.ascontiguousarray(weights.T), bias, activation))
+    return layers
@@ -1,7 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import functools
+
 import numpy as np
-import tensorflow as tf
+
+from model.numpy_mlp import NumpyMLP
 
 
 class PointHistoryClassifier(object):
@@ -11,30 +14,54 @@ class PointHistoryClassifier(object):
         score_th=0.5,
         invalid_value=0,
         num_threads=1,
+        backend='tflite',
     ):
-        self.interpreter = tf.lite.Interpreter(model_path=model_path,
-                                               num_threads=num_threads)
+        """
+        Args:
+            model_path: .tflite model, or .hdf5 weights for the numpy backend
+            score_th: ids scoring below this are replaced by invalid_value
+            invalid_value: id reported for low-confidence histories
+            num_threads: TFLite interpreter threads
+            backend: 'tflite' runs tf.lite.Interpreter with the builtin
+                kernels, 'numpy' runs the same network with NumpyMLP and
+                never imports TensorFlow
+        """
+        if backend not in ('tflite', 'numpy'):
+            raise ValueError(f"Unknown classifier backend: {backend}")
+
+        self.model_path = model_path
+        self.num_threads = num_threads
+        self.backend = backend
+
+        self.score_th = score_th
+        self.invalid_value = invalid_value
+
+        if backend == 'numpy':
+            self.mlp = NumpyMLP.load(model_path)
+            return
+
+        import tensorflow as tf
+
+        # Builtin kernels only, which the numpy backend reproduces; the
+        # default XNNPACK delegate rounds int8 hybrid layers differently
+        self._interpreter_class = functools.partial(
+            tf.lite.Interpreter,
+            experimental_op_resolver_type=tf.lite.experimental.OpResolverType.BUILTIN_WITHOUT_DEFAULT_DELEGATES)
+        self.interpreter = self._interpreter_class(model_path=model_path,
+                                                   num_threads=num_threads)
 
         self.interpreter.allocate_tensors()
         self.input_details = self.interpreter.get_input_details()
         self.output_details = self.interpreter.get_output_details()
 
-        self.score_th = score_th
-        self.invalid_value = invalid_value
+        # Interpreters with the input tensor resized to a given batch size
+        self._batch_interpreters = {1: self.interpreter}
 
     def __call__(
         self,
         point_history,
     ):
-        input_details_tensor_index = self.input_details[0]['index']
-        self.interpreter.set_tensor(
-            input_details_tensor_index,
-            np.array([point_history], dtype=np.float32))
-        self.interpreter.invoke()
-
-        output_details_tensor_index = self.output_details[0]['index']
-
-        result = self.interpreter.get_tensor(output_details_tensor_index)
+        result = self._invoke(np.array([point_history], dtype=np.float32))
 
         result_index = np.argmax(np.squeeze(result))
 
@@ -42,3 +69,63 @@ class PointHistoryClassifier(object):
             result_index = self.invalid_value
 
         return result_index
+
+    def classify_batch(
+        self,
+        point_history_batch,
+    ):
+        """Classify N pre-processed point histories with a single invoke.
+
+        Ids whose top score is below ``score_th`` are replaced by
+        ``invalid_value``, as in ``__call__``.
+
+        Args:
+            point_history_batch: array-like of shape (N, 32)
+
+        Returns:
+            tuple: (class ids of shape (N,), scores of shape (N, num_classes))
+        """
+        point_history_batch = np.asarray(point_history_batch, dtype=np.float32)
+        if point_history_batch.ndim == 1:
+            point_history_batch = point_history_batch.reshape(1, -1)
+
+        batch_size = point_history_batch.shape[0]
+        if batch_size == 0:
+            return (np.empty((0,), dtype=np.int64),
+                    np.empty((0, self.num_classes), dtype=np.float32))
+
+        scores = self._invoke(point_history_batch)
+
+        result_index = np.argmax(scores, axis=1)
+        below_th = scores[np.arange(batch_size), result_index] < self.score_th
+        result_index[below_th] = self.invalid_value
+
+        return result_index, scores
+
+    @property
+    def num_classes(self):
+        if self.backend == 'numpy':
+            return self.mlp.output_size
+        return self.output_details[0]['shape'][-1]
+
+    def _invoke(self, batch):
+        if self.backend == 'numpy':
+            return self.mlp.predict(batch)
+
+        interpreter = self._get_batch_interpreter(batch.shape[0])
+        interpreter.set_tensor(self.input_details[0]['index'], batch)
+        interpreter.invoke()
+
+        return interpreter.get_tensor(self.output_details[0]['index'])
+
+    def _get_batch_interpreter(self, batch_size):
+        interpreter = self._batch_interpreters.get(batch_size)
+        if interpreter is None:
+            interpreter = self._interpreter_class(model_path=self.model_path,
+                                                  num_threads=self.num_threads)
+            interpreter.resize_tensor_input(
+                self.input_details[0]['index'],
+                [batch_size, self.input_details[0]['shape'][1]])
+            interpreter.allocate_tensors()
+            self._batch_interpreters[batch_size] = interpreter
+        return interpreter
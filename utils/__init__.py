@@ -1 +1,22 @@
-from utils.cvfpscalc import CvFpsCalc
\ No newline at end of file
+from utils.cvfpscalc import CvFpsCalc
+from utils.capture import FrameGrabber
+from utils.pipeline import FramePacket, FramePipeline, StageQueue, StopPipeline
+from utils.landmarks import (bounding_rect, calc_bounding_rect, calc_landmark_list,
+                             landmark_array, normalize_landmarks, pre_process_landmark)
+from utils.point_history import PointHistoryBuffer
+from utils.tracking import AdaptiveHandTracker, LandmarkMotionModel, TrackedResults
+from utils.resize import InferenceResizer
+from utils.buffers import AllocationCounter, FrameBufferPool
+from utils.broadcast import EncodedFrame, FrameBroadcaster, FrameSubscription, ScaledFrameCache
+from utils.stream_quality import JpegQualityController
+from utils.landmark_stream import LandmarkPacketEncoder, decode_landmark_packet
+from utils.wire_schema import EnumTable, WireSchema
+from utils.emit_scheduler import EmitScheduler
+from utils.state_store import FrameResult, StateStore
+from utils.speech import SpeechWorker
+from utils.phrase_cache import PhraseCache
+from utils.serial_worker import SerialRequest, SerialWorker
+from utils.device_commands import DeviceCommandLayer
+from utils.serial_transport import NodeMCUSimulator, SerialTransport, open_serial_port
+from utils.control_layout import ControlLayout
+from utils.overlay import ButtonOverlay
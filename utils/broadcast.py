@@ -0,0 +1,227 @@
+import itertools
+import threading
+import time
+
+import cv2 as cv
+import numpy as np
+
+
+class EncodedFrame(object):
+    """One encoded frame as handed to every subscriber.
+
+    ``data`` is an immutable ``bytes`` object, so all subscribers share it
+    without copying. ``index`` counts published frames (unlike ``seq``,
+    which also skips frames dropped inside the pipeline) and is what
+    subscribers use to tell how many frames they missed. ``metadata`` must
+    not be modified after publishing.
+    """
+
+    __slots__ = ('index', 'seq', 'data', 'timestamp', 'metadata')
+
+    def __init__(self, index, seq, data, timestamp, metadata=None):
+        self.index = index
+        self.seq = seq
+        self.data = data
+        self.timestamp = timestamp
+        self.metadata = metadata
+
+
+class FrameSubscription(object):
+    """A consumer's view of a ``FrameBroadcaster``.
+
+    ``next()`` returns the newest frame this subscriber has not seen yet;
+    frames published while it was busy are skipped and counted in
+    ``dropped_count``. ``last_lag_ms`` is the time between publishing a
+    frame and this subscriber picking it up.
+    """
+
+    def __init__(self, broadcaster, name):
+        self._broadcaster = broadcaster
+        self.name = name
+        self.closed = False
+        self.last_index = 0
+        self.delivered_count = 0
+        self.dropped_count = 0
+        self.last_lag_ms = 0.0
+        self._total_lag_ms = 0.0
+
+    def next(self, timeout=None):
+        """Block for a new frame; returns None on timeout or once closed."""
+        frame = self._broadcaster._wait_newer(self, timeout)
+        if frame is None:
+            return None
+
+        if self.last_index:
+            self.dropped_count += frame.index - self.last_index - 1
+        self.last_index = frame.index
+        self.delivered_count += 1
+        self.last_lag_ms = (time.time() - frame.timestamp) * 1000.0
+        self._total_lag_ms += self.last_lag_ms
+        return frame
+
+    def close(self):
+        self._broadcaster.unsubscribe(self)
+
+    def stats(self):
+        delivered = self.delivered_count
+        return {
+            'delivered': delivered,
+            'dropped': self.dropped_count,
+            'behind': self._broadcaster.published_count - self.last_index if self.last_index else 0,
+            'last_lag_ms': round(self.last_lag_ms, 2),
+            'avg_lag_ms': round(self._total_lag_ms / delivered, 2) if delivered else 0.0,
+        }
+
+
+class FrameBroadcaster(object):
+    """Encode once, fan out to many consumers.
+
+    The processing loop ``publish``es each encoded frame once; publishing
+    only swaps the latest-frame reference and wakes waiting subscribers, so
+    it never waits for any of them. Each subscriber (Socket.IO sender, MJPEG
+    stream, recorder, ...) pulls at its own pace and simply skips what it
+    was too slow to take, so one slow viewer cannot hold back the loop or
+    the others.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._latest = None
+        self._subscriptions = []
+        self._names = itertools.count(1)
+        self.closed = False
+        self.published_count = 0
+
+    @property
+    def latest(self):
+        return self._latest
+
+    def publish(self, data, seq, metadata=None, timestamp=None):
+        with self._cond:
+            self.published_count += 1
+            frame = EncodedFrame(self.published_count, seq, bytes(data),
+                                 time.time() if timestamp is None else timestamp, metadata)
+            self._latest = frame
+            self._cond.notify_all()
+        return frame
+
+    def subscribe(self, name=None):
+        with self._cond:
+            subscription = FrameSubscription(self, f"{name or 'subscriber'}-{next(self._names)}")
+            subscription.closed = self.closed
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._cond:
+            subscription.closed = True
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+            self._cond.notify_all()
+
+    def close(self):
+        """Wake every subscriber; their ``next()`` returns None from now on."""
+        with self._cond:
+            self.closed = True
+            for subscription in self._subscriptions:
+                subscription.closed = True
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            subscriptions = list(self._subscriptions)
+        return {
+            'published': self.published_count,
+            'subscribers': {subscription.name: subscription.stats() for subscription in subscriptions},
+        }
+
+    def _wait_newer(self, subscription, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not subscription.closed:
+                frame = self._latest
+                if frame is not None and frame.index > subscription.last_index:
+                    return frame
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return None
+
+
+class ScaledFrameCache(object):
+    """Downscaled re-encodings of the latest broadcast frame.
+
+    Clients asking for the same scale share one JPEG, computed by whichever
+    of them asks first while the others wait for it; only the entries for
+    the newest frame are kept. Decoding, resizing and encoding happen
+    outside the lock, so other scales and cache hits are never held up.
+
+    ``scale`` is relative to the broadcast frame, which the stream
+    controller may already have shrunk (see ``JpegQualityController``).
+    """
+
+    def __init__(self, quality=80):
+        self.quality = quality
+        self._cond = threading.Condition()
+        self._frame = None
+        self._entries = {}
+        self._in_flight = set()   # (frame, scale) being encoded
+        self.encoded_count = 0
+        self.hit_count = 0
+
+    def get(self, frame, scale):
+        """Return the JPEG bytes of ``frame`` resized by ``scale`` (0, 1]."""
+        if scale >= 1.0:
+            return frame.data
+        with self._cond:
+            while True:
+                if self._frame is frame:
+                    data = self._entries.get(scale)
+                    if data is not None:
+                        self.hit_count += 1
+                        return data
+                if (frame, scale) not in self._in_flight:
+                    break
+                self._cond.wait()
+            self._in_flight.add((frame, scale))
+
+        data = None
+        try:
+            data = self._encode(frame.data, scale)
+        finally:
+            with self._cond:
+                self._in_flight.discard((frame, scale))
+                if data is not None:
+                    self.encoded_count += 1
+                    # A late request for an older frame is not cached
+                    if self._frame is None or frame.index > self._frame.index:
+                        self._frame = frame
+                        self._entries = {}
+                    if self._frame is frame:
+                        self._entries[scale] = data
+                # Waiters find the entry, or encode it themselves on failure
+                self._cond.notify_all()
+        return data
+
+    def stats(self):
+        return {'encoded': self.encoded_count, 'hits': self.hit_count}
+
+    def _encode(self, data, scale):
+        # Let the JPEG decoder do most of the shrinking (it skips DCT work)
+        if scale <= 0.125:
+            flag, reduced = cv.IMREAD_REDUCED_COLOR_8, 0.125
+        elif scale <= 0.25:
+            flag, reduced = cv.IMREAD_REDUCED_COLOR_4, 0.25
+        elif scale <= 0.5:
+            flag, reduced = cv.IMREAD_REDUCED_COLOR_2, 0.5
+        else:
+            flag, reduced = cv.IMREAD_COLOR, 1.0
+        image = cv.imdecode(np.frombuffer(data, dtype=np.uint8), flag)
+
+        if scale != reduced:
+            height, width = image.shape[:2]
+            size = (max(1, round(width * scale / reduced)), max(1, round(height * scale / reduced)))
+            image = cv.resize(image, size, interpolation=cv.INTER_AREA)
+        _, buffer = cv.imencode('.jpg', image, [int(cv.IMWRITE_JPEG_QUALITY), self.quality])
+        return buffer.tobytes()
@@ -0,0 +1,113 @@
+import contextlib
+import threading
+import tracemalloc
+
+import numpy as np
+
+
+class FrameBufferPool(object):
+    """Recycles full-size frame buffers between pipeline iterations.
+
+    ``acquire`` hands out a free buffer of the requested shape, allocating
+    only when none is free; ``release`` returns it. Once the pool holds as
+    many buffers as there are frames in flight, steady-state iterations
+    allocate nothing.
+    """
+
+    def __init__(self):
+        self._free = {}
+        self._lock = threading.Lock()
+        self.allocated_count = 0
+        self.reused_count = 0
+
+    def acquire(self, shape, dtype=np.uint8):
+        key = (tuple(shape), np.dtype(dtype))
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                self.reused_count += 1
+                return free.pop()
+            self.allocated_count += 1
+        return np.empty(shape, dtype=dtype)
+
+    def release(self, buffer):
+        if buffer is None:
+            return
+        key = (buffer.shape, buffer.dtype)
+        with self._lock:
+            self._free.setdefault(key, []).append(buffer)
+
+    def stats(self):
+        with self._lock:
+            free = sum(len(buffers) for buffers in self._free.values())
+        return {
+            'allocated': self.allocated_count,
+            'reused': self.reused_count,
+            'free': free,
+        }
+
+
+class AllocationCounter(object):
+    """Debug check that pipeline stages allocate no full-size arrays.
+
+    Uses ``tracemalloc`` (NumPy and OpenCV arrays are traced). Each stage
+    call runs inside a ``measure`` window: the traced-memory peak is reset
+    on entry, and a peak at least ``threshold_bytes`` above the memory in
+    use on entry means the call allocated an array that size, whether it
+    was freed again or not. Windows are serialized with a lock so stages on
+    other threads cannot hide or add allocations, which makes this a debug
+    mode only. Allocations inside MediaPipe's C++ graph are not visible to
+    tracemalloc.
+
+    The first ``warmup`` calls of every stage, while buffer pools fill up,
+    are not counted. ``threshold_bytes`` may be set later (e.g. once the
+    frame size is known); calls before that are not counted either.
+    """
+
+    def __init__(self, threshold_bytes=None, warmup=30):
+        self.threshold_bytes = threshold_bytes
+        self.warmup = warmup
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return self
+
+    def stop(self):
+        tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        with self._lock:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            try:
+                yield
+            finally:
+                self._record(name, tracemalloc.get_traced_memory()[1] - baseline)
+
+    def wrap(self, name, fn):
+        """Return ``fn`` with every call measured under ``name``."""
+        def measured(*args, **kwargs):
+            with self.measure(name):
+                return fn(*args, **kwargs)
+        return measured
+
+    def _record(self, name, growth):
+        stage = self._stages.setdefault(name, {'calls': 0, 'full_size_allocations': 0, 'max_growth_bytes': 0})
+        stage['calls'] += 1
+        if stage['calls'] <= self.warmup or self.threshold_bytes is None:
+            return
+        stage['max_growth_bytes'] = max(stage['max_growth_bytes'], growth)
+        if growth >= self.threshold_bytes:
+            stage['full_size_allocations'] += 1
+            print(f"Stage '{name}' allocated a full-size array ({growth} bytes)")
+
+    def stats(self):
+        with self._lock:
+            return {
+                'threshold_bytes': self.threshold_bytes,
+                'stages': {name: dict(stage) for name, stage in self._stages.items()},
+            }
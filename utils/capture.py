@@ -0,0 +1,129 @@
+import threading
+import time
+
+import cv2 as cv
+import numpy as np
+
+
+class FrameGrabber(object):
+    """Reads camera frames on a background thread into a small ring buffer.
+
+    The ring is preallocated from the first frame and reused in place
+    (``VideoCapture.read`` writes straight into the slot). ``read()`` always
+    hands out the newest frame; frames that were overwritten before anybody
+    consumed them are counted in ``dropped_count``. A frame returned by
+    ``read()`` stays valid until the next call to ``read()``.
+    """
+
+    def __init__(self, cap, buffer_len=3):
+        # One slot for the writer, one for the newest frame and one held by
+        # the consumer, so the writer never touches a frame in use.
+        if buffer_len < 3:
+            raise ValueError("buffer_len must be at least 3")
+
+        self._cap = cap
+        self._slots = [None] * buffer_len
+        self._slot_seq = [0] * buffer_len
+        self._slot_time = [0.0] * buffer_len
+        self._latest = -1
+        self._reading = -1
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+        self.failed = False
+        self.frame_seq = 0
+        self.frame_timestamp = 0.0
+        self.captured_count = 0
+        self.dropped_count = 0
+
+        # Keep the driver queue short so the ring, not the driver, decides
+        # which frame is newest
+        self._cap.set(cv.CAP_PROP_BUFFERSIZE, 1)
+
+    def start(self):
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def read(self, timeout=1.0):
+        """Return ``(ret, frame)`` for the newest frame not yet consumed.
+
+        Blocks for at most ``timeout`` seconds. ``ret`` is False on timeout or
+        once the camera has failed (see ``failed``).
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while not self.failed and self._running:
+                if self._latest >= 0 and self._slot_seq[self._latest] > self.frame_seq:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False, None
+                self._cond.wait(remaining)
+            else:
+                return False, None
+
+            self._reading = self._latest
+            self.frame_seq = self._slot_seq[self._reading]
+            self.frame_timestamp = self._slot_time[self._reading]
+            return True, self._slots[self._reading]
+
+    def stats(self):
+        return {
+            'captured': self.captured_count,
+            'dropped': self.dropped_count,
+            'consumed_seq': self.frame_seq,
+        }
+
+    def _next_write_slot(self):
+        for index in range(len(self._slots)):
+            if index != self._latest and index != self._reading:
+                return index
+        return 0  # unreachable with buffer_len >= 3
+
+    def _run(self):
+        while self._running:
+            with self._cond:
+                index = self._next_write_slot()
+            slot = self._slots[index]
+
+            if slot is not None:
+                ret, frame = self._cap.read(slot)
+            else:
+                ret, frame = self._cap.read()
+            timestamp = time.time()
+
+            if not ret or frame is None:
+                with self._cond:
+                    self.failed = True
+                    self._cond.notify_all()
+                break
+
+            if frame is not slot:
+                # First frame, or the camera changed resolution: (re)allocate
+                # the ring around the new shape
+                self._slots = [np.empty_like(frame) for _ in self._slots]
+                self._slots[index] = frame
+
+            with self._cond:
+                if self._latest >= 0 and self._slot_seq[self._latest] > self.frame_seq:
+                    self.dropped_count += 1
+                self.captured_count += 1
+                self._slot_seq[index] = self.captured_count
+                self._slot_time[index] = timestamp
+                self._latest = index
+                self._cond.notify_all()
+
+        self._running = False
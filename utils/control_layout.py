@@ -0,0 +1,78 @@
+import time
+
+import numpy as np
+
+
+class ControlLayout(object):
+    """On-screen control regions, hit-tested for all fingertips at once.
+
+    ``regions`` is a sequence of ``(x, y, width, height)`` boxes; a region
+    is referred to by its index. ``update`` tests every fingertip of every
+    hand against every region with a few array operations, so the
+    per-frame Python work does not grow with the number of controls.
+
+    A press is confirmed once some fingertip has stayed on a region for
+    ``dwell`` seconds, and fires once until the region is released. A
+    region a fingertip is on (dwelling or pressed) counts as left only
+    when no fingertip is within ``release_margin`` pixels of it, so jitter
+    along an edge neither restarts the dwell nor repeats the press.
+    """
+
+    def __init__(self, regions, dwell=0.0, release_margin=0):
+        self.regions = [tuple(int(v) for v in region) for region in regions]
+        boxes = np.array(self.regions, dtype=np.float64).reshape(-1, 4)
+        self._x0 = boxes[:, 0]
+        self._y0 = boxes[:, 1]
+        # Inclusive far edges, like the old ``x <= finger_x <= x + width``
+        self._x1 = boxes[:, 0] + boxes[:, 2]
+        self._y1 = boxes[:, 1] + boxes[:, 3]
+        self.dwell = dwell
+        self.release_margin = release_margin
+
+        self._hover_since = np.full(len(self.regions), np.nan)
+        self._pressed = np.zeros(len(self.regions), dtype=bool)
+
+    @staticmethod
+    def row(count, width, height, y, screen_width, margin):
+        """Boxes of ``count`` equal controls centered in a row at height ``y``."""
+        x = (screen_width - count * width - (count - 1) * margin) // 2
+        return [(x + i * (width + margin), y, width, height) for i in range(count)]
+
+    def __len__(self):
+        return len(self.regions)
+
+    def hit_test(self, points, margin=0.0):
+        """Return a (len(points), len(regions)) bool array: point i is on region j.
+
+        ``margin`` grows the regions, either by one amount or per region.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        x = points[:, 0:1]
+        y = points[:, 1:2]
+        return ((x >= self._x0 - margin) & (x <= self._x1 + margin)
+                & (y >= self._y0 - margin) & (y <= self._y1 + margin))
+
+    def update(self, points, now=None):
+        """Feed this frame's fingertips; returns the regions whose press was confirmed."""
+        now = time.monotonic() if now is None else now
+        hovering = ~np.isnan(self._hover_since)
+        occupied = self.hit_test(points, np.where(hovering, self.release_margin, 0.0)).any(axis=0)
+
+        self._pressed &= occupied
+        self._hover_since[~occupied] = np.nan
+        self._hover_since[occupied & ~hovering] = now
+        confirmed = occupied & ~self._pressed & (now - self._hover_since >= self.dwell)
+        self._pressed |= confirmed
+        return np.flatnonzero(confirmed).tolist()
+
+    def release_all(self):
+        self._hover_since[:] = np.nan
+        self._pressed[:] = False
+
+    def is_pressed(self, index):
+        return bool(self._pressed[index])
+
+    @property
+    def pressed(self):
+        """Regions currently held down by a fingertip."""
+        return np.flatnonzero(self._pressed).tolist()
@@ -0,0 +1,179 @@
+import threading
+import time
+
+
+class DeviceCommandLayer(object):
+    """Idempotent "set state" commands for on/off devices, coalesced per device.
+
+    ``commands`` maps each device to ``{state: command_bytes}``;
+    ``send(command, device, state)`` hands one command to the transport and
+    returns False if it was not accepted. ``set`` records the desired state
+    of a device:
+
+    * a state equal to the last one sent is not sent again;
+    * the first change after a quiet ``window`` goes out at once, later
+      changes within the window only update the desired state and the
+      final one is sent when the window ends, so jitter that flips a
+      device on and off costs at most one command per window.
+
+    ``report`` records a state the device said it is in. After a reconnect
+    ``forget`` drops what was sent but keeps the reported states, and
+    ``reconcile`` resends only the devices whose last reported state
+    differs from the desired one.
+    """
+
+    def __init__(self, send, commands, window=0.25):
+        self._send = send
+        self.commands = {device: dict(states) for device, states in commands.items()}
+        self._by_command = {command: (device, state)
+                            for device, states in self.commands.items()
+                            for state, command in states.items() if command}
+        self.window = window
+
+        self._cond = threading.Condition()
+        self._desired = {}
+        self._sent = {}
+        self._reported = {}
+        self._sent_at = {}
+        self._pending = set()
+        self._running = False
+        self._thread = None
+
+        self.requested_count = 0
+        self.sent_count = 0
+        self.coalesced_count = 0
+        self.dropped_count = 0
+        self.reconciled_count = 0
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def set(self, device, state):
+        """Make ``state`` the desired state of ``device``; returns False if nothing needs sending."""
+        now = time.monotonic()
+        with self._cond:
+            self.requested_count += 1
+            self._desired[device] = state
+            if device in self._pending:
+                # Replaces the change still waiting for its window to end
+                self.coalesced_count += 1
+                if state == self._sent.get(device):
+                    self._pending.discard(device)
+                    return False
+                return True
+            if state == self._sent.get(device):
+                self.coalesced_count += 1
+                return False
+            if now - self._sent_at.get(device, float('-inf')) < self.window:
+                self._pending.add(device)
+                self._cond.notify_all()
+                return True
+            self._sent_at[device] = now
+        return self._dispatch(device, state)
+
+    def desired(self, device):
+        return self._desired.get(device)
+
+    def report(self, device, state):
+        with self._cond:
+            self._reported[device] = state
+
+    def report_command(self, command):
+        """Record the state implied by a command the device echoed; returns ``(device, state)`` or None."""
+        match = self._by_command.get(command)
+        if match is not None:
+            self.report(*match)
+        return match
+
+    def forget(self):
+        """Forget sent and pending states, e.g. after the device reconnected.
+
+        Reported states are kept, so ``reconcile`` right after the reconnect
+        skips devices already known to be in their desired state.
+        """
+        with self._cond:
+            self._sent.clear()
+            self._pending.clear()
+
+    def reconcile(self):
+        """Resend the desired state of devices that did not report it; returns how many were sent."""
+        with self._cond:
+            stale = [(device, state) for device, state in self._desired.items()
+                     if self._reported.get(device) != state and self._sent.get(device) != state]
+            now = time.monotonic()
+            for device, _ in stale:
+                self._pending.discard(device)
+                self._sent_at[device] = now
+        sent = sum(self._dispatch(device, state) for device, state in stale)
+        self.reconciled_count += sent
+        return sent
+
+    def stats(self):
+        with self._cond:
+            return {
+                'requested': self.requested_count,
+                'sent': self.sent_count,
+                'coalesced': self.coalesced_count,
+                'dropped': self.dropped_count,
+                'reconciled': self.reconciled_count,
+                'pending': len(self._pending),
+                'desired': dict(self._desired),
+                'reported': dict(self._reported),
+            }
+
+    def _dispatch(self, device, state):
+        command = self.commands.get(device, {}).get(state)
+        if not command:
+            return False
+        accepted = self._send(command, device, state)
+        with self._cond:
+            if accepted:
+                self.sent_count += 1
+                self._sent[device] = state
+            else:
+                # Left unsent so the next set() or reconcile() retries it
+                self.dropped_count += 1
+                self._sent.pop(device, None)
+        return bool(accepted)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                due = []
+                while self._running and not due:
+                    now = time.monotonic()
+                    wait = None
+                    for device in self._pending:
+                        remaining = self._sent_at[device] + self.window - now
+                        if remaining <= 0:
+                            due.append(device)
+                        elif wait is None or remaining < wait:
+                            wait = remaining
+                    if not due:
+                        self._cond.wait(wait)
+                if not self._running:
+                    return
+                batch = []
+                for device in due:
+                    self._pending.discard(device)
+                    state = self._desired[device]
+                    if state != self._sent.get(device):
+                        self._sent_at[device] = now
+                        batch.append((device, state))
+                    else:
+                        self.coalesced_count += 1
+            for device, state in batch:
+                self._dispatch(device, state)
@@ -0,0 +1,168 @@
+import itertools
+import threading
+import time
+from collections import Counter, deque
+
+
+class _ClientQueue(object):
+    """What is waiting to go out to one client."""
+
+    __slots__ = ('events', 'states', 'next_due', 'rates', 'sent', 'dropped')
+
+    def __init__(self):
+        self.events = deque()   # (token, topic, data) of reliable topics, in order
+        self.states = {}        # topic -> (token, data), the latest of a state topic
+        self.next_due = {}      # topic -> earliest time the next one may go out
+        self.rates = {}         # topic -> per-client rate override
+        self.sent = 0
+        self.dropped = 0
+
+
+class EmitScheduler(object):
+    """Per-client, per-topic rate limiting and coalescing of Socket.IO emits.
+
+    Topics come in two kinds:
+
+    * state topics (``state_topics``, e.g. gesture_update, camera_error):
+      only the latest payload matters. A client gets at most ``rate`` of
+      them per second; a payload replaced before it went out is dropped and
+      counted.
+    * everything else (mode_change, button_update, ...) is a discrete
+      event: queued per client and always delivered, in order.
+
+    ``emit(topic, data, to=None)`` only queues; a sender thread calls
+    ``send(topic, data, to=[sids])`` and batches clients that are due for
+    the same emit into one call, so a broadcast is still serialized once
+    when clients keep up. Emits go out in the order they were made. ``to``
+    is a client id, a collection of them, or None for every client
+    registered with ``add_client``.
+    """
+
+    def __init__(self, send, state_topics=(), rates=None, default_rate=30.0):
+        self._send = send
+        self.state_topics = set(state_topics)
+        self.rates = dict(rates or {})
+        self.default_rate = default_rate
+
+        self._lock = threading.Condition()
+        self._clients = {}
+        self._tokens = itertools.count()
+        self._thread = None
+        self._running = False
+        self.sent_counts = Counter()
+        self.dropped_counts = Counter()
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return self
+            self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            self._running = False
+            self._lock.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def add_client(self, client):
+        with self._lock:
+            self._clients.setdefault(client, _ClientQueue())
+
+    def remove_client(self, client):
+        with self._lock:
+            self._clients.pop(client, None)
+
+    def clients(self):
+        with self._lock:
+            return set(self._clients)
+
+    def set_rate(self, topic, rate, client=None):
+        """Max emits per second of a state topic (0 = no limit), for everyone or one client."""
+        with self._lock:
+            if client is None:
+                self.rates[topic] = rate
+            elif client in self._clients:
+                self._clients[client].rates[topic] = rate
+            self._lock.notify_all()
+
+    def emit(self, topic, data=None, to=None):
+        with self._lock:
+            token = next(self._tokens)
+            if to is None:
+                queues = list(self._clients.values())
+            elif isinstance(to, (set, frozenset, list, tuple)):
+                queues = [self._clients[client] for client in to if client in self._clients]
+            else:
+                queues = [self._clients[to]] if to in self._clients else []
+
+            if topic in self.state_topics:
+                for queue in queues:
+                    if topic in queue.states:
+                        queue.dropped += 1
+                        self.dropped_counts[topic] += 1
+                    queue.states[topic] = (token, data)
+            else:
+                for queue in queues:
+                    queue.events.append((token, topic, data))
+            if queues:
+                self._lock.notify_all()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'clients': {str(client): {'queued': len(queue.events), 'pending': len(queue.states),
+                                          'sent': queue.sent, 'dropped': queue.dropped}
+                            for client, queue in self._clients.items()},
+                'queued': sum(len(queue.events) for queue in self._clients.values()),
+                'sent': dict(self.sent_counts),
+                'dropped': dict(self.dropped_counts),
+            }
+
+    def _rate(self, queue, topic):
+        rate = queue.rates.get(topic)
+        return self.rates.get(topic, self.default_rate) if rate is None else rate
+
+    def _collect(self, now):
+        """Take everything that may go out now; returns (batches, seconds until the next is due)."""
+        batches = {}
+        wait = None
+        for client, queue in self._clients.items():
+            while queue.events:
+                token, topic, data = queue.events.popleft()
+                batches.setdefault(token, (topic, data, []))[2].append(client)
+                queue.sent += 1
+
+            for topic in list(queue.states):
+                due = queue.next_due.get(topic, 0.0)
+                if due > now:
+                    wait = due - now if wait is None else min(wait, due - now)
+                    continue
+                token, data = queue.states.pop(topic)
+                rate = self._rate(queue, topic)
+                queue.next_due[topic] = now + 1.0 / rate if rate > 0 else 0.0
+                batches.setdefault(token, (topic, data, []))[2].append(client)
+                queue.sent += 1
+        for topic, _, clients in batches.values():
+            self.sent_counts[topic] += len(clients)
+        return [batches[token] for token in sorted(batches)], wait
+
+    def _run(self):
+        while True:
+            with self._lock:
+                batches, wait = self._collect(time.monotonic())
+                while not batches and self._running:
+                    self._lock.wait(wait)
+                    batches, wait = self._collect(time.monotonic())
+                if not self._running:
+                    return
+
+            # Sent outside the lock: emitting may block on slow transports
+            for topic, data, clients in batches:
+                try:
+                    self._send(topic, data, to=clients)
+                except Exception as e:
+                    print(f"Error emitting '{topic}': {e}")
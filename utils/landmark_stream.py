@@ -0,0 +1,137 @@
+import struct
+
+import numpy as np
+
+# Landmark packet layout (little endian), version 1:
+#
+#   header  <BBBxIIHH  version, flags, hand_count, seq, base_seq, width, height
+#   hand    <BbBx4h    handedness (0 Left, 1 Right, 2 other), sign id (-1 none),
+#                      confidence * 255, bounding rect x1 y1 x2 y2
+#           then 21 x (x, y) landmark pixels: int16, or int8 differences from
+#           the same hand in packet ``base_seq`` when FLAG_DELTA is set
+#
+# gesture-app/src/App.js decodes the same layout.
+
+PACKET_VERSION = 1
+FLAG_DELTA = 0x01
+
+_HEADER = struct.Struct('<BBBxIIHH')
+_HAND = struct.Struct('<BbBx4h')
+_HANDEDNESS = {'Left': 0, 'Right': 1}
+_HANDEDNESS_NAMES = {0: 'Left', 1: 'Right'}
+_NUM_VALUES = 42
+
+
+class LandmarkPacketEncoder(object):
+    """Packs the hands of one frame into a compact binary landmark packet.
+
+    Landmarks are sent as int16 pixel coordinates. With ``delta`` enabled,
+    a packet whose hands match the previous packet (same count and
+    handedness) and whose coordinate changes all fit in int8 carries only
+    those differences; every ``full_interval``-th packet is sent in full so
+    clients that joined late or missed a packet can resync.
+    """
+
+    def __init__(self, delta=False, full_interval=30):
+        self.delta = delta
+        self.full_interval = full_interval
+        self._previous = None
+        self._previous_key = None
+        self._previous_seq = 0
+        self._since_full = 0
+
+        self.packet_count = 0
+        self.delta_count = 0
+        self.byte_count = 0
+
+    def encode(self, seq, width, height, hands):
+        """Return the packet bytes.
+
+        ``hands`` is a list of dicts with 'handedness', 'sign_id',
+        'confidence', 'brect' and 'landmark_list' (21 [x, y] pixels).
+        """
+        if hands:
+            points = np.asarray([hand['landmark_list'] for hand in hands],
+                                dtype=np.int16).reshape(len(hands), _NUM_VALUES)
+        else:
+            points = np.zeros((0, _NUM_VALUES), dtype=np.int16)
+        key = tuple(hand['handedness'] for hand in hands)
+
+        flags = 0
+        payload = points
+        if (self.delta and self._previous is not None and key == self._previous_key
+                and self._since_full < self.full_interval):
+            difference = points.astype(np.int32) - self._previous
+            if difference.size == 0 or (difference.min() >= -128 and difference.max() <= 127):
+                flags |= FLAG_DELTA
+                payload = difference.astype(np.int8)
+
+        if flags & FLAG_DELTA:
+            self._since_full += 1
+            self.delta_count += 1
+        else:
+            self._since_full = 0
+
+        parts = [_HEADER.pack(PACKET_VERSION, flags, len(hands), seq,
+                              self._previous_seq if flags & FLAG_DELTA else 0, width, height)]
+        for hand, values in zip(hands, payload):
+            brect = hand['brect']
+            parts.append(_HAND.pack(_HANDEDNESS.get(hand['handedness'], 2),
+                                    int(hand['sign_id']) if hand.get('sign_id') is not None else -1,
+                                    int(round(min(max(hand['confidence'], 0.0), 1.0) * 255)),
+                                    *(int(v) for v in brect)))
+            parts.append(values.astype('<i2' if values.dtype == np.int16 else np.int8).tobytes())
+
+        self._previous = points.astype(np.int32)
+        self._previous_key = key
+        self._previous_seq = seq
+        packet = b''.join(parts)
+        self.packet_count += 1
+        self.byte_count += len(packet)
+        return packet
+
+    def stats(self):
+        return {
+            'packets': self.packet_count,
+            'delta_packets': self.delta_count,
+            'avg_bytes': round(self.byte_count / self.packet_count, 1) if self.packet_count else 0.0,
+        }
+
+
+def decode_landmark_packet(packet, previous=None):
+    """Decode a landmark packet; mainly for tools and tests.
+
+    ``previous`` is the decoded result of the packet before it, needed for
+    delta packets. Returns a dict with 'seq', 'width', 'height' and 'hands'
+    (each with 'handedness', 'sign_id', 'confidence', 'brect' and a
+    (21, 2) int32 'landmarks' array), or None when a delta packet cannot be
+    applied because its base packet is missing.
+    """
+    version, flags, hand_count, seq, base_seq, width, height = _HEADER.unpack_from(packet, 0)
+    if version != PACKET_VERSION:
+        raise ValueError(f"Unsupported landmark packet version: {version}")
+
+    delta = bool(flags & FLAG_DELTA)
+    if delta and (previous is None or previous['seq'] != base_seq
+                  or len(previous['hands']) != hand_count):
+        return None
+
+    offset = _HEADER.size
+    hands = []
+    for index in range(hand_count):
+        handedness, sign_id, confidence, x1, y1, x2, y2 = _HAND.unpack_from(packet, offset)
+        offset += _HAND.size
+        dtype = np.int8 if delta else np.dtype('<i2')
+        values = np.frombuffer(packet, dtype=dtype, count=_NUM_VALUES, offset=offset).astype(np.int32)
+        offset += values.size * np.dtype(dtype).itemsize
+        landmarks = values.reshape(21, 2)
+        if delta:
+            landmarks = landmarks + previous['hands'][index]['landmarks']
+        hands.append({
+            'handedness': _HANDEDNESS_NAMES.get(handedness, 'Unknown'),
+            'sign_id': sign_id,
+            'confidence': confidence / 255.0,
+            'brect': [x1, y1, x2, y2],
+            'landmarks': landmarks,
+        })
+    return {'seq': seq, 'width': width, 'height': height, 'hands': hands}
@@ -0,0 +1,61 @@
+import numpy as np
+
+
+def landmark_array(image, landmarks):
+    """Convert MediaPipe hand landmarks into a (21, 2) int32 array of pixels.
+
+    Matches the old per-point ``min(int(v * size), size - 1)``: values are
+    truncated toward zero and clamped to the last row/column only.
+    """
+    image_height, image_width = image.shape[0], image.shape[1]
+    points = np.array([(landmark.x, landmark.y) for landmark in landmarks.landmark],
+                      dtype=np.float64).reshape(-1, 2)
+    return normalized_to_pixels(points, image_width, image_height)
+
+
+def normalized_to_pixels(points, image_width, image_height):
+    """Scale normalized (..., 21, 2) coordinates to int32 pixel coordinates."""
+    size = np.array((image_width, image_height), dtype=np.float64)
+    pixels = np.trunc(np.asarray(points, dtype=np.float64) * size)
+    np.minimum(pixels, size - 1, out=pixels)
+    return pixels.astype(np.int32)
+
+
+def bounding_rect(points):
+    """Return ``[x1, y1, x2, y2]`` for (21, 2) points, or an (N, 4) array for
+    an (N, 21, 2) batch.
+
+    Same box as ``cv.boundingRect`` (which counts the pixels inclusively,
+    hence the +1 on the far edge).
+    """
+    points = np.asarray(points)
+    rect = np.concatenate((points.min(axis=-2), points.max(axis=-2) + 1), axis=-1)
+    return rect.tolist() if rect.ndim == 1 else rect
+
+
+def normalize_landmarks(points):
+    """Classifier input for (21, 2) points: a (42,) float vector, or (N, 42)
+    for an (N, 21, 2) batch.
+
+    Points are made relative to the wrist (landmark 0), flattened x0, y0, x1,
+    ... and divided by the largest absolute value.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    relative = points - points[..., :1, :]
+    features = relative.reshape(relative.shape[:-2] + (-1,))
+    max_value = np.abs(features).max(axis=-1, keepdims=True)
+    # A degenerate hand (all points on the wrist) stays all zeros
+    np.divide(features, max_value, out=features, where=max_value > 0)
+    return features
+
+
+def calc_bounding_rect(image, landmarks):
+    return bounding_rect(landmark_array(image, landmarks))
+
+
+def calc_landmark_list(image, landmarks):
+    return landmark_array(image, landmarks).tolist()
+
+
+def pre_process_landmark(landmark_list):
+    return normalize_landmarks(landmark_list).tolist()
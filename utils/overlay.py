@@ -0,0 +1,132 @@
+import time
+from collections import OrderedDict
+
+import cv2 as cv
+import numpy as np
+
+
+class ButtonOverlay(object):
+    """Composites pre-rendered button sprites onto frames.
+
+    ``render(canvas, label, pressed)`` draws one button filling a BGR
+    ``canvas`` the size of its region. Each (size, label, pressed)
+    combination is rendered once, onto black and onto white: where the two
+    agree the button is opaque, where they differ the frame shows through,
+    which recovers the anti-aliased edges exactly. Up to ``max_sprites``
+    are kept, least recently used first out.
+
+    Which sprite goes where is worked out again only when the labels or the
+    pressed buttons change; drawing a frame then only blends the button
+    ROIs. Regions include their far edge, as ``cv.rectangle`` draws it.
+    """
+
+    def __init__(self, regions, render, max_sprites=64):
+        self.regions = [tuple(int(v) for v in region) for region in regions]
+        self._render = render
+        self.max_sprites = max_sprites
+
+        self._sprites = OrderedDict()  # (width, height, label, pressed) -> (color, opaque, partial)
+        self._layer_key = None
+        self._layer = []
+
+        self.frame_count = 0
+        self.render_count = 0
+        self.rebuild_count = 0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self._total_ms = 0.0
+
+    def draw(self, frame, labels, pressed=None):
+        """Blend the buttons into ``frame`` in place; ``pressed`` maps index -> label shown while pressed."""
+        started = time.perf_counter()
+        pressed = pressed or {}
+        key = (frame.shape, tuple(labels), tuple(sorted(pressed.items())))
+        if key != self._layer_key:
+            self._layer = self._build_layer(frame.shape, labels, pressed)
+            self._layer_key = key
+            self.rebuild_count += 1
+
+        for (top, bottom, left, right), color, opaque, partial in self._layer:
+            roi = frame[top:bottom, left:right]
+            cv.copyTo(color, opaque, roi)
+            if partial is not None:
+                # Only anti-aliased edge pixels need an actual blend
+                rows, cols, premultiplied, transparency = partial
+                blended = roi[rows, cols] * transparency
+                blended += premultiplied
+                roi[rows, cols] = blended
+
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self.frame_count += 1
+        self.last_ms = elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self._total_ms += elapsed_ms
+        return frame
+
+    def stats(self):
+        return {
+            'frames': self.frame_count,
+            'sprites': len(self._sprites),
+            'rendered': self.render_count,
+            'layer_rebuilds': self.rebuild_count,
+            'last_ms': round(self.last_ms, 3),
+            'max_ms': round(self.max_ms, 3),
+            'avg_ms': round(self._total_ms / self.frame_count, 3) if self.frame_count else 0.0,
+        }
+
+    def _build_layer(self, shape, labels, pressed):
+        frame_height, frame_width = shape[:2]
+        layer = []
+        for index, (x, y, width, height) in enumerate(self.regions):
+            is_pressed = index in pressed
+            label = pressed[index] if is_pressed else labels[index]
+            color, opaque, partial = self._sprite(width + 1, height + 1, label, is_pressed)
+
+            # Clip to the frame
+            left, top = max(x, 0), max(y, 0)
+            right, bottom = min(x + width + 1, frame_width), min(y + height + 1, frame_height)
+            if left >= right or top >= bottom:
+                continue
+            if (left, top, right, bottom) != (x, y, x + width + 1, y + height + 1):
+                color, opaque, partial = self._crop(color, opaque, partial,
+                                                    top - y, bottom - y, left - x, right - x)
+            layer.append(((top, bottom, left, right), color, opaque, partial))
+        return layer
+
+    @staticmethod
+    def _crop(color, opaque, partial, top, bottom, left, right):
+        if partial is not None:
+            rows, cols, premultiplied, transparency = partial
+            keep = (rows >= top) & (rows < bottom) & (cols >= left) & (cols < right)
+            partial = (rows[keep] - top, cols[keep] - left, premultiplied[keep], transparency[keep]) \
+                if keep.any() else None
+        return color[top:bottom, left:right], opaque[top:bottom, left:right], partial
+
+    def _sprite(self, width, height, label, pressed):
+        key = (width, height, label, pressed)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            return sprite
+
+        on_black = np.zeros((height, width, 3), dtype=np.uint8)
+        on_white = np.full((height, width, 3), 255, dtype=np.uint8)
+        self._render(on_black, label, pressed)
+        self._render(on_white, label, pressed)
+        transparency = (on_white.astype(np.float32) - on_black) / 255.0
+
+        # Opaque pixels are copied, fully transparent ones skipped and the
+        # rest blended: premultiplied color + frame * transparency
+        opaque = (transparency == 0).all(axis=2)
+        rows, cols = np.nonzero(~opaque & (transparency < 1).any(axis=2))
+        partial = None
+        if len(rows):
+            # +0.5 so the cast back to uint8 rounds instead of truncating
+            partial = (rows, cols, on_black[rows, cols].astype(np.float32) + 0.5, transparency[rows, cols])
+        sprite = (on_black, opaque.astype(np.uint8), partial)
+        self.render_count += 1
+
+        self._sprites[key] = sprite
+        while len(self._sprites) > self.max_sprites:
+            self._sprites.popitem(last=False)
+        return sprite
@@ -0,0 +1,166 @@
+import hashlib
+import os
+import threading
+from collections import Counter, OrderedDict
+
+
+class PhraseCache(object):
+    """Content-addressed cache of synthesized phrases, on disk and in memory.
+
+    Files are named after a hash of (text, voice, rate), so a phrase is
+    synthesized once per voice setup and reused across runs.
+    ``synthesize(text, path)`` renders a phrase to an audio file and
+    ``load(path)`` decodes one into a playable object, returning
+    ``(audio, size_bytes)``. Decoded phrases are kept in memory, so
+    repeating a phrase costs neither synthesis nor file I/O. Both levels
+    evict least recently used entries beyond ``max_memory_bytes`` and
+    ``max_disk_bytes``.
+
+    Synthesis is serialized (TTS engines are rarely thread-safe);
+    ``prewarm`` can run on a background thread while phrases are played.
+    A file that is being loaded is never evicted from under the loader.
+    """
+
+    def __init__(self, directory, synthesize, load, voice='', rate=0, suffix='.wav',
+                 max_disk_bytes=64 * 1024 * 1024, max_memory_bytes=32 * 1024 * 1024):
+        self.directory = directory
+        self.voice = voice
+        self.rate = rate
+        self.suffix = suffix
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self._synthesize = synthesize
+        self._load = load
+
+        self._lock = threading.Lock()
+        self._synthesis_lock = threading.Lock()
+        self._memory = OrderedDict()   # key -> (audio, size)
+        self._disk = OrderedDict()     # key -> file size, least recently used first
+        self._pinned = Counter()       # key -> loads in progress; not evicted meanwhile
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.synthesized_count = 0
+        self.evicted_count = 0
+
+        os.makedirs(directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith('.partial' + suffix):
+                # Left behind by a synthesis that never finished
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+            elif name.endswith(suffix):
+                stat = os.stat(os.path.join(directory, name))
+                entries.append((stat.st_mtime, name[:-len(suffix)], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self.disk_bytes += size
+
+    def key(self, text):
+        return hashlib.sha256(f"{self.voice}\0{self.rate}\0{text}".encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get(self, text):
+        """Return the decoded audio of ``text``, synthesizing it if needed."""
+        key = self.key(text)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[0]
+        self._ensure_file(key, text, pin=True)
+        try:
+            audio, size = self._load(self.path(key))
+        finally:
+            with self._lock:
+                self._pinned[key] -= 1
+                if not self._pinned[key]:
+                    del self._pinned[key]
+                    # Whatever was kept over the budget for this load
+                    self._evict_files()
+        with self._lock:
+            if key not in self._memory:
+                self._memory[key] = (audio, size)
+                self.memory_bytes += size
+                while self.memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+                    _, (_, evicted) = self._memory.popitem(last=False)
+                    self.memory_bytes -= evicted
+        return audio
+
+    def prewarm(self, texts):
+        """Synthesize every phrase not on disk yet; returns how many were synthesized."""
+        synthesized = self.synthesized_count
+        for text in dict.fromkeys(texts):
+            try:
+                self._ensure_file(self.key(text), text)
+            except Exception as e:
+                print(f"Could not prewarm phrase {text!r}: {e}")
+        return self.synthesized_count - synthesized
+
+    def stats(self):
+        with self._lock:
+            return {
+                'memory_entries': len(self._memory),
+                'memory_bytes': self.memory_bytes,
+                'disk_entries': len(self._disk),
+                'disk_bytes': self.disk_bytes,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'synthesized': self.synthesized_count,
+                'evicted': self.evicted_count,
+            }
+
+    def _ensure_file(self, key, text, pin=False):
+        """Make sure the file of ``key`` exists; with ``pin`` it is also kept until unpinned."""
+        with self._lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+                self.disk_hits += 1
+                if pin:
+                    self._pinned[key] += 1
+                return
+
+        with self._synthesis_lock:
+            with self._lock:
+                if key in self._disk:
+                    if pin:
+                        self._pinned[key] += 1
+                    return
+            # Render next to the final name and rename, so a crash never
+            # leaves a truncated file under a valid key. The extension stays
+            # last, since TTS drivers pick the format from it
+            path = self.path(key)
+            partial = os.path.join(self.directory, key + '.partial' + self.suffix)
+            self._synthesize(text, partial)
+            os.replace(partial, path)
+            size = os.path.getsize(path)
+
+        with self._lock:
+            self.synthesized_count += 1
+            self._disk[key] = size
+            self.disk_bytes += size
+            if pin:
+                self._pinned[key] += 1
+            self._evict_files()
+
+    def _evict_files(self):
+        # Called with the lock held; files being loaded are skipped
+        for evicted in list(self._disk):
+            if self.disk_bytes <= self.max_disk_bytes or len(self._disk) <= 1:
+                break
+            if self._pinned[evicted]:
+                continue
+            self.disk_bytes -= self._disk.pop(evicted)
+            self.evicted_count += 1
+            try:
+                os.remove(self.path(evicted))
+            except OSError:
+                pass
@@ -0,0 +1,240 @@
+import threading
+import time
+import traceback
+from collections import deque
+
+
+class StopPipeline(Exception):
+    """Raised by a stage to shut the whole pipeline down."""
+
+
+class FramePacket(object):
+    """A frame travelling through the pipeline.
+
+    Stages attach their results as attributes; ``seq`` is the capture
+    sequence number and never changes along the way.
+    """
+
+    def __init__(self, seq, frame, timestamp):
+        self.seq = seq
+        self.frame = frame
+        self.timestamp = timestamp
+
+
+class StageQueue(object):
+    """Bounded FIFO between two stages with a configurable backpressure policy.
+
+    ``drop_oldest`` discards the oldest queued packet when full so the
+    producer never waits; ``block`` makes the producer wait for room.
+    """
+
+    DROP_OLDEST = 'drop_oldest'
+    BLOCK = 'block'
+    POLICIES = (DROP_OLDEST, BLOCK)
+
+    def __init__(self, maxsize=2, policy=DROP_OLDEST, on_drop=None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self.policy = policy
+        self._on_drop = on_drop
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.put_count = 0
+        self.dropped_count = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self):
+        return len(self._items)
+
+    def put(self, item):
+        """Queue ``item``; returns False if the queue was closed meanwhile."""
+        dropped = None
+        with self._cond:
+            if self.policy == self.BLOCK:
+                while len(self._items) >= self.maxsize and not self._closed:
+                    self._cond.wait(0.1)
+            elif len(self._items) >= self.maxsize:
+                dropped = self._items.popleft()
+                self.dropped_count += 1
+
+            if self._closed:
+                return False
+
+            self._items.append(item)
+            self.put_count += 1
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._cond.notify_all()
+
+        if dropped is not None and self._on_drop is not None:
+            self._on_drop(dropped)
+        return True
+
+    def get(self, timeout=0.1):
+        """Return the oldest item, or None after ``timeout`` seconds."""
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def drain(self):
+        with self._cond:
+            items = list(self._items)
+            self._items.clear()
+            return items
+
+    def stats(self):
+        return {
+            'depth': len(self._items),
+            'max_depth': self.max_depth,
+            'put': self.put_count,
+            'dropped': self.dropped_count,
+        }
+
+
+class FramePipeline(object):
+    """Runs a source and a chain of stages, each on its own worker thread.
+
+    ``source()`` produces a ``FramePacket`` (or None when nothing is ready)
+    and every stage is a callable ``stage(packet)`` returning the packet to
+    forward, or None to stop it there. Stages are connected by bounded
+    ``StageQueue``s, so stage N works on frame K+1 while stage N+1 is still
+    busy with frame K. Each stage has a single worker, which keeps packets in
+    sequence order.
+    """
+
+    def __init__(self, source, stages, maxsize=2, policy=StageQueue.DROP_OLDEST,
+                 on_error=None, on_drop=None):
+        self._source = source
+        self._stages = list(stages)
+        self._on_error = on_error
+        self._on_drop = on_drop
+        self._queues = [StageQueue(maxsize, policy, on_drop) for _ in self._stages]
+        self._threads = []
+        self._stopped = threading.Event()
+
+        names = ['capture'] + [name for name, _ in self._stages]
+        self._timings = {name: {'processed': 0, 'total_ms': 0.0, 'last_ms': 0.0} for name in names}
+        self.last_seq = {name: 0 for name in names}
+
+    @property
+    def running(self):
+        return not self._stopped.is_set()
+
+    def start(self):
+        self._threads = [threading.Thread(target=self._run_source, daemon=True)]
+        for index, (name, stage) in enumerate(self._stages):
+            self._threads.append(threading.Thread(
+                target=self._run_stage, args=(index, name, stage), daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        self._stopped.set()
+        for stage_queue in self._queues:
+            stage_queue.close()
+        current = threading.current_thread()
+        for thread in self._threads:
+            if thread is not current:
+                thread.join(timeout=timeout)
+        # Hand back whatever never made it to the end
+        for stage_queue in self._queues:
+            for packet in stage_queue.drain():
+                if self._on_drop is not None:
+                    self._on_drop(packet)
+
+    def stop_async(self):
+        """Stop from inside a worker without joining it."""
+        self._stopped.set()
+        for stage_queue in self._queues:
+            stage_queue.close()
+
+    def wait(self, timeout=None):
+        """Block until the pipeline stops; returns True if it has stopped."""
+        return self._stopped.wait(timeout)
+
+    def stats(self):
+        stages = {}
+        for index, name in enumerate(self._timings):
+            timing = self._timings[name]
+            processed = timing['processed']
+            stage_stats = {
+                'processed': processed,
+                'last_seq': self.last_seq[name],
+                'last_ms': round(timing['last_ms'], 2),
+                'avg_ms': round(timing['total_ms'] / processed, 2) if processed else 0.0,
+            }
+            # Stage N reads from queue N-1 (the capture stage has no input)
+            if index > 0:
+                stage_stats['queue'] = self._queues[index - 1].stats()
+            stages[name] = stage_stats
+        return {'running': self.running, 'stages': stages}
+
+    def _record(self, name, packet, started):
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        timing = self._timings[name]
+        timing['processed'] += 1
+        timing['total_ms'] += elapsed_ms
+        timing['last_ms'] = elapsed_ms
+        self.last_seq[name] = packet.seq
+
+    def _handle_error(self, name, error):
+        if isinstance(error, StopPipeline):
+            self.stop_async()
+            return
+        if self._on_error is not None:
+            self._on_error(name, error)
+        else:
+            print(f"Error in pipeline stage '{name}': {error}")
+            traceback.print_exc()
+
+    def _forward(self, index, packet):
+        if index < len(self._queues):
+            if not self._queues[index].put(packet) and self._on_drop is not None:
+                self._on_drop(packet)
+
+    def _run_source(self):
+        while self.running:
+            try:
+                started = time.perf_counter()
+                packet = self._source()
+                if packet is None:
+                    continue
+                self._record('capture', packet, started)
+                self._forward(0, packet)
+            except Exception as e:
+                self._handle_error('capture', e)
+
+    def _run_stage(self, index, name, stage):
+        input_queue = self._queues[index]
+        while self.running:
+            packet = input_queue.get()
+            if packet is None:
+                continue
+            try:
+                started = time.perf_counter()
+                result = stage(packet)
+                self._record(name, packet, started)
+            except Exception as e:
+                self._handle_error(name, e)
+                result = None
+                if self._on_drop is not None:
+                    self._on_drop(packet)
+            if result is not None:
+                self._forward(index + 1, result)
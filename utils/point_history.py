@@ -0,0 +1,56 @@
+import numpy as np
+
+
+class PointHistoryBuffer(object):
+    """Fixed-size fingertip history for the point-history classifier.
+
+    Points live in a preallocated ring that is written twice (slot i and
+    i + history_length), so the last ``history_length`` points are always
+    one contiguous view, oldest first, without rotating or copying. The
+    classifier input is computed into a second preallocated buffer.
+    """
+
+    def __init__(self, history_length=16):
+        self.history_length = history_length
+        self._ring = np.zeros((2 * history_length, 2), dtype=np.int32)
+        self._features = np.zeros((history_length, 2), dtype=np.float32)
+        self._head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def is_full(self):
+        return self.count == self.history_length
+
+    def append(self, point):
+        self._ring[self._head] = point
+        self._ring[self._head + self.history_length] = point
+        self._head = (self._head + 1) % self.history_length
+        self.count = min(self.count + 1, self.history_length)
+
+    def clear(self):
+        self._ring.fill(0)
+        self._head = 0
+        self.count = 0
+
+    def points(self):
+        """View of the (history_length, 2) pixel history, oldest first.
+
+        Slots that were never written read as [0, 0], like the points
+        recorded while the hand is not pointing.
+        """
+        return self._ring[self._head:self._head + self.history_length]
+
+    def features(self, image_width, image_height):
+        """Classifier input: points relative to the oldest one, divided by the
+        image size and flattened to (2 * history_length,).
+
+        Returns a view of an internal buffer that the next call overwrites.
+        """
+        points = self.points()
+        np.subtract(points, points[0], out=self._features)
+        self._features[:, 0] /= image_width
+        self._features[:, 1] /= image_height
+        return self._features.reshape(-1)
@@ -0,0 +1,43 @@
+import cv2 as cv
+import numpy as np
+
+
+class InferenceResizer(object):
+    """Prepares the RGB image the hand detector runs on.
+
+    The BGR frame is shrunk by ``scale`` (aspect ratio kept) into a
+    preallocated buffer and the RGB conversion then runs on the small image,
+    so no full-size temporary is created. MediaPipe returns landmarks
+    normalized to [0, 1], so they map back onto the full-resolution frame
+    unchanged.
+
+    The returned image is marked read-only, which lets MediaPipe use it
+    without copying, and is reused by the next call.
+    """
+
+    def __init__(self, scale=1.0):
+        if not 0.0 < scale <= 1.0:
+            raise ValueError("scale must be in (0, 1]")
+        self.scale = scale
+        self._small = None
+        self._rgb = None
+
+    def size_for(self, frame):
+        """Return the (width, height) detection runs at for ``frame``."""
+        height, width = frame.shape[:2]
+        return max(1, int(round(width * self.scale))), max(1, int(round(height * self.scale)))
+
+    def __call__(self, frame):
+        width, height = self.size_for(frame)
+        if self._rgb is None or self._rgb.shape[:2] != (height, width):
+            self._small = np.empty((height, width, 3), dtype=np.uint8)
+            self._rgb = np.empty((height, width, 3), dtype=np.uint8)
+
+        if (width, height) == (frame.shape[1], frame.shape[0]):
+            source = frame
+        else:
+            source = cv.resize(frame, (width, height), dst=self._small, interpolation=cv.INTER_AREA)
+        self._rgb.flags.writeable = True
+        cv.cvtColor(source, cv.COLOR_BGR2RGB, dst=self._rgb)
+        self._rgb.flags.writeable = False
+        return self._rgb
@@ -0,0 +1,288 @@
+import random
+import threading
+import time
+from collections import deque
+
+
+def open_serial_port(port='/dev/ttyUSB0', baudrate=9600, timeout=2, settle=2.0):
+    """Open a pyserial port and wait ``settle`` seconds for the board to reset."""
+    import serial
+
+    connection = serial.Serial(port, baudrate, timeout=timeout)
+    time.sleep(settle)  # Opening the port resets the NodeMCU
+    return connection
+
+
+class SerialTransport(object):
+    """Keeps a serial link open from a background thread.
+
+    ``open_port()`` returns a connected port-like object (see
+    ``open_serial_port`` and ``NodeMCUSimulator``) or raises. Failed
+    attempts are retried after an exponential backoff, from
+    ``min_backoff`` doubling up to ``max_backoff`` seconds. Once a port is
+    open ``on_connect(port)`` is called; when its user reports the link
+    broken with ``connection_lost``, ``on_disconnect(error)`` is called,
+    the port is closed and reconnecting starts over. Callbacks run on the
+    transport's thread, so nobody ever waits for a connection attempt.
+    """
+
+    CONNECTING = 'connecting'
+    CONNECTED = 'connected'
+    BACKOFF = 'backoff'
+    STOPPED = 'stopped'
+
+    def __init__(self, open_port, on_connect=None, on_disconnect=None, min_backoff=0.5, max_backoff=30.0):
+        self._open_port = open_port
+        self.on_connect = on_connect
+        self.on_disconnect = on_disconnect
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+        self._port = None
+        self._lost_error = None
+        self.state = self.STOPPED
+
+        self.attempt_count = 0
+        self.failure_count = 0
+        self.connect_count = 0
+        self.disconnect_count = 0
+        self.last_error = None
+        self._connected_at = None
+        self._retry_at = None
+
+    @property
+    def port(self):
+        return self._port
+
+    @property
+    def connected(self):
+        return self._port is not None
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+
+    def connection_lost(self, error=None):
+        """Report the current port as broken; safe to call from any thread."""
+        with self._cond:
+            if self._port is not None and self._lost_error is None:
+                self._lost_error = error if error is not None else ConnectionError("Connection lost")
+                self._cond.notify_all()
+
+    def health(self):
+        now = time.monotonic()
+        connected_at, retry_at = self._connected_at, self._retry_at
+        return {
+            'state': self.state,
+            'connected': self.connected,
+            'attempts': self.attempt_count,
+            'failures': self.failure_count,
+            'connects': self.connect_count,
+            'disconnects': self.disconnect_count,
+            'last_error': self.last_error,
+            'uptime_s': round(now - connected_at, 1) if connected_at is not None else 0.0,
+            'retry_in_s': round(max(0.0, retry_at - now), 1) if retry_at is not None else None,
+        }
+
+    def _wait(self, seconds):
+        # Returns False once stopped
+        deadline = time.monotonic() + seconds
+        with self._cond:
+            while self._running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return self._running
+
+    def _run(self):
+        backoff = self.min_backoff
+        while self._running:
+            self.state = self.CONNECTING
+            self.attempt_count += 1
+            try:
+                port = self._open_port()
+            except Exception as e:
+                self.failure_count += 1
+                self.last_error = str(e)
+                self.state = self.BACKOFF
+                self._retry_at = time.monotonic() + backoff
+                print(f"Serial connection failed: {e} (retrying in {backoff:.1f}s)")
+                if not self._wait(backoff):
+                    break
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            backoff = self.min_backoff
+            self._retry_at = None
+            with self._cond:
+                self._lost_error = None
+                self._port = port
+            self._connected_at = time.monotonic()
+            self.connect_count += 1
+            self.state = self.CONNECTED
+            try:
+                if self.on_connect is not None:
+                    self.on_connect(port)
+            except Exception as e:
+                self.connection_lost(e)
+
+            with self._cond:
+                while self._running and self._lost_error is None:
+                    self._cond.wait()
+                error = self._lost_error
+                self._port = None
+            self._connected_at = None
+            if error is not None:
+                self.disconnect_count += 1
+                self.last_error = str(error)
+            try:
+                if self.on_disconnect is not None:
+                    self.on_disconnect(error)
+            finally:
+                try:
+                    port.close()
+                except Exception:
+                    pass
+        self.state = self.STOPPED
+
+
+class NodeMCUSimulator(object):
+    """In-process stand-in for the NodeMCU on a serial port.
+
+    Speaks the sketch's single-byte protocol: ``1``-``6`` switch the
+    light, fan and pump and are answered with the sketch's status line,
+    ``7`` is answered with a sensor line from ``sensor_reading()`` and
+    anything else with ``INVALID COMMAND``. A reply becomes readable
+    ``latency`` seconds after its command plus the time its bytes take at
+    ``baudrate`` (0 to ignore line speed). ``fail()`` makes the port
+    behave like an unplugged device.
+
+    Unlike the sketch it does not repeat the last status line forever.
+    """
+
+    STATUS_LINES = {
+        1: "LIGHT ON",
+        2: "LIGHT OFF",
+        3: "FAN ON",
+        4: "FAN OFF",
+        5: "PUMP ON",
+        6: "PUMP OFF"
+    }
+
+    def __init__(self, latency=0.02, baudrate=9600, sensor_reading=None, timeout=None):
+        self.latency = latency
+        self.byte_time = 10.0 / baudrate if baudrate else 0.0  # 8N1
+        self.timeout = timeout
+        self.sensor_reading = sensor_reading or self._default_sensor_reading
+        self.is_open = True
+        self.commands = []
+
+        self._cond = threading.Condition()
+        self._replies = deque()   # (ready_at, line bytes), in order
+        self._buffer = bytearray()
+        self._line_free_at = 0.0
+        self._failed = False
+
+    def write(self, data):
+        self._check()
+        now = time.monotonic()
+        with self._cond:
+            # Commands reach the board one byte time apart
+            arrival = max(now, self._line_free_at)
+            for byte in bytes(data):
+                arrival += self.byte_time
+                if not 0x30 <= byte <= 0x39:
+                    continue  # parseInt() skips anything but digits
+                command = byte - 0x30
+                self.commands.append(command)
+                line = self._reply(command).encode('utf-8') + b'\r\n'
+                ready_at = max(arrival + self.latency, self._replies[-1][0] if self._replies else 0.0)
+                self._replies.append((ready_at + len(line) * self.byte_time, line))
+            self._line_free_at = arrival
+            self._cond.notify_all()
+        return len(data)
+
+    @property
+    def in_waiting(self):
+        self._check()
+        with self._cond:
+            self._collect(time.monotonic())
+            return len(self._buffer)
+
+    def read(self, size=1):
+        self._check()
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._collect(now)
+                if self._buffer or self._failed or not self.is_open:
+                    break
+                wait = self._replies[0][0] - now if self._replies else None
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        break
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._cond.wait(wait)
+            self._check()
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+            return data
+
+    def readline(self):
+        line = bytearray()
+        while not line.endswith(b'\n'):
+            chunk = self.read(1)
+            if not chunk:
+                break
+            line.extend(chunk)
+        return bytes(line)
+
+    def close(self):
+        with self._cond:
+            self.is_open = False
+            self._cond.notify_all()
+
+    def fail(self):
+        """Make every further read and write raise, like an unplugged device."""
+        with self._cond:
+            self._failed = True
+            self._cond.notify_all()
+
+    def _check(self):
+        if self._failed:
+            raise OSError("Simulated device disconnected")
+        if not self.is_open:
+            raise OSError("Port is closed")
+
+    def _collect(self, now):
+        while self._replies and self._replies[0][0] <= now:
+            self._buffer.extend(self._replies.popleft()[1])
+
+    def _reply(self, command):
+        if command in self.STATUS_LINES:
+            return self.STATUS_LINES[command]
+        if command == 7:
+            return self.sensor_reading()
+        return "INVALID COMMAND"
+
+    @staticmethod
+    def _default_sensor_reading():
+        return f"TEMP:{random.uniform(24.0, 27.0):.1f} HUMIDITY:{random.uniform(40.0, 60.0):.1f}"
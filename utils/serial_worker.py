@@ -0,0 +1,237 @@
+import queue
+import threading
+import time
+from collections import deque
+
+
+class _LatencyStats(object):
+    __slots__ = ('count', 'last_ms', 'max_ms', 'total_ms')
+
+    def __init__(self):
+        self.count = 0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self.total_ms = 0.0
+
+    def add(self, ms):
+        self.count += 1
+        self.last_ms = ms
+        self.max_ms = max(self.max_ms, ms)
+        self.total_ms += ms
+
+    def stats(self):
+        return {
+            'count': self.count,
+            'last_ms': round(self.last_ms, 2),
+            'max_ms': round(self.max_ms, 2),
+            'avg_ms': round(self.total_ms / self.count, 2) if self.count else 0.0,
+        }
+
+
+class SerialRequest(object):
+    """A queued command; ``tag`` is handed back with its response."""
+
+    __slots__ = ('data', 'tag', 'expect_response', 'match', 'queued_at', 'written_at')
+
+    def __init__(self, data, tag=None, expect_response=False, match=None):
+        self.data = data
+        self.tag = tag
+        self.expect_response = expect_response
+        self.match = match
+        self.queued_at = time.monotonic()
+        self.written_at = None
+
+
+class SerialWorker(object):
+    """Serial port I/O off the frame thread.
+
+    ``send`` queues a command and returns at once; a writer thread writes
+    the queue in order. A reader thread splits incoming bytes into lines and
+    calls ``on_line(line, request)``, where ``request`` is the oldest
+    command still waiting for a response (sent with ``expect_response``)
+    that the line can answer, or None for unsolicited lines. A request's
+    ``match(line)`` predicate, if given, picks which lines can answer it. A request with no answer after
+    ``response_timeout`` seconds, or a failed write, is reported through
+    ``on_error(error, request)``; read errors come with ``request=None``.
+
+    The worker outlives connections: ``attach`` hands it a newly opened
+    port and ``detach`` takes it away. While no port is attached ``send``
+    refuses commands. A failed read or write detaches the port and calls
+    ``on_lost(error)``, so the owner can reconnect and ``attach`` again.
+
+    An attached port's read timeout is set to ``poll_interval`` so the
+    reader can notice timeouts and ``stop``. Latency from ``send`` to the
+    end of the write and from the write to the response line is recorded.
+    """
+
+    def __init__(self, port=None, on_line=None, on_error=None, on_lost=None, response_timeout=2.0,
+                 poll_interval=0.1, max_queue=64):
+        self.port = None
+        self.poll_interval = poll_interval
+        self.on_line = on_line
+        self.on_error = on_error
+        self.on_lost = on_lost
+        self.response_timeout = response_timeout
+
+        self._outbound = queue.Queue(maxsize=max_queue)
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._running = False
+        self._threads = []
+
+        self.write_latency = _LatencyStats()
+        self.response_latency = _LatencyStats()
+        self.line_count = 0
+        self.dropped_count = 0
+        self.timeout_count = 0
+        self.error_count = 0
+        if port is not None:
+            self.attach(port)
+
+    def start(self):
+        self._running = True
+        self._threads = [threading.Thread(target=self._write_loop, daemon=True),
+                         threading.Thread(target=self._read_loop, daemon=True)]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        try:
+            self._outbound.put_nowait(None)  # Wake the writer
+        except queue.Full:
+            pass
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+
+    def attach(self, port):
+        port.timeout = self.poll_interval
+        self.port = port
+
+    def detach(self):
+        """Stop using the current port; requests still awaiting a response are failed."""
+        self.port = None
+        with self._lock:
+            orphaned = list(self._pending)
+            self._pending.clear()
+        for request in orphaned:
+            self._report_error(ConnectionError("Serial port detached"), request)
+
+    def send(self, data, tag=None, expect_response=False, match=None):
+        """Queue ``data`` for writing; returns False if no port is attached or the queue is full."""
+        if self.port is None:
+            self.dropped_count += 1
+            return False
+        try:
+            self._outbound.put_nowait(SerialRequest(data, tag, expect_response, match))
+            return True
+        except queue.Full:
+            self.dropped_count += 1
+            return False
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            'attached': self.port is not None,
+            'queued': self._outbound.qsize(),
+            'awaiting_response': pending,
+            'lines': self.line_count,
+            'dropped': self.dropped_count,
+            'timeouts': self.timeout_count,
+            'errors': self.error_count,
+            'write': self.write_latency.stats(),
+            'response': self.response_latency.stats(),
+        }
+
+    def _report_error(self, error, request):
+        self.error_count += 1
+        if self.on_error is not None:
+            self.on_error(error, request)
+
+    def _write_loop(self):
+        while self._running:
+            request = self._outbound.get()
+            if request is None:
+                continue
+            port = self.port
+            if port is None:
+                self.dropped_count += 1
+                continue
+            try:
+                port.write(request.data)
+            except Exception as e:
+                self._lost(port, e, request)
+                continue
+            request.written_at = time.monotonic()
+            self.write_latency.add((request.written_at - request.queued_at) * 1000.0)
+            if request.expect_response:
+                with self._lock:
+                    self._pending.append(request)
+
+    def _read_loop(self):
+        buffer = bytearray()
+        attached = None
+        while self._running:
+            port = self.port
+            if port is not attached:
+                # Never join a partial line from a previous connection
+                buffer.clear()
+                attached = port
+            if port is None:
+                time.sleep(self.poll_interval)
+                continue
+            try:
+                # Blocks for at most poll_interval when nothing arrives
+                chunk = port.read(max(1, port.in_waiting))
+            except Exception as e:
+                self._lost(port, e, None)
+                continue
+
+            now = time.monotonic()
+            if chunk:
+                buffer.extend(chunk)
+                while True:
+                    end = buffer.find(b'\n')
+                    if end < 0:
+                        break
+                    line = bytes(buffer[:end]).decode('utf-8', errors='ignore').strip()
+                    del buffer[:end + 1]
+                    if line:
+                        self._handle_line(line, now)
+            self._expire(now)
+
+    def _lost(self, port, error, request):
+        # Only the first failure on a port detaches it and gets reported
+        with self._lock:
+            if self.port is not port:
+                return
+            self.port = None
+        self._report_error(error, request)
+        self.detach()
+        if self.on_lost is not None:
+            self.on_lost(error)
+
+    def _handle_line(self, line, now):
+        self.line_count += 1
+        request = None
+        with self._lock:
+            for candidate in self._pending:
+                if candidate.match is None or candidate.match(line):
+                    request = candidate
+                    self._pending.remove(candidate)
+                    break
+        if request is not None:
+            self.response_latency.add((now - request.written_at) * 1000.0)
+        if self.on_line is not None:
+            self.on_line(line, request)
+
+    def _expire(self, now):
+        expired = []
+        with self._lock:
+            while self._pending and now - self._pending[0].written_at > self.response_timeout:
+                expired.append(self._pending.popleft())
+        for request in expired:
+            self.timeout_count += 1
+            self._report_error(TimeoutError(f"No response within {self.response_timeout:.1f}s"), request)
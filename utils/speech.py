@@ -0,0 +1,173 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class _Utterance(object):
+    __slots__ = ('priority', 'order', 'text', 'queued_at', 'deadline')
+
+    def __init__(self, priority, order, text, queued_at, deadline):
+        self.priority = priority
+        self.order = order
+        self.text = text
+        self.queued_at = queued_at
+        self.deadline = deadline
+
+    def __lt__(self, other):
+        return (self.priority, self.order) < (other.priority, other.order)
+
+
+class SpeechWorker(object):
+    """Speaks queued utterances on its own thread so callers never block.
+
+    ``speak_fn(text, cancel)`` synthesizes and plays one utterance and must
+    return early once the ``threading.Event`` ``cancel`` is set. Utterances
+    go out by priority (lower value first, FIFO within one):
+
+    * a text already queued or being spoken is dropped as a duplicate;
+    * one that waited longer than ``max_age[priority]`` seconds is dropped
+      as stale when its turn comes;
+    * for priorities in ``latest_only`` a new utterance replaces the queued
+      ones of the same priority (only the newest gesture is worth saying);
+    * a higher-priority utterance cancels a lower-priority one being spoken.
+
+    ``stats()`` reports counts and the queue delay (say() to start of
+    speaking).
+    """
+
+    PRIORITY_DEVICE = 0    # feedback on something the user just switched
+    PRIORITY_SYSTEM = 1    # mode changes, answers to voice commands, ...
+    PRIORITY_GESTURE = 2   # gesture chatter
+
+    def __init__(self, speak_fn, max_age=None, latest_only=(PRIORITY_GESTURE,)):
+        self._speak_fn = speak_fn
+        self.max_age = dict(max_age if max_age is not None
+                            else {self.PRIORITY_DEVICE: 5.0, self.PRIORITY_GESTURE: 2.0})
+        self.latest_only = set(latest_only)
+
+        self._cond = threading.Condition()
+        self._queue = []
+        self._order = itertools.count()
+        self._current = None
+        self._cancel = None
+        self._running = False
+        self._thread = None
+
+        self.spoken_count = 0
+        self.duplicate_count = 0
+        self.stale_count = 0
+        self.replaced_count = 0
+        self.preempted_count = 0
+        self.last_delay_ms = 0.0
+        self.max_delay_ms = 0.0
+        self._total_delay_ms = 0.0
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._queue = []
+            if self._cancel is not None:
+                self._cancel.set()
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def say(self, text, priority=PRIORITY_SYSTEM):
+        """Queue ``text``; returns False if it was dropped as a duplicate."""
+        now = time.monotonic()
+        max_age = self.max_age.get(priority)
+        with self._cond:
+            if (self._current is not None and self._current.text == text) or \
+                    any(utterance.text == text for utterance in self._queue):
+                self.duplicate_count += 1
+                return False
+
+            if priority in self.latest_only:
+                kept = [utterance for utterance in self._queue if utterance.priority != priority]
+                self.replaced_count += len(self._queue) - len(kept)
+                if len(kept) != len(self._queue):
+                    self._queue = kept
+                    heapq.heapify(self._queue)
+
+            heapq.heappush(self._queue, _Utterance(priority, next(self._order), text, now,
+                                                   None if max_age is None else now + max_age))
+            if (self._current is not None and priority < self._current.priority
+                    and not self._cancel.is_set()):
+                self.preempted_count += 1
+                self._cancel.set()
+            self._cond.notify_all()
+        return True
+
+    def stop_speaking(self):
+        """Drop everything queued and cut off the current utterance."""
+        with self._cond:
+            self._queue = []
+            if self._cancel is not None:
+                self._cancel.set()
+
+    @property
+    def busy(self):
+        return self._current is not None
+
+    def stats(self):
+        with self._cond:
+            queued = len(self._queue)
+            oldest = min((utterance.queued_at for utterance in self._queue), default=None)
+        return {
+            'queued': queued,
+            'oldest_queued_ms': round((time.monotonic() - oldest) * 1000.0, 1) if oldest is not None else 0.0,
+            'spoken': self.spoken_count,
+            'duplicates': self.duplicate_count,
+            'stale': self.stale_count,
+            'replaced': self.replaced_count,
+            'preempted': self.preempted_count,
+            'last_delay_ms': round(self.last_delay_ms, 1),
+            'max_delay_ms': round(self.max_delay_ms, 1),
+            'avg_delay_ms': round(self._total_delay_ms / self.spoken_count, 1) if self.spoken_count else 0.0,
+        }
+
+    def _next(self):
+        """Block for the next utterance that is still worth saying."""
+        with self._cond:
+            while self._running:
+                now = time.monotonic()
+                while self._queue:
+                    utterance = heapq.heappop(self._queue)
+                    if utterance.deadline is not None and now > utterance.deadline:
+                        self.stale_count += 1
+                        continue
+                    self._current = utterance
+                    self._cancel = threading.Event()
+                    return utterance, self._cancel
+                self._cond.wait()
+            return None, None
+
+    def _run(self):
+        while True:
+            utterance, cancel = self._next()
+            if utterance is None:
+                return
+
+            delay_ms = (time.monotonic() - utterance.queued_at) * 1000.0
+            self.last_delay_ms = delay_ms
+            self.max_delay_ms = max(self.max_delay_ms, delay_ms)
+            self._total_delay_ms += delay_ms
+            self.spoken_count += 1
+            try:
+                self._speak_fn(utterance.text, cancel)
+            except Exception as e:
+                print(f"Error in speech synthesis: {e}")
+            finally:
+                with self._cond:
+                    self._current = None
+                    self._cancel = None
@@ -0,0 +1,93 @@
+import math
+import threading
+import time
+
+
+class FrameResult(object):
+    """Immutable snapshot of one processed frame's results.
+
+    ``seq`` is assigned by the ``StateStore`` and keeps increasing across
+    processing restarts; ``frame_seq`` is the pipeline's frame number (the
+    ``seq`` of the matching gesture_update). Sequences are stored as tuples.
+    """
+
+    __slots__ = ('seq', 'frame_seq', 'timestamp', 'gesture', 'finger_gesture', 'confidence',
+                 'handedness', 'landmarks', 'bounding_box', 'hand_count', 'fps', 'gesture_history',
+                 'button_states', 'serial_connected', 'mode')
+
+    def __init__(self, seq=0, frame_seq=0, timestamp=None, gesture="No Gesture Detected",
+                 finger_gesture=None, confidence=0.0, handedness="Unknown", landmarks=(),
+                 bounding_box=(0, 0, 0, 0), hand_count=0, fps=0, gesture_history=(),
+                 button_states=(), serial_connected=False, mode=None):
+        set_field = super().__setattr__
+        set_field('seq', seq)
+        set_field('frame_seq', frame_seq)
+        set_field('timestamp', time.time() if timestamp is None else timestamp)
+        set_field('gesture', gesture)
+        set_field('finger_gesture', finger_gesture)
+        set_field('confidence', confidence)
+        set_field('handedness', handedness)
+        set_field('landmarks', tuple(tuple(point) for point in landmarks))
+        set_field('bounding_box', tuple(bounding_box))
+        set_field('hand_count', hand_count)
+        set_field('fps', fps)
+        set_field('gesture_history', tuple(gesture_history))
+        set_field('button_states', tuple(button_states))
+        set_field('serial_connected', serial_connected)
+        set_field('mode', mode)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrameResult is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("FrameResult is immutable")
+
+
+class StateStore(object):
+    """Holds the latest ``FrameResult``, published by reference swap.
+
+    Readers take ``latest`` without locking: results are immutable and
+    swapping the reference is atomic, so they always see one whole frame.
+    Only long-poll readers (``wait_newer``) wait on a condition, and
+    ``publish`` touches it only while someone is waiting.
+    """
+
+    def __init__(self, initial=None):
+        self._latest = initial if initial is not None else FrameResult()
+        self._cond = threading.Condition()
+        self._waiting = 0
+
+    @property
+    def latest(self):
+        return self._latest
+
+    def publish(self, **fields):
+        """Build the next ``FrameResult`` from ``fields`` and make it the latest."""
+        result = FrameResult(seq=self._latest.seq + 1, **fields)
+        self._latest = result
+        if self._waiting:
+            with self._cond:
+                self._cond.notify_all()
+        return result
+
+    def wait_newer(self, since, timeout=None):
+        """Return the first result with ``seq > since``, or the latest once ``timeout`` passes."""
+        result = self._latest
+        if result.seq > since:
+            return result
+
+        if timeout is not None and not math.isfinite(timeout):
+            # nan would make every wait return at once and spin forever
+            timeout = None if timeout > 0 else 0.0
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._waiting += 1
+            try:
+                while self._latest.seq <= since:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+        return self._latest
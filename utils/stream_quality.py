@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class JpegQualityController(object):
+    """Picks the JPEG quality and output scale of the live stream.
+
+    Fed with the measured encode time and payload size of every frame
+    (``record_frame``) and with client acknowledgements (``ack``), it
+    re-evaluates every ``interval`` seconds:
+
+    * over budget (bandwidth above ``max_kbps``, encode time above
+      ``max_encode_ms`` or ack lag above ``max_ack_lag_ms``): lower the
+      quality first, then the scale;
+    * comfortably under budget (all below ``headroom`` of their limit):
+      raise the scale first, then the quality.
+
+    Quality stays within [min_quality, max_quality] and scale within
+    [min_scale, max_scale]. A limit of 0 is ignored, and so is the ack lag
+    once no client has acknowledged anything for ``ack_timeout`` seconds.
+    """
+
+    def __init__(self, min_quality=40, max_quality=80, min_scale=0.5, max_scale=1.0,
+                 max_kbps=0.0, max_encode_ms=15.0, max_ack_lag_ms=300.0,
+                 quality_step=5, scale_step=0.1, interval=0.5, headroom=0.7,
+                 smoothing=0.2, ack_timeout=2.0):
+        if not 1 <= min_quality <= max_quality <= 100:
+            raise ValueError("JPEG quality bounds must satisfy 1 <= min <= max <= 100")
+        if not 0.0 < min_scale <= max_scale <= 1.0:
+            raise ValueError("Scale bounds must satisfy 0 < min <= max <= 1")
+
+        self.min_quality = min_quality
+        self.max_quality = max_quality
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.max_kbps = max_kbps
+        self.max_encode_ms = max_encode_ms
+        self.max_ack_lag_ms = max_ack_lag_ms
+        self.quality_step = quality_step
+        self.scale_step = scale_step
+        self.interval = interval
+        self.headroom = headroom
+        self.smoothing = smoothing
+        self.ack_timeout = ack_timeout
+
+        self.quality = max_quality
+        self.scale = max_scale
+
+        self.encode_ms = None
+        self.frame_bytes = None
+        self.fps = None
+        self.ack_lag_ms = None
+
+        self._lock = threading.Lock()
+        self._sent = OrderedDict()
+        self._last_frame_time = None
+        self._last_ack = None
+        self._last_update = time.monotonic()
+
+    def settings(self):
+        """Return the ``(quality, scale)`` to encode the next frame with."""
+        return self.quality, self.scale
+
+    @property
+    def kbps(self):
+        if not self.frame_bytes or not self.fps:
+            return 0.0
+        return self.frame_bytes * 8.0 * self.fps / 1000.0
+
+    def record_frame(self, seq, encode_ms, size_bytes):
+        """Account one encoded frame and re-evaluate when due."""
+        now = time.monotonic()
+        with self._lock:
+            self.encode_ms = self._smooth(self.encode_ms, encode_ms)
+            self.frame_bytes = self._smooth(self.frame_bytes, size_bytes)
+            if self._last_frame_time is not None and now > self._last_frame_time:
+                self.fps = self._smooth(self.fps, 1.0 / (now - self._last_frame_time))
+            self._last_frame_time = now
+
+            # Remember when frames went out so acks can be turned into lag
+            self._sent[seq] = now
+            while len(self._sent) > 120:
+                self._sent.popitem(last=False)
+
+            if now - self._last_update >= self.interval:
+                self._last_update = now
+                self._adjust()
+
+    def ack(self, seq):
+        """A client has shown frame ``seq``."""
+        with self._lock:
+            sent = self._sent.get(seq)
+            if sent is not None:
+                self._last_ack = time.monotonic()
+                self.ack_lag_ms = self._smooth(self.ack_lag_ms, (self._last_ack - sent) * 1000.0)
+
+    def stats(self):
+        return {
+            'quality': self.quality,
+            'scale': self.scale,
+            'kbps': round(self.kbps, 1),
+            'encode_ms': round(self.encode_ms or 0.0, 2),
+            'ack_lag_ms': round(self.ack_lag_ms or 0.0, 1),
+        }
+
+    def _smooth(self, current, value):
+        return value if current is None else current + self.smoothing * (value - current)
+
+    def _load(self):
+        """Largest measured/limit ratio over the configured budgets."""
+        ratios = []
+        if self.max_kbps:
+            ratios.append(self.kbps / self.max_kbps)
+        if self.max_encode_ms and self.encode_ms is not None:
+            ratios.append(self.encode_ms / self.max_encode_ms)
+        if self._last_ack is not None and time.monotonic() - self._last_ack > self.ack_timeout:
+            self.ack_lag_ms = self._last_ack = None
+        if self.max_ack_lag_ms and self.ack_lag_ms is not None:
+            ratios.append(self.ack_lag_ms / self.max_ack_lag_ms)
+        return max(ratios) if ratios else 0.0
+
+    def _adjust(self):
+        load = self._load()
+        if load > 1.0:
+            if self.quality > self.min_quality:
+                self.quality = max(self.min_quality, self.quality - self.quality_step)
+            elif self.scale > self.min_scale:
+                self.scale = max(self.min_scale, round(self.scale - self.scale_step, 2))
+        elif load < self.headroom:
+            if self.scale < self.max_scale:
+                self.scale = min(self.max_scale, round(self.scale + self.scale_step, 2))
+            elif self.quality < self.max_quality:
+                self.quality = min(self.max_quality, self.quality + self.quality_step)
@@ -0,0 +1,210 @@
+import math
+import time
+
+import cv2 as cv
+import numpy as np
+
+
+class TrackedResults(object):
+    """Stand-in for a MediaPipe Hands result built from predicted landmarks.
+
+    Exposes the same ``multi_hand_landmarks`` / ``multi_handedness``
+    attributes, holding real landmark protobufs so the rest of the loop
+    (including ``mp_drawing``) works unchanged.
+    """
+
+    def __init__(self, multi_hand_landmarks, multi_handedness):
+        self.multi_hand_landmarks = multi_hand_landmarks
+        self.multi_handedness = multi_handedness
+
+
+class LandmarkMotionModel(object):
+    """Constant-velocity model for the 21 landmarks of one hand.
+
+    Positions are taken as measured; the per-landmark velocity is an
+    exponentially smoothed finite difference between measurements.
+    """
+
+    def __init__(self, points, timestamp, smoothing=0.6, max_horizon=0.25):
+        self.points = points
+        self.velocity = np.zeros_like(points)
+        self.timestamp = timestamp
+        self.smoothing = smoothing
+        self.max_horizon = max_horizon
+
+    def update(self, points, timestamp):
+        dt = timestamp - self.timestamp
+        if dt > 0:
+            velocity = (points - self.points) / dt
+            self.velocity += self.smoothing * (velocity - self.velocity)
+        self.points = points
+        self.timestamp = timestamp
+
+    def predict(self, timestamp):
+        # Don't extrapolate far past the last measurement
+        dt = min(max(timestamp - self.timestamp, 0.0), self.max_horizon)
+        return self.points + self.velocity * dt
+
+
+class AdaptiveHandTracker(object):
+    """Runs the hand detector only every Nth frame and predicts in between.
+
+    A frame is measured (``detect`` is called) when ``interval`` frames have
+    passed since the last measurement, or earlier when the mean absolute
+    difference between a small grayscale thumbnail of the frame and the one
+    from the last measurement exceeds ``motion_threshold``. Other frames get
+    landmarks extrapolated by a ``LandmarkMotionModel`` per hand.
+
+    With ``target_fps`` set, ``interval`` is re-tuned after every frame from
+    the measured cost of detect and predict frames, so the average per-frame
+    cost fits the frame budget; it stays between 1 and ``max_interval``.
+    """
+
+    THUMBNAIL_SIZE = (64, 36)
+
+    def __init__(self, target_fps=30.0, max_interval=4, motion_threshold=6.0,
+                 cost_smoothing=0.1):
+        if max_interval < 1:
+            raise ValueError("max_interval must be at least 1")
+
+        self.target_fps = target_fps
+        self.max_interval = max_interval
+        self.motion_threshold = motion_threshold
+        self.cost_smoothing = cost_smoothing
+        self.interval = max_interval if not target_fps else 1
+
+        self._models = {}
+        self._templates = []
+        self._handedness = []
+        self._reference_thumbnail = None
+        self._thumbnail = None
+        self._since_measured = 0
+        self._detect_ms = None
+        self._predict_ms = None
+
+        self.motion_energy = 0.0
+        self.measured_count = 0
+        self.predicted_count = 0
+        self.motion_triggered_count = 0
+
+    def process(self, frame, timestamp, detect):
+        """Return ``(results, measured)`` for ``frame``.
+
+        ``detect(frame)`` must return a MediaPipe Hands result; it is only
+        called for measured frames.
+        """
+        started = time.perf_counter()
+        measure = self._should_measure(frame)
+
+        if measure:
+            results = detect(frame)
+            self._update(results, timestamp)
+            self._reference_thumbnail, self._thumbnail = self._thumbnail, self._reference_thumbnail
+            self._since_measured = 0
+            self.measured_count += 1
+        else:
+            results = self._predict(timestamp)
+            self._since_measured += 1
+            self.predicted_count += 1
+
+        self._record_cost(measure, (time.perf_counter() - started) * 1000.0)
+        return results, measure
+
+    def stats(self):
+        return {
+            'interval': self.interval,
+            'measured': self.measured_count,
+            'predicted': self.predicted_count,
+            'motion_triggered': self.motion_triggered_count,
+            'motion_energy': round(self.motion_energy, 2),
+            'detect_ms': round(self._detect_ms or 0.0, 2),
+            'predict_ms': round(self._predict_ms or 0.0, 2),
+        }
+
+    def _should_measure(self, frame):
+        if self._thumbnail is None:
+            self._thumbnail = np.empty(self.THUMBNAIL_SIZE[::-1], dtype=np.uint8)
+        small = cv.resize(frame, self.THUMBNAIL_SIZE, interpolation=cv.INTER_AREA)
+        cv.cvtColor(small, cv.COLOR_BGR2GRAY, dst=self._thumbnail)
+
+        if self._reference_thumbnail is None or self._since_measured + 1 >= self.interval:
+            return True
+
+        self.motion_energy = float(cv.mean(cv.absdiff(self._thumbnail, self._reference_thumbnail))[0])
+        if self.motion_energy > self.motion_threshold:
+            self.motion_triggered_count += 1
+            return True
+        return False
+
+    @staticmethod
+    def hand_keys(multi_handedness):
+        """Per-hand keys for a result: the handedness label, made unique."""
+        keys = []
+        for handedness in multi_handedness:
+            label = handedness.classification[0].label
+            # Two hands with the same label (it happens) get separate models
+            keys.append(label if label not in keys else f"{label}_{len(keys)}")
+        return keys
+
+    def _update(self, results, timestamp):
+        if not results.multi_hand_landmarks:
+            self._models = {}
+            self._templates = []
+            self._handedness = []
+            return
+
+        keys = self.hand_keys(results.multi_handedness)
+        models = {}
+        for key, hand_landmarks in zip(keys, results.multi_hand_landmarks):
+            points = np.array([(landmark.x, landmark.y, landmark.z)
+                               for landmark in hand_landmarks.landmark], dtype=np.float64)
+            model = self._models.get(key)
+            if model is None:
+                model = LandmarkMotionModel(points, timestamp)
+            else:
+                model.update(points, timestamp)
+            models[key] = model
+
+        self._models = models
+        self._templates = list(zip(keys, results.multi_hand_landmarks))
+        self._handedness = list(results.multi_handedness)
+
+    def _predict(self, timestamp):
+        if not self._templates:
+            return TrackedResults(None, None)
+
+        multi_hand_landmarks = []
+        for key, template in self._templates:
+            landmarks = type(template)()
+            landmarks.CopyFrom(template)
+            for landmark, (x, y, z) in zip(landmarks.landmark, self._models[key].predict(timestamp)):
+                landmark.x = x
+                landmark.y = y
+                landmark.z = z
+            multi_hand_landmarks.append(landmarks)
+        return TrackedResults(multi_hand_landmarks, self._handedness)
+
+    def _record_cost(self, measured, elapsed_ms):
+        attribute = '_detect_ms' if measured else '_predict_ms'
+        previous = getattr(self, attribute)
+        if previous is None:
+            setattr(self, attribute, elapsed_ms)
+        else:
+            setattr(self, attribute, previous + self.cost_smoothing * (elapsed_ms - previous))
+
+        if self.target_fps:
+            self.interval = self._tune_interval()
+
+    def _tune_interval(self):
+        # Average cost over one interval is (detect + (N - 1) * predict) / N;
+        # pick the smallest N that keeps it within the frame budget
+        if self._detect_ms is None:
+            return self.interval
+        budget_ms = 1000.0 / self.target_fps
+        predict_ms = self._predict_ms or 0.0
+        if self._detect_ms <= budget_ms:
+            return 1
+        if predict_ms >= budget_ms:
+            return self.max_interval
+        interval = math.ceil((self._detect_ms - predict_ms) / (budget_ms - predict_ms))
+        return max(1, min(self.max_interval, interval))
@@ -0,0 +1,252 @@
+import struct
+import time
+
+# Compact binary encoding of gesture_update and /gesture-data, version 1
+# (all little endian). Every message starts with
+#
+#   header   <BBHI     schema version, kind, flags, seq
+#
+# gesture_update (KIND_UPDATE):
+#
+#   body     <fffIBBBBBB  timestamp, confidence, fps, dropped_frames, gesture,
+#                         finger_gesture, handedness, hand_count, mode,
+#                         button count
+#            then one button_state id per button
+#   stream   <BBf         jpeg_quality, stream_scale * 100, stream_kbps
+#                         (FLAG_STREAM)
+#   pressed  B, then <BB  count, then (button index, button_state id) pairs
+#                         (FLAG_PRESSED)
+#
+# /gesture-data (KIND_GESTURE_DATA):
+#
+#   body     <fffhBBBBBBBx4h  timestamp, confidence, fps, gesture_id, gesture,
+#                             finger_gesture, handedness, hand_count, mode,
+#                             landmark count, history length, bounding box
+#            then landmark count x <hh pixels and one gesture id per history
+#            entry
+#
+# Strings are ids into the enum tables returned by ``describe()``, which
+# clients fetch once when negotiating; UNKNOWN_ID stands for a value missing
+# from its table. Timestamps are float32 seconds since the schema's
+# ``epoch`` (float64 Unix time, also in ``describe()``).
+#
+# gesture-app/src/App.js decodes the same layout.
+
+SCHEMA_VERSION = 1
+CONTENT_TYPE = 'application/x-gesture-wire'
+
+KIND_UPDATE = 1
+KIND_GESTURE_DATA = 2
+
+FLAG_MEASURED = 0x01
+FLAG_INITIALIZED = 0x02
+FLAG_ACTIVE = 0x04
+FLAG_SERIAL_CONNECTED = 0x08
+FLAG_STREAM = 0x10
+FLAG_PRESSED = 0x20
+
+UNKNOWN_ID = 255
+
+BUTTON_STATES = ['OFF', 'ON', 'GET DATA', 'GETTING...', 'OK', 'ERROR', 'NO SERIAL']
+HANDEDNESS = ['Unknown', 'Left', 'Right']
+
+_HEADER = struct.Struct('<BBHI')
+_UPDATE = struct.Struct('<fffIBBBBBB')
+_STREAM = struct.Struct('<BBf')
+_PRESSED = struct.Struct('<BB')
+_GESTURE_DATA = struct.Struct('<fffhBBBBBBBx4h')
+
+
+class EnumTable(object):
+    """Maps the strings of one field to small integer ids and back."""
+
+    def __init__(self, values):
+        if len(values) >= UNKNOWN_ID:
+            raise ValueError(f"Enum tables hold at most {UNKNOWN_ID} values")
+        self.values = list(values)
+        self._ids = {}
+        for index, value in enumerate(self.values):
+            self._ids.setdefault(value, index)
+
+    def id(self, value):
+        return self._ids.get(value, UNKNOWN_ID)
+
+    def value(self, value_id):
+        return self.values[value_id] if value_id < len(self.values) else None
+
+
+class WireSchema(object):
+    """Versioned binary encoding of gesture_update and /gesture-data.
+
+    The enum tables are built from the classifier labels and modes loaded at
+    startup, so ``describe()`` must be handed to clients before they can
+    decode anything. Fields outside the schema (added to the JSON messages
+    later) are not carried; clients needing them stay on JSON.
+    """
+
+    version = SCHEMA_VERSION
+    content_type = CONTENT_TYPE
+
+    def __init__(self, gestures, finger_gestures, modes, epoch=None):
+        self.epoch = time.time() if epoch is None else epoch
+        self.enums = {
+            'gesture': EnumTable(['No Gesture Detected', 'Unknown'] + list(gestures)),
+            'finger_gesture': EnumTable([None] + list(finger_gestures)),
+            'handedness': EnumTable(HANDEDNESS),
+            'mode': EnumTable(modes),
+            'button_state': EnumTable(BUTTON_STATES),
+        }
+
+    def describe(self):
+        """What a client needs to decode messages (JSON serializable)."""
+        return {
+            'version': SCHEMA_VERSION,
+            'content_type': CONTENT_TYPE,
+            'epoch': self.epoch,
+            'unknown_id': UNKNOWN_ID,
+            'enums': {name: table.values for name, table in self.enums.items()},
+        }
+
+    def encode_update(self, update):
+        """Encode a gesture_update dict (``frame`` is not carried)."""
+        enums = self.enums
+        button_states = update.get('button_states') or []
+        flags = 0
+        if update.get('measured', True):
+            flags |= FLAG_MEASURED
+        if update.get('initialized'):
+            flags |= FLAG_INITIALIZED
+        if update.get('system_status') == 'active':
+            flags |= FLAG_ACTIVE
+        if update.get('serial_connected'):
+            flags |= FLAG_SERIAL_CONNECTED
+
+        parts = [None, _UPDATE.pack(
+            self._timestamp(update.get('timestamp')),
+            update.get('confidence') or 0.0,
+            update.get('fps') or 0.0,
+            update.get('dropped_frames') or 0,
+            enums['gesture'].id(update.get('gesture')),
+            enums['finger_gesture'].id(update.get('finger_gesture')),
+            enums['handedness'].id(update.get('handedness')),
+            update.get('hand_count') or 0,
+            enums['mode'].id(update.get('mode')),
+            len(button_states),
+        ), bytes(enums['button_state'].id(state) for state in button_states)]
+
+        if 'jpeg_quality' in update:
+            flags |= FLAG_STREAM
+            parts.append(_STREAM.pack(update['jpeg_quality'], int(round(update['stream_scale'] * 100)),
+                                      update['stream_kbps']))
+        pressed = update.get('pressed_buttons')
+        if pressed is not None:
+            flags |= FLAG_PRESSED
+            parts.append(bytes([len(pressed)]))
+            parts.extend(_PRESSED.pack(int(index), enums['button_state'].id(state))
+                         for index, state in pressed.items())
+
+        parts[0] = _HEADER.pack(SCHEMA_VERSION, KIND_UPDATE, flags, update.get('seq') or 0)
+        return b''.join(parts)
+
+    def decode_update(self, data):
+        flags, seq, offset = self._header(data, KIND_UPDATE)
+        (timestamp, confidence, fps, dropped_frames, gesture, finger_gesture, handedness,
+         hand_count, mode, button_count) = _UPDATE.unpack_from(data, offset)
+        offset += _UPDATE.size
+        button_state = self.enums['button_state']
+        update = {
+            'seq': seq,
+            'measured': bool(flags & FLAG_MEASURED),
+            'gesture': self.enums['gesture'].value(gesture),
+            'finger_gesture': self.enums['finger_gesture'].value(finger_gesture),
+            'confidence': confidence,
+            'handedness': self.enums['handedness'].value(handedness),
+            'hand_count': hand_count,
+            'fps': fps,
+            'dropped_frames': dropped_frames,
+            'timestamp': self.epoch + timestamp,
+            'initialized': bool(flags & FLAG_INITIALIZED),
+            'system_status': 'active' if flags & FLAG_ACTIVE else 'inactive',
+            'button_states': [button_state.value(value) for value in data[offset:offset + button_count]],
+            'serial_connected': bool(flags & FLAG_SERIAL_CONNECTED),
+            'mode': self.enums['mode'].value(mode),
+        }
+        offset += button_count
+
+        if flags & FLAG_STREAM:
+            quality, scale, kbps = _STREAM.unpack_from(data, offset)
+            offset += _STREAM.size
+            update.update({'jpeg_quality': quality, 'stream_scale': scale / 100.0, 'stream_kbps': kbps})
+        if flags & FLAG_PRESSED:
+            count = data[offset]
+            offset += 1
+            pressed = {}
+            for _ in range(count):
+                index, state = _PRESSED.unpack_from(data, offset)
+                offset += _PRESSED.size
+                pressed[index] = button_state.value(state)
+            update['pressed_buttons'] = pressed
+        return update
+
+    def encode_gesture_data(self, gesture_data):
+        """Encode a /gesture-data dict."""
+        enums = self.enums
+        landmarks = gesture_data.get('landmarks') or []
+        history = gesture_data.get('gesture_history') or []
+        flags = FLAG_ACTIVE if gesture_data.get('system_status') == 'active' else 0
+        gesture = enums['gesture']
+        return b''.join([
+            _HEADER.pack(SCHEMA_VERSION, KIND_GESTURE_DATA, flags, gesture_data.get('seq') or 0),
+            _GESTURE_DATA.pack(
+                self._timestamp(gesture_data.get('timestamp')),
+                gesture_data.get('confidence') or 0.0,
+                gesture_data.get('fps') or 0.0,
+                gesture_data.get('gesture_id') or 0,
+                gesture.id(gesture_data.get('gesture_name')),
+                enums['finger_gesture'].id(gesture_data.get('finger_gesture')),
+                enums['handedness'].id(gesture_data.get('handedness')),
+                gesture_data.get('hand_count') or 0,
+                enums['mode'].id(gesture_data.get('mode')),
+                len(landmarks),
+                len(history),
+                *(gesture_data.get('bounding_box') or (0, 0, 0, 0))),
+            struct.pack(f'<{2 * len(landmarks)}h', *(value for point in landmarks for value in point)),
+            bytes(gesture.id(name) for name in history),
+        ])
+
+    def decode_gesture_data(self, data):
+        flags, seq, offset = self._header(data, KIND_GESTURE_DATA)
+        (timestamp, confidence, fps, gesture_id, gesture, finger_gesture, handedness, hand_count,
+         mode, landmark_count, history_length, *bounding_box) = _GESTURE_DATA.unpack_from(data, offset)
+        offset += _GESTURE_DATA.size
+        values = struct.unpack_from(f'<{2 * landmark_count}h', data, offset)
+        offset += 4 * landmark_count
+        gestures = self.enums['gesture']
+        return {
+            'seq': seq,
+            'gesture_id': gesture_id,
+            'gesture_name': gestures.value(gesture),
+            'finger_gesture': self.enums['finger_gesture'].value(finger_gesture),
+            'confidence': confidence,
+            'handedness': self.enums['handedness'].value(handedness),
+            'landmarks': [list(values[i:i + 2]) for i in range(0, len(values), 2)],
+            'bounding_box': bounding_box,
+            'hand_count': hand_count,
+            'fps': fps,
+            'timestamp': self.epoch + timestamp,
+            'system_status': 'active' if flags & FLAG_ACTIVE else 'inactive',
+            'gesture_history': [gestures.value(value) for value in data[offset:offset + history_length]],
+            'mode': self.enums['mode'].value(mode),
+        }
+
+    def _timestamp(self, timestamp):
+        return (time.time() if timestamp is None else timestamp) - self.epoch
+
+    @staticmethod
+    def _header(data, kind):
+        version, message_kind, flags, seq = _HEADER.unpack_from(data, 0)
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported wire schema version: {version}")
+        if message_kind != kind:
+            raise ValueError(f"Expected message kind {kind}, got {message_kind}")
+        return flags, seq, _HEADER.size